@@ -0,0 +1,158 @@
+"""
+Scores many positions at once with NumPy. Boards are packed into an (N, 64)
+int8 array holding 0 for an empty square, 1 to 6 for player 1's pawn,
+knight, bishop, rook, queen and king, and -1 to -6 for player 2's. Scores
+are worked out for every row together and always match ChessBoard.evaluate
+and static_evaluate.
+
+This pays off when scoring datasets of board codes, which do not have to
+be turned into board objects first. Inside a search, Position already keeps
+its material up to date move by move, so evaluate_moves is there to score
+all replies to a position at once rather than to speed up negamax.
+
+NumPy is optional. Without it AVAILABLE is False and the same functions
+score the boards one at a time.
+"""
+from chess.bitboard import BitBoard
+from chess.board import PIECE_VALUES, CHECKMATE, STALEMATE
+from chess.pieces import P1_CHAR
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+AVAILABLE = numpy is not None
+
+PIECE_CHARS = "pnbrqk"
+
+# board characters to the bytes of their int8 codes
+_CODES = bytes.maketrans(
+    b"." + PIECE_CHARS.encode() + PIECE_CHARS.upper().encode(),
+    bytes([0] + list(range(1, 7)) + [256 - code for code in range(1, 7)]))
+
+if AVAILABLE:
+    # VALUES[code + 6] is the material a square adds to player 1's lead
+    VALUES = numpy.array([-PIECE_VALUES[char] for char in reversed(PIECE_CHARS)] + [0]
+                         + [PIECE_VALUES[char] for char in PIECE_CHARS], dtype=numpy.int32)
+
+
+def _squares(board):
+    """Returns the 64 square characters of a board or board code as one string."""
+    code = board if isinstance(board, str) else repr(board)
+    return code[2:].replace(" ", "")
+
+
+def pack(boards):
+    """
+    Packs boards into an array of piece codes, one row per board.
+    :param boards: list of board objects or board codes
+    :return: (N, 64) int8 array
+    """
+    data = "".join(_squares(board) for board in boards).encode().translate(_CODES)
+    return numpy.frombuffer(data, dtype=numpy.int8).reshape(-1, 64)
+
+
+def material(packed):
+    """
+    Works out player 1's material lead for each packed board.
+    :param packed: (N, 64) int8 array from pack
+    :return: (N,) int32 array
+    """
+    return VALUES[packed.astype(numpy.int32) + 6].sum(axis=1, dtype=numpy.int32)
+
+
+def _player_signs(boards):
+    """Returns 1 for each board with player 1 to move and -1 otherwise."""
+    return numpy.array([1 if _turn(board) == P1_CHAR else -1 for board in boards],
+                       dtype=numpy.int32)
+
+
+def _turn(board):
+    """Returns the player to move on a board or board code."""
+    return board[0] if isinstance(board, str) else board.get_player_turn()
+
+
+def score(packed, signs, statuses=None):
+    """
+    Scores packed boards the way ChessBoard.evaluate does.
+    :param packed: (N, 64) int8 array from pack
+    :param signs: (N,) array of 1 where player 1 is to move and -1 otherwise
+    :param statuses: optional list of each board's game_status, leave out to
+           score like static_evaluate
+    :return: (N,) int32 array, positive where the player to move is ahead
+    """
+    scores = material(packed)
+    if statuses is not None:
+        statuses = numpy.array(statuses, dtype=object)
+        checkmate = statuses == CHECKMATE
+        stalemate = statuses == STALEMATE
+        # checkmate is lost by the player to move, and player 1 only wants a
+        # stalemate when not ahead
+        scores = numpy.where(checkmate, -1000 * signs, scores)
+        scores = numpy.where(stalemate, numpy.where(scores > 0, -1000, 1000), scores)
+    return scores * signs
+
+
+def _board(board):
+    """Returns a board object for a board or board code."""
+    return BitBoard(board) if isinstance(board, str) else board
+
+
+def evaluate(boards):
+    """
+    Scores each board exactly as its evaluate method does. Board codes can
+    be given instead of board objects. Finding out which games are over
+    still takes a move search for each board.
+    :param boards: list of board objects or board codes
+    :return: int32 array if NumPy is installed, otherwise a list of ints
+    """
+    if not AVAILABLE:
+        return [_board(board).evaluate() for board in boards]
+    return score(pack(boards), _player_signs(boards),
+                 [_board(board).game_status for board in boards])
+
+
+def static_evaluate(boards):
+    """
+    Scores each board exactly as its static_evaluate method does. Board
+    codes can be given instead of board objects.
+    :param boards: list of board objects or board codes
+    :return: int32 array if NumPy is installed, otherwise a list of ints
+    """
+    if not AVAILABLE:
+        return [_board(board).static_evaluate() for board in boards]
+    return score(pack(boards), _player_signs(boards))
+
+
+def evaluate_moves(position, move_list, static=False):
+    """
+    Scores the position after each move, from the point of view of the
+    player who replies. Each move is made and unmade on the position, which
+    ends up unchanged.
+    :param position: Position object
+    :param move_list: moves packed as ints, as from calc_move_list
+    :param static: if True, scores like static_evaluate instead of evaluate
+    :return: int32 array if NumPy is installed, otherwise a list of ints
+    """
+    if not AVAILABLE:
+        scores = []
+        for move in move_list:
+            position.make_move(move)
+            scores.append(position.static_evaluate() if static else position.evaluate())
+            position.unmake_move()
+        return scores
+
+    rows = []
+    statuses = None if static else []
+    for move in move_list:
+        position.make_move(move)
+        rows.append(repr(position))
+        if not static:
+            statuses.append(position.game_status)
+        position.unmake_move()
+
+    packed = pack(rows)
+    sign = 1 if position.get_player_turn() != P1_CHAR else -1
+    signs = numpy.full(len(rows), sign, dtype=numpy.int32)
+    return score(packed, signs, statuses)
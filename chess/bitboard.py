@@ -0,0 +1,709 @@
+from array import array
+
+from chess import cache
+from chess import tables
+from chess import validation
+from chess import zobrist
+from chess.board import (ChessBoard, PIECE_VALUES, calc_material, ONGOING, CHECKMATE,
+                         STALEMATE)
+from chess.moves import MOVE_STRINGS, MOVE_SQUARES, MOVE_INTS, TO_SHIFT, PROMOTION_SHIFT
+from chess.pieces import P1_CHAR, P2_CHAR
+from chess.validation import LEVELS as VALIDATION_LEVELS
+
+# Squares are numbered row * 8 + col, so bit 0 is "a1" and bit 63 is "h8".
+# Side 0 is player 1 (lowercase pieces moving up the board) and side 1 is
+# player 2 (uppercase pieces moving down the board).
+FULL = (1 << 64) - 1
+
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = range(6)
+PIECE_CHARS = "pnbrqk"
+TYPE_VALUES = tuple(PIECE_VALUES[char] for char in PIECE_CHARS)
+
+# maps board characters to (side, piece type)
+CHAR_PIECES = {}
+for _type, _char in enumerate(PIECE_CHARS):
+    CHAR_PIECES[_char] = (0, _type)
+    CHAR_PIECES[_char.upper()] = (1, _type)
+
+# piece character for a given side * 6 + piece type
+CODE_CHARS = PIECE_CHARS + PIECE_CHARS.upper()
+
+# bitboard versions of the square tables in chess.tables
+KNIGHT_ATTACKS = [tables.to_bitboard(targets) for targets in tables.KNIGHT_TARGETS]
+KING_ATTACKS = [tables.to_bitboard(targets) for targets in tables.KING_TARGETS]
+PAWN_ATTACKS = tuple([tables.to_bitboard(targets) for targets in tables.PAWN_ATTACKS[player]]
+                     for player in (P1_CHAR, P2_CHAR))
+
+# rays going toward higher square numbers find their first blocker with the
+# lowest set bit, rays going toward lower square numbers with the highest
+RAY_N, RAY_E, RAY_NE, RAY_NW, RAY_S, RAY_W, RAY_SW, RAY_SE = (
+    [tables.to_bitboard(ray) for ray in tables.RAYS[direction]]
+    for direction in ((1, 0), (0, 1), (1, 1), (1, -1), (-1, 0), (0, -1), (-1, -1), (-1, 1)))
+
+# every square a queen on an empty board could reach from each square
+QUEEN_LINES = [RAY_N[sq] | RAY_E[sq] | RAY_NE[sq] | RAY_NW[sq] | RAY_S[sq]
+               | RAY_W[sq] | RAY_SW[sq] | RAY_SE[sq] for sq in range(64)]
+
+# upgrade bits of a move int that turns a pawn into a queen
+QUEEN_PROMOTION = QUEEN << PROMOTION_SHIFT
+
+# row each side's pawns are upgraded on
+LAST_ROWS = (0xff << 56, 0xff)
+
+
+def rook_attacks(sq, occupied):
+    """
+    Returns a bitboard of the squares a rook on sq attacks, stopping at and
+    including the first occupied square in each direction.
+    :param sq: int square index
+    :param occupied: bitboard of all pieces
+    :return: int
+    """
+    ray = RAY_N[sq]
+    blockers = ray & occupied
+    if blockers:
+        ray ^= RAY_N[(blockers & -blockers).bit_length() - 1]
+    attacks = ray
+    ray = RAY_E[sq]
+    blockers = ray & occupied
+    if blockers:
+        ray ^= RAY_E[(blockers & -blockers).bit_length() - 1]
+    attacks |= ray
+    ray = RAY_S[sq]
+    blockers = ray & occupied
+    if blockers:
+        ray ^= RAY_S[blockers.bit_length() - 1]
+    attacks |= ray
+    ray = RAY_W[sq]
+    blockers = ray & occupied
+    if blockers:
+        ray ^= RAY_W[blockers.bit_length() - 1]
+    return attacks | ray
+
+
+def bishop_attacks(sq, occupied):
+    """
+    Returns a bitboard of the squares a bishop on sq attacks, stopping at and
+    including the first occupied square in each direction.
+    :param sq: int square index
+    :param occupied: bitboard of all pieces
+    :return: int
+    """
+    ray = RAY_NE[sq]
+    blockers = ray & occupied
+    if blockers:
+        ray ^= RAY_NE[(blockers & -blockers).bit_length() - 1]
+    attacks = ray
+    ray = RAY_NW[sq]
+    blockers = ray & occupied
+    if blockers:
+        ray ^= RAY_NW[(blockers & -blockers).bit_length() - 1]
+    attacks |= ray
+    ray = RAY_SW[sq]
+    blockers = ray & occupied
+    if blockers:
+        ray ^= RAY_SW[blockers.bit_length() - 1]
+    attacks |= ray
+    ray = RAY_SE[sq]
+    blockers = ray & occupied
+    if blockers:
+        ray ^= RAY_SE[blockers.bit_length() - 1]
+    return attacks | ray
+
+
+def is_attacked(sq, side, pieces, occupied):
+    """
+    Returns True if any piece belonging to side attacks the square.
+    :param sq: int square index
+    :param side: int 0 for player 1 or 1 for player 2
+    :param pieces: list of 12 piece bitboards indexed by side * 6 + type
+    :param occupied: bitboard of all pieces
+    :return: Boolean
+    """
+    base = side * 6
+    if KNIGHT_ATTACKS[sq] & pieces[base + KNIGHT]:
+        return True
+    if KING_ATTACKS[sq] & pieces[base + KING]:
+        return True
+    # a pawn attacks sq if it stands where an enemy pawn on sq would attack
+    if PAWN_ATTACKS[1 - side][sq] & pieces[base + PAWN]:
+        return True
+    queens = pieces[base + QUEEN]
+    straight = pieces[base + ROOK] | queens
+    if straight & (RAY_N[sq] | RAY_E[sq] | RAY_S[sq] | RAY_W[sq]) \
+            and rook_attacks(sq, occupied) & straight:
+        return True
+    diagonal = pieces[base + BISHOP] | queens
+    if diagonal & (RAY_NE[sq] | RAY_NW[sq] | RAY_SW[sq] | RAY_SE[sq]) \
+            and bishop_attacks(sq, occupied) & diagonal:
+        return True
+    return False
+
+
+def pseudo_moves(side, pieces, occupied_by, occupied, captures_only=False):
+    """
+    Generates (frm, to) square pairs for every move side's pieces could make,
+    following the same rules as the ChessPiece.calc_moves methods. Moves that
+    leave the mover's king attacked are still included.
+    :param side: int 0 for player 1 or 1 for player 2
+    :param pieces: list of 12 piece bitboards indexed by side * 6 + type
+    :param occupied_by: list of 2 bitboards of each side's pieces
+    :param occupied: bitboard of all pieces
+    :param captures_only: if True, only captures and pawn moves onto the
+           last row are generated
+    :return: generator of (int, int) tuples
+    """
+    base = side * 6
+    enemy = occupied_by[1 - side]
+    # kings can never be taken, by either side
+    targets = FULL ^ (occupied_by[side] | pieces[KING] | pieces[6 + KING])
+    captures = enemy & targets
+    if captures_only:
+        # pawns may still step onto the last row, where they are upgraded
+        pawn_targets = captures | (LAST_ROWS[side] & targets)
+        targets = captures
+    else:
+        pawn_targets = targets
+
+    bb = pieces[base + PAWN]
+    pawn_attacks = PAWN_ATTACKS[side]
+    step = 8 if side == 0 else -8
+    while bb:
+        bit = bb & -bb
+        bb ^= bit
+        frm = bit.bit_length() - 1
+        # pawns attack diagonally, and may also move (or take) straight ahead
+        moves = pawn_attacks[frm] & captures
+        to = frm + step
+        if 0 <= to < 64 and (1 << to) & pawn_targets:
+            moves |= 1 << to
+        if frm >> 3 in (1, 6):
+            to += step
+            if 0 <= to < 64 and (1 << to) & pawn_targets:
+                moves |= 1 << to
+        while moves:
+            to_bit = moves & -moves
+            moves ^= to_bit
+            yield frm, to_bit.bit_length() - 1
+
+    for piece_type in (KNIGHT, BISHOP, ROOK, QUEEN, KING):
+        bb = pieces[base + piece_type]
+        while bb:
+            bit = bb & -bb
+            bb ^= bit
+            frm = bit.bit_length() - 1
+            if piece_type == KNIGHT:
+                moves = KNIGHT_ATTACKS[frm]
+            elif piece_type == BISHOP:
+                moves = bishop_attacks(frm, occupied)
+            elif piece_type == ROOK:
+                moves = rook_attacks(frm, occupied)
+            elif piece_type == QUEEN:
+                moves = bishop_attacks(frm, occupied) | rook_attacks(frm, occupied)
+            else:
+                moves = KING_ATTACKS[frm]
+            moves &= targets
+            while moves:
+                to_bit = moves & -moves
+                moves ^= to_bit
+                yield frm, to_bit.bit_length() - 1
+
+
+def legal_moves(side, pieces, occupied_by, occupied, squares, captures_only=False):
+    """
+    Generates (frm, to) square pairs for every move that does not leave
+    side's king attacked.
+    :param side: int 0 for player 1 or 1 for player 2
+    :param pieces: list of 12 piece bitboards indexed by side * 6 + type
+    :param occupied_by: list of 2 bitboards of each side's pieces
+    :param occupied: bitboard of all pieces
+    :param squares: list of 64 board characters
+    :param captures_only: if True, only captures and pawn moves onto the
+           last row are generated
+    :return: generator of (int, int) tuples
+    """
+    enemy = 1 - side
+    king_bit = pieces[side * 6 + KING]
+    king_sq = king_bit.bit_length() - 1
+    in_check = is_attacked(king_sq, enemy, pieces, occupied)
+    king_lines = QUEEN_LINES[king_sq]
+
+    for frm, to in pseudo_moves(side, pieces, occupied_by, occupied, captures_only):
+        frm_bit = 1 << frm
+        if frm_bit == king_bit:
+            target = to
+        elif in_check or frm_bit & king_lines:
+            target = king_sq
+        else:
+            # the piece is not between the king and any attacker, and the
+            # king was not in check, so the move cannot expose the king
+            yield frm, to
+            continue
+
+        to_bit = 1 << to
+        captured = squares[to]
+        if captured != ".":
+            code = CHAR_PIECES[captured]
+            code = code[0] * 6 + code[1]
+            pieces[code] ^= to_bit
+        attacked = is_attacked(target, enemy, pieces,
+                               (occupied ^ frm_bit) | to_bit)
+        if captured != ".":
+            pieces[code] ^= to_bit
+        if not attacked:
+            yield frm, to
+
+
+class BitBoard(object):
+    """
+    Chess board that stores each piece type for each player as a 64-bit
+    integer bitboard. It accepts and produces the same string codes as
+    ChessBoard and follows the same movement rules, so it can be used anywhere
+    a ChessBoard is expected.
+    :param board: string in the same form as ChessBoard
+    """
+    def __init__(self, board, validation=None):
+        assert validation in VALIDATION_LEVELS + (None,), \
+            "validation is {} but must be in {}".format(validation, VALIDATION_LEVELS)
+        assert len(board) == 73, "board was {} should have been {}".format(len(board), 73)
+        self._code = board
+        self._player_turn = board[0]
+        self._side = 0 if self._player_turn == P1_CHAR else 1
+        self._squares = list("".join(board[2:].split()))
+        self._pieces = [0] * 12
+        self._occupied_by = [0, 0]
+        for sq, char in enumerate(self._squares):
+            if char in CHAR_PIECES:
+                side, piece_type = CHAR_PIECES[char]
+                self._pieces[side * 6 + piece_type] |= 1 << sq
+                self._occupied_by[side] |= 1 << sq
+        self._occupied = self._occupied_by[0] | self._occupied_by[1]
+        self._game_status = None
+        self._validation = validation
+
+        assert self.sanity_check()
+        self._zobrist_key = zobrist.board_key(board)
+        self._material = calc_material(board)
+
+    @classmethod
+    def _from_state(cls, side, pieces, occupied_by, squares, zobrist_key, material,
+                    validation=None):
+        """
+        Creates a board directly from already validated internal state.
+        """
+        board = cls.__new__(cls)
+        board._code = None
+        board._zobrist_key = zobrist_key
+        board._material = material
+        board._game_status = None
+        board._side = side
+        board._player_turn = P1_CHAR if side == 0 else P2_CHAR
+        board._pieces = pieces
+        board._occupied_by = occupied_by
+        board._occupied = occupied_by[0] | occupied_by[1]
+        board._squares = squares
+        board._validation = validation
+        return board
+
+    def __str__(self):
+        """Creates an ascii board for use in console"""
+        return str(ChessBoard(repr(self)))
+
+    def __repr__(self):
+        """str representation of board object, identical to ChessBoard's"""
+        if self._code is None:
+            squares = "".join(self._squares)
+            rows = [squares[i:i + 8] for i in range(0, 64, 8)]
+            self._code = self._player_turn + " " + " ".join(rows)
+        return self._code
+
+    def __eq__(self, other):
+        """Overloads == operator"""
+        return repr(self) == repr(other)
+
+    def __ne__(self, other):
+        """Overloads != operator"""
+        return not(self.__eq__(other))
+
+    @property
+    def player_turn(self):
+        return self._player_turn
+
+    @property
+    def zobrist_key(self):
+        """Returns the 64 bit Zobrist hash of the position as an int"""
+        return self._zobrist_key
+
+    @property
+    def material(self):
+        """Returns a tuple of each player's total piece value (player1, player2)"""
+        return self._material
+
+    @property
+    def game_status(self):
+        """
+        Returns ONGOING if the current player has a valid move, otherwise
+        CHECKMATE or STALEMATE. It is only worked out once per board, and
+        kept in the process cache for other boards of the same position.
+        :return: string
+        """
+        if self._game_status is None:
+            position_cache = cache.get_cache()
+            if position_cache is not None:
+                self._game_status = position_cache.get(self._zobrist_key, cache.STATUS)
+                if self._game_status is not None:
+                    return self._game_status
+
+            if not self.has_no_moves():
+                self._game_status = ONGOING
+            elif self.is_attacking_king(flip_player=True):
+                self._game_status = CHECKMATE
+            else:
+                self._game_status = STALEMATE
+            if position_cache is not None:
+                position_cache.put(self._zobrist_key, cache.STATUS, self._game_status)
+        return self._game_status
+
+    def sanity_check(self):
+        """
+        Goes through the same checks as ChessBoard.sanity_check.
+        returns: True if all tests pass, otherwise raises assertion errors
+        """
+        assert len(self._squares) == 64, "board does not have 64 squares"
+        assert self._player_turn in (P1_CHAR, P2_CHAR), "player turn: {} error".format(
+                                                            self._player_turn)
+        for square in self._squares:
+            assert square.upper() in ("R", "N", "B", "Q", "K", "P", "."), \
+                "There is a {} in the grid".format(square)
+
+        player_pieces = self.get_piece_count(P1_CHAR)
+        assert 0 < player_pieces <= 16, \
+            "player cant have {} pieces".format(player_pieces)
+        computer_pieces = self.get_piece_count(P2_CHAR)
+        assert 0 < computer_pieces <= 16, \
+            "computer cant have {} pieces".format(computer_pieces)
+
+        assert self._squares.count("k") == 1, \
+            "player has {} kings".format(self._squares.count("k"))
+        assert self._squares.count("K") == 1, \
+            "computer has {} kings".format(self._squares.count("K"))
+        return True
+
+    def get_player_turn(self):
+        """
+        Gets the string representation of the player who's turn it is.
+        :return: string of 1 number either "1" or "2" for player 1 or player 2
+        """
+        return self._player_turn
+
+    def get_square(self, row, col):
+        """
+        Gets the string representation of a piece at given row and col
+        on the board.
+        :param row: int
+        :param col: int
+        :return: string of one letter
+        """
+        return self._squares[row * 8 + col]
+
+    def get_pieces(self, player=None):
+        """
+        Returns a dict of piece characters mapped to the number on the board.
+        :param player: optional param int 1 for player1 or int 2 for player2
+        :return: pieces dict
+        """
+        assert player in (1, 2, None), \
+            "player is {} but must be in (1, 2, None)".format(player)
+        pieces_dict = {}
+        for code, bb in enumerate(self._pieces):
+            if not bb or (player is not None and code // 6 != player - 1):
+                continue
+            pieces_dict[CODE_CHARS[code]] = bin(bb).count("1")
+        return pieces_dict
+
+    def get_piece_count(self, player):
+        """
+        Counts the number of pieces for a given player.
+        :param player: a string representing the player "1" or "2"
+        :return: number of pieces as an int
+        """
+        assert player in (P1_CHAR, P2_CHAR), "invalid player {}".format(player)
+        return bin(self._occupied_by[int(player) - 1]).count("1")
+
+    def on_board(self, row, col):
+        """
+        Returns boolean for if row and column are within the board
+        :param row: int
+        :param col: int
+        :return: Boolean
+        """
+        return 0 <= row < 8 and 0 <= col < 8
+
+    def is_enemy(self, row, col):
+        """
+        Returns True if a given piece is one of your opponent's pieces
+        according to who's turn it is currently.
+        :param row: int
+        :param col: int
+        :return: Boolean
+        """
+        return bool(self._occupied_by[1 - self._side] & (1 << (row * 8 + col)))
+
+    def is_square_attacked(self, row, col, static_player=False):
+        """
+        Returns true is any enemy pieces are threatening this square.
+        Enemy pieces are opposite of the player owning the square, or of the
+        current player if the square is empty or static_player is True.
+        :param row: int
+        :param col: int
+        :param static_player: Boolean
+        :return: Boolean
+        """
+        sq = row * 8 + col
+        friendly = self._side
+        if not static_player:
+            if self._occupied_by[0] & (1 << sq):
+                friendly = 0
+            elif self._occupied_by[1] & (1 << sq):
+                friendly = 1
+        return is_attacked(sq, 1 - friendly, self._pieces, self._occupied)
+
+    def attacked_squares(self, attacker):
+        """
+        Returns every square the attacker's pieces threaten, in the same form
+        as ChessBoard.attacked_squares.
+        :param attacker: a string representing the attacking player "1" or "2"
+        :return: frozenset of (row, col) tuples
+        """
+        side = 0 if attacker == P1_CHAR else 1
+        base = side * 6
+        pieces = self._pieces
+        occupied = self._occupied
+        attacks = 0
+        for piece_type in (PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING):
+            bb = pieces[base + piece_type]
+            while bb:
+                bit = bb & -bb
+                bb ^= bit
+                sq = bit.bit_length() - 1
+                if piece_type == PAWN:
+                    attacks |= PAWN_ATTACKS[side][sq]
+                elif piece_type == KNIGHT:
+                    attacks |= KNIGHT_ATTACKS[sq]
+                elif piece_type == KING:
+                    attacks |= KING_ATTACKS[sq]
+                else:
+                    if piece_type != BISHOP:
+                        attacks |= rook_attacks(sq, occupied)
+                    if piece_type != ROOK:
+                        attacks |= bishop_attacks(sq, occupied)
+        squares = []
+        while attacks:
+            bit = attacks & -attacks
+            attacks ^= bit
+            squares.append(divmod(bit.bit_length() - 1, 8))
+        return frozenset(squares)
+
+    def is_attacking_king(self, flip_player=False):
+        """
+        Returns True if the current player is threatening the enemy king.
+        :param flip_player: If True, searches for if current player king is
+               being attacked by the enemy
+        :return: Boolean
+        """
+        if flip_player:
+            king_side = self._side
+        else:
+            king_side = 1 - self._side
+        king_sq = self._pieces[king_side * 6 + KING].bit_length() - 1
+        return is_attacked(king_sq, 1 - king_side, self._pieces, self._occupied)
+
+    def _legal_moves(self, captures_only=False):
+        """
+        Generates (frm, to) square pairs of every valid move for the current
+        player.
+        :param captures_only: if True, only captures and pawn upgrades
+        """
+        return legal_moves(self._side, self._pieces, self._occupied_by,
+                           self._occupied, self._squares, captures_only)
+
+    def _pack_moves(self, pairs):
+        """
+        Packs (frm, to) square pairs as ints, marking pawns that reach the
+        last row as upgraded.
+        :param pairs: iterable of (int, int) tuples
+        :return: array of ints
+        """
+        pawns = self._pieces[self._side * 6 + PAWN]
+        last_row = 7 if self._side == 0 else 0
+        move_list = array("H")
+        for frm, to in pairs:
+            move = frm | to << TO_SHIFT
+            if to >> 3 == last_row and pawns >> frm & 1:
+                move |= QUEEN_PROMOTION
+            move_list.append(move)
+        return move_list
+
+    def calc_possible_moves(self):
+        """
+        Returns a list of valid chess moves for current player in form "a1 b2"
+        :return: list of strings
+        """
+        possible_moves = [MOVE_STRINGS[frm][to] for frm, to in self._legal_moves()]
+        if possible_moves:
+            self._game_status = ONGOING
+        return possible_moves
+
+    def calc_move_list(self):
+        """
+        Returns the valid moves for the current player packed as ints in the
+        form described in chess.moves, in the same order as
+        calc_possible_moves. Lists are kept in the process cache, each call
+        gets its own copy.
+        :return: array of ints
+        """
+        position_cache = cache.get_cache()
+        if position_cache is not None:
+            move_list = position_cache.get(self._zobrist_key, cache.MOVE_LIST)
+            if move_list is not None:
+                if move_list:
+                    self._game_status = ONGOING
+                return move_list[:]
+
+        move_list = self._pack_moves(self._legal_moves())
+        if move_list:
+            self._game_status = ONGOING
+        if position_cache is not None:
+            position_cache.put(self._zobrist_key, cache.MOVE_LIST, move_list[:])
+        return move_list
+
+    def calc_capture_list(self):
+        """
+        Returns the valid captures and pawn upgrades for the current player,
+        packed as ints like calc_move_list. Quiet moves are never generated,
+        so this is much cheaper than calc_move_list. An empty list does not
+        mean the game is over.
+        :return: array of ints
+        """
+        return self._pack_moves(self._legal_moves(captures_only=True))
+
+    def parse_move(self, move):
+        """
+        Converts a string move to an int for this board, marking pawns that
+        reach the last row as upgraded.
+        :param move: a chess move in the form "a1 b2"
+        :return: int
+        """
+        assert move in MOVE_INTS, "invalid move: {}".format(move)
+        move_int = MOVE_INTS[move]
+        frm, to = MOVE_SQUARES[move]
+        if to >> 3 == (7 if self._side == 0 else 0) \
+                and self._pieces[self._side * 6 + PAWN] >> frm & 1:
+            move_int |= QUEEN_PROMOTION
+        return move_int
+
+    def has_no_moves(self):
+        """
+        Returns True if the current player has no valid moves. Moves that put
+        their king in check are not considered valid moves.
+        :return: Boolean
+        """
+        for _ in self._legal_moves():
+            return False
+        return True
+
+    def do_move(self, move):
+        """
+        Returns a board that is made by performing a given move on the
+        current board. This makes no changes to the current board.
+        :param move: a chess move in the form "a1 b2"
+        :return: board object
+        """
+        check = validation.should_check(self._validation)
+        if check:
+            assert move in MOVE_SQUARES, "invalid move: {}".format(move)
+        frm, to = MOVE_SQUARES[move]
+        side = self._side
+        attacking_piece = self._squares[frm]
+        defending_piece = self._squares[to]
+        if check:
+            assert self._occupied_by[side] & (1 << frm), "Error can't attack with this. " \
+                "Current player: {}. attacking_piece: {}".format(self._player_turn, attacking_piece)
+            assert not self._occupied_by[side] & (1 << to), "Error can't attack with this. " \
+                "Current player: {}. defending piece: {}".format(self._player_turn, defending_piece)
+
+        pieces = self._pieces[:]
+        occupied_by = self._occupied_by[:]
+        squares = self._squares[:]
+        frm_bit = 1 << frm
+        to_bit = 1 << to
+
+        moved_side, moved_type = CHAR_PIECES[attacking_piece]
+        code = side * 6 + moved_type
+        pieces[code] ^= frm_bit
+        occupied_by[side] ^= frm_bit | to_bit
+        squares[frm] = "."
+
+        material = list(self._material)
+        if defending_piece != ".":
+            captured_side, captured_type = CHAR_PIECES[defending_piece]
+            pieces[captured_side * 6 + captured_type] ^= to_bit
+            occupied_by[captured_side] ^= to_bit
+            material[captured_side] -= TYPE_VALUES[captured_type]
+
+        # upgrades pawns to queens if they reach the last row
+        if moved_type == PAWN and to >> 3 == (7 if side == 0 else 0):
+            code = side * 6 + QUEEN
+            material[side] += TYPE_VALUES[QUEEN] - TYPE_VALUES[PAWN]
+        pieces[code] |= to_bit
+        squares[to] = CODE_CHARS[code]
+
+        zobrist_key = self._zobrist_key ^ zobrist.move_key(
+            frm, to, attacking_piece, defending_piece, squares[to])
+        return self._from_state(1 - side, pieces, occupied_by, squares,
+                                zobrist_key, tuple(material), self._validation)
+
+    def evaluate(self):
+        """
+        Evaluates current board state exactly as ChessBoard.evaluate does.
+        If current player is ahead the score will be positive.
+        :return: int
+        """
+        score = self._material[0] - self._material[1]
+
+        status = self.game_status
+        if status == CHECKMATE:
+            if self._side == 0:
+                score = -1000
+            else:
+                score = 1000
+        elif status == STALEMATE:
+            # its a draw, player1 only wants it when behind
+            if score > 0:
+                score = -1000
+            else:
+                score = 1000
+
+        if self._side == 0:
+            return score
+        else:
+            return score * -1
+
+    def static_evaluate(self):
+        """
+        Evaluates the board from piece weights alone, without checking if the
+        game is over. This is much cheaper than evaluate.
+        :return: int, positive if the current player is ahead
+        """
+        if self._side == 0:
+            return self._material[0] - self._material[1]
+        else:
+            return self._material[1] - self._material[0]
+
+    def get_possible_boards(self):
+        """
+        Returns a list of all the possible boards created by doing any valid
+        move.
+        :return: list of board objects
+        """
+        return list(map(self.do_move, self.calc_possible_moves()))
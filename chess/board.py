@@ -1,24 +1,119 @@
-from chess import helper
+from chess import cache
 from chess import pieces
+from chess import tables
+from chess import validation
+from chess import zobrist
+from chess.moves import MOVE_SQUARES, MOVE_STRINGS
 from chess.pieces import P1_CHAR, P2_CHAR
-
-piece_class_dict = {"p": pieces.Pawn,
-                    "r": pieces.Rook,
-                    "b": pieces.Bishop,
-                    "q": pieces.Queen,
-                    "n": pieces.Knight,
-                    "k": pieces.King}
+from chess.validation import LEVELS as VALIDATION_LEVELS
+
+# results of ChessBoard.game_status
+ONGOING = "ongoing"
+CHECKMATE = "checkmate"
+STALEMATE = "stalemate"
+
+# weight of each piece when adding up a player's material
+PIECE_VALUES = {"p": 1,
+                "n": 3,
+                "b": 3,
+                "r": 5,
+                "q": 9,
+                "k": 0}
+
+
+def calc_material(board):
+    """
+    Adds up the PIECE_VALUES of each player's pieces.
+    :param board: string in the form used by ChessBoard
+    :return: tuple of ints (player1 total, player2 total)
+    """
+    p1_score = 0
+    p2_score = 0
+    for square in board[2:]:
+        if square.islower():
+            p1_score += PIECE_VALUES[square]
+        elif square.isupper():
+            p2_score += PIECE_VALUES[square.lower()]
+    return p1_score, p2_score
 
 
 class ChessBoard(object):
-    def __init__(self, board):
-        self._str_code = board
+    # a board never changes once made, so everything worked out from it is
+    # kept in these slots the first time it is needed
+    __slots__ = ("_str_code", "_player_turn", "_board", "_validation", "_zobrist_key",
+                 "_material", "_game_status", "_attack_maps", "_moves", "_has_moves",
+                 "_king_attacked", "_pieces", "_piece_counts")
 
+    def __init__(self, board, zobrist_key=None, material=None, validation=None):
+        """
+        Creates a board from its code, always checking it is a valid board.
+        :param board: string such as "1 rnbkqbnr pppppppp ... RNBKQBNR"
+        :param zobrist_key: key of the board if already known
+        :param material: (player 1, player 2) material if already known
+        :param validation: optional level from chess.validation for the moves
+               made on this board and the boards made from it
+        """
+        assert validation in VALIDATION_LEVELS + (None,), \
+            "validation is {} but must be in {}".format(validation, VALIDATION_LEVELS)
         assert len(board) == 73, "board was {} should have been {}".format(len(board), 73)
-        self._player_turn = board[0]
-        self._board = tuple(map(tuple, board[2:].split()))
+        self._set_state(board, tuple(map(tuple, board[2:].split())), zobrist_key,
+                        material, validation)
 
+        # checked before the key and material are worked out, so a bad
+        # character fails here rather than as a missing key in their tables
         assert self.sanity_check()
+        if zobrist_key is None:
+            self._zobrist_key = zobrist.board_key(board)
+        if material is None:
+            self._material = calc_material(board)
+
+    @classmethod
+    def _trusted(cls, board, rows, zobrist_key, material, validation):
+        """
+        Creates a board from state do_move already worked out, without parsing
+        the code or checking the board again.
+        """
+        new_board = cls.__new__(cls)
+        new_board._set_state(board, rows, zobrist_key, material, validation)
+        return new_board
+
+    def _set_state(self, board, rows, zobrist_key, material, validation):
+        """
+        Sets every attribute of a new board.
+        :param board: string code of the board
+        :param rows: tuple of 8 tuples of 8 square characters
+        """
+        self._str_code = board
+        self._player_turn = board[0]
+        self._board = rows
+        self._validation = validation
+
+        # do_move passes in the key it updated, otherwise __init__ computes it
+        self._zobrist_key = zobrist_key
+
+        # (player 1, player 2) totals of PIECE_VALUES, kept up to date by
+        # do_move, otherwise computed by __init__
+        self._material = material
+
+        # worked out the first time game_status is used
+        self._game_status = None
+
+        # player to the set of (row, col) squares they attack, created by
+        # attacked_squares as each player's map is needed
+        self._attack_maps = None
+
+        # tuple of the moves from calc_possible_moves and whether there are
+        # any at all, which has_no_moves can find out without the full list
+        self._moves = None
+        self._has_moves = None
+
+        # is_attacking_king results, indexed by flip_player, created on first use
+        self._king_attacked = None
+
+        # get_pieces results by player, and (player 1, player 2) piece counts,
+        # created on first use
+        self._pieces = None
+        self._piece_counts = None
 
     def __str__(self):
         """Creates an ascii board for use in console"""
@@ -80,14 +175,57 @@ class ChessBoard(object):
     def player_turn(self):
         return self._player_turn
 
+    @property
+    def zobrist_key(self):
+        """Returns the 64 bit Zobrist hash of the position as an int"""
+        return self._zobrist_key
+
+    @property
+    def material(self):
+        """Returns a tuple of each player's total piece value (player1, player2)"""
+        return self._material
+
+    @property
+    def game_status(self):
+        """
+        Returns ONGOING if the current player has a valid move, otherwise
+        CHECKMATE or STALEMATE. It is only worked out once per board, and
+        kept in the process cache for other boards of the same position.
+        :return: string
+        """
+        if self._game_status is None:
+            position_cache = cache.get_cache()
+            if position_cache is not None:
+                self._game_status = position_cache.get(self._zobrist_key, cache.STATUS)
+                if self._game_status is not None:
+                    return self._game_status
+
+            if not self.has_no_moves():
+                self._game_status = ONGOING
+            elif self.is_attacking_king(flip_player=True):
+                self._game_status = CHECKMATE
+            else:
+                self._game_status = STALEMATE
+            if position_cache is not None:
+                position_cache.put(self._zobrist_key, cache.STATUS, self._game_status)
+        return self._game_status
+
     def get_pieces(self, player=None):
         """
         Returns a dict of piece characters mapped to the number on the board.
+        The count is only done once per board and player, each call gets its
+        own copy.
         :param player: optional param int 1 for player1 or int 2 for player2
         :return: pieces dict
         """
         assert player in (1, 2, None), \
             "player is {} but must be in (1, 2, None)".format(player)
+        if self._pieces is None:
+            self._pieces = {}
+        pieces_dict = self._pieces.get(player)
+        if pieces_dict is not None:
+            return dict(pieces_dict)
+
         pieces_dict = {}
         for row in self._board:
             for char in row:
@@ -101,7 +239,8 @@ class ChessBoard(object):
                         pieces_dict[char] += 1
                     else:
                         pieces_dict[char] = 1
-        return pieces_dict
+        self._pieces[player] = pieces_dict
+        return dict(pieces_dict)
 
     def sanity_check(self):
         """
@@ -160,18 +299,22 @@ class ChessBoard(object):
 
     def get_piece_count(self, player):
         """
-        Counts the number of pieces for a given player.
+        Counts the number of pieces for a given player. Both players are
+        counted together the first time this is used on a board.
         :param player: a string representing the player "1" or "2"
         :return: number of pieces as an int
         """
         assert player in (P1_CHAR, P2_CHAR), "invalid player {}".format(player)
-        piece_count = 0
-        for char in self._str_code[2:]:
-            if player == P1_CHAR and char.islower():
-                piece_count += 1
-            elif player == P2_CHAR and char.isupper():
-                piece_count += 1
-        return piece_count
+        if self._piece_counts is None:
+            p1_count = 0
+            p2_count = 0
+            for char in self._str_code[2:]:
+                if char.islower():
+                    p1_count += 1
+                elif char.isupper():
+                    p2_count += 1
+            self._piece_counts = (p1_count, p2_count)
+        return self._piece_counts[0 if player == P1_CHAR else 1]
 
     def do_move(self, move):
         """
@@ -180,60 +323,53 @@ class ChessBoard(object):
         :param move: a chess move in the form "a1 b2"
         :return: board object
         """
-        frm, to = move.split()
-        assert self.sanity_check()
-        assert len(frm) == 2 and len(to) == 2, "invalid inputs: {} {}" \
-            .format(frm, to)
-        assert frm[0] in "abcdefgh", "frm letter: {} not valid".format(frm[0])
-        assert to[0] in "abcdefgh", "to letter: {} not valid".format(to[0])
-        assert frm[1] in "12345678", "frm number: {} not valid".format(frm[1])
-        assert to[1] in "12345678", "to number: {} not valid".format(to[1])
-
-        decoded_frm = helper.decode_inpt(frm)
-        decoded_to = helper.decode_inpt(to)
-        prev_board = self.__repr__().split()[1:]
-        assert len(prev_board) == 8, "len of prev board should now be 8"
-
-        r1, c1 = decoded_frm
-        r2, c2 = decoded_to
+        check = validation.should_check(self._validation)
+        if check:
+            assert self.sanity_check()
+            frm, to = move.split()
+            assert len(frm) == 2 and len(to) == 2, "invalid inputs: {} {}" \
+                .format(frm, to)
+            assert frm[0] in "abcdefgh", "frm letter: {} not valid".format(frm[0])
+            assert to[0] in "abcdefgh", "to letter: {} not valid".format(to[0])
+            assert frm[1] in "12345678", "frm number: {} not valid".format(frm[1])
+            assert to[1] in "12345678", "to number: {} not valid".format(to[1])
+
+        frm_sq, to_sq = MOVE_SQUARES[move]
+        r1, c1 = divmod(frm_sq, 8)
+        r2, c2 = divmod(to_sq, 8)
 
         attacking_piece = self._board[r1][c1]
         defending_piece = self._board[r2][c2]
 
-        if self._player_turn == P1_CHAR:
-            assert attacking_piece.islower(), "Error can't attack with this. " \
-             "Current player: {}. attacking_piece: {}".format(self._player_turn, attacking_piece)
-            assert not defending_piece.islower(), "Error can't attack with this. " \
-             "Current player: {}. defending piece: {}".format(self._player_turn, defending_piece)
-
-        elif self._player_turn == P2_CHAR:
-            assert attacking_piece.isupper(), "Error can't attack with this. " \
-             "Current player: {}. attacking_piece: {}".format(self._player_turn, attacking_piece)
-            assert not defending_piece.isupper(), "Error can't attack with this. " \
-             "Current player: {}. defending piece: {}".format(self._player_turn, defending_piece)
-
-        # now make new board while changing pieces
-        new_board = []
-        for r in range(len(prev_board)):
-            # if current row doesn't include pieces that will change
-            if r != r1 and r != r2:
-                new_board.append(prev_board[r])
-            else:
-                new_row = ""
-                for c in range(len(prev_board[r])):
-                    if r == r1 and c == c1:
-                        new_row += "."
-                    elif r == r2 and c == c2:
-                        # upgrades pawns to queens if they reach the last row
-                        if attacking_piece == "p" and r2 == 7:
-                            new_row += "q"
-                        elif attacking_piece == "P" and r2 == 0:
-                            new_row += "Q"
-                        else:
-                            new_row += attacking_piece
-                    else:
-                        new_row += prev_board[r][c]
-                new_board.append(new_row)
+        if check:
+            if self._player_turn == P1_CHAR:
+                assert attacking_piece.islower(), "Error can't attack with this. " \
+                 "Current player: {}. attacking_piece: {}".format(self._player_turn, attacking_piece)
+                assert not defending_piece.islower(), "Error can't attack with this. " \
+                 "Current player: {}. defending piece: {}".format(self._player_turn, defending_piece)
+
+            elif self._player_turn == P2_CHAR:
+                assert attacking_piece.isupper(), "Error can't attack with this. " \
+                 "Current player: {}. attacking_piece: {}".format(self._player_turn, attacking_piece)
+                assert not defending_piece.isupper(), "Error can't attack with this. " \
+                 "Current player: {}. defending piece: {}".format(self._player_turn, defending_piece)
+
+        # upgrades pawns to queens if they reach the last row
+        if attacking_piece == "p" and r2 == 7:
+            placed_piece = "q"
+        elif attacking_piece == "P" and r2 == 0:
+            placed_piece = "Q"
+        else:
+            placed_piece = attacking_piece
+
+        # now make new board, copying only the rows that change
+        new_board = list(self._board)
+        new_row = list(new_board[r1])
+        new_row[c1] = "."
+        new_board[r1] = tuple(new_row)
+        new_row = list(new_board[r2])
+        new_row[c2] = placed_piece
+        new_board[r2] = tuple(new_row)
 
         # flip players turn
         assert self._player_turn in (P1_CHAR, P2_CHAR)
@@ -242,131 +378,270 @@ class ChessBoard(object):
         else:
             new_player_turn = P1_CHAR
 
-        new_str = new_player_turn + " " + " ".join(new_board)
-        return ChessBoard(new_str)
+        new_key = self._zobrist_key ^ zobrist.move_key(
+            frm_sq, to_sq, attacking_piece, defending_piece, placed_piece)
+
+        # only a taken piece or an upgraded pawn changes the material
+        p1_material, p2_material = self._material
+        if defending_piece != ".":
+            if defending_piece.islower():
+                p1_material -= PIECE_VALUES[defending_piece]
+            else:
+                p2_material -= PIECE_VALUES[defending_piece.lower()]
+        if placed_piece != attacking_piece:
+            gain = PIECE_VALUES[placed_piece.lower()] - PIECE_VALUES[attacking_piece.lower()]
+            if placed_piece.islower():
+                p1_material += gain
+            else:
+                p2_material += gain
+
+        new_str = new_player_turn + " " + " ".join("".join(row) for row in new_board)
+        new_board = self._trusted(new_str, tuple(new_board), new_key,
+                                  (p1_material, p2_material), self._validation)
+        if check:
+            assert new_board.sanity_check()
+        return new_board
 
     def evaluate(self):
         """
-        Evaluates current board state by adding up each player's pieces and 
-        each piece has a weight. The value returned is current player's score 
-        subtracted by the opposite players score. If current player is ahead 
-        the score will be positive.
+        Evaluates current board state from each player's total piece weights,
+        which do_move keeps up to date. The value returned is current player's
+        score subtracted by the opposite players score. If current player is
+        ahead the score will be positive. A finished game scores 1000 or -1000.
         :return: int
         """
-        score_dict = {"p": 1,
-                      "n": 3,
-                      "b": 3,
-                      "r": 5,
-                      "q": 9,
-                      "k": 0}
-        p1_score = 0
-        p2_score = 0
-        for row in self._board:
-            for square in row:
-                if square.islower():
-                    p1_score += score_dict[square.lower()]
-                elif square.isupper():
-                    p2_score += score_dict[square.lower()]
-
+        p1_score, p2_score = self._material
         score = p1_score - p2_score
 
-        if self.has_no_moves():
-            if self.is_attacking_king(flip_player=True):  # sure its flipped=True?
-                # its a checkmate
-                if self._player_turn == P1_CHAR:
-                    score = -1000
-                else:
-                    score = 1000
+        status = self.game_status
+        if status == CHECKMATE:
+            if self._player_turn == P1_CHAR:
+                score = -1000
             else:
-                # its a draw
-                if score > 0:
-                    # player1 is ahead in score and does NOT want to draw
-                    score = -1000
-                else:
-                    # player1 is behind in score and DOES want to draw
-                    score = 1000
+                score = 1000
+        elif status == STALEMATE:
+            # its a draw
+            if score > 0:
+                # player1 is ahead in score and does NOT want to draw
+                score = -1000
+            else:
+                # player1 is behind in score and DOES want to draw
+                score = 1000
 
         if self._player_turn == P1_CHAR:
             return score
         else:
             return score * -1
 
+    def static_evaluate(self):
+        """
+        Evaluates the board from piece weights alone, without checking if the
+        game is over. This is much cheaper than evaluate.
+        :return: int, positive if the current player is ahead
+        """
+        p1_score, p2_score = self._material
+        if self._player_turn == P1_CHAR:
+            return p1_score - p2_score
+        else:
+            return p2_score - p1_score
+
     def calc_possible_moves(self):
         """
-        Returns a list of valid chess moves for current player in form "a1 b2"
+        Returns a list of valid chess moves for current player in form "a1 b2".
+        The moves are only generated once per board and kept in the process
+        cache for other boards of the same position. Each call gets its own
+        copy of the list.
         :return: list of strings
         """
-
-        possible_moves = []
-
-        # for each piece on the board
-        for r in range(len(self._board)):
-            for c in range(len(self._board[r])):
-                piece_char = self._board[r][c]
-                if piece_char != ".":
-
-                    # checks if either can attack
-                    player_can_attack = self._player_turn == P1_CHAR and piece_char.islower()
-                    comp_can_attack = self._player_turn == P2_CHAR and self._board[r][c].isupper()
-
-                    # if piece can attack, make a piece object
-                    if player_can_attack or comp_can_attack:
-                        piece_class = piece_class_dict[piece_char.lower()]
-                        piece = piece_class(r, c, self._player_turn)
-                        new_moves = piece.calc_moves(self)
-
-                        # add each pieces's moves into possible_moves
-                        # in the form "a1 b2"
-                        for defender in new_moves["defender"]:
-                            frm = helper.encode_inpt(*new_moves["attacker"])
-                            to = helper.encode_inpt(*defender)
-                            possible_moves.append("{} {}".format(frm, to))
-
-        # filter out any moves that would put the king in check
-        i = 0
-        while i < len(possible_moves):
-            possible_board = self.do_move(possible_moves[i])
-            if possible_board.is_attacking_king():
-                possible_moves.pop(i)
-            else:
-                i += 1
-
-        return possible_moves
+        if self._moves is None:
+            position_cache = cache.get_cache()
+            if position_cache is not None:
+                self._moves = position_cache.get(self._zobrist_key, cache.MOVES)
+            if self._moves is None:
+                self._moves = tuple(self._legal_moves())
+                if position_cache is not None:
+                    position_cache.put(self._zobrist_key, cache.MOVES, self._moves)
+            self._has_moves = bool(self._moves)
+            if self._has_moves:
+                self._game_status = ONGOING
+        return list(self._moves)
 
     def has_no_moves(self):
         """
         Returns True if the current player has no valid moves. Moves that put 
-        their king in check are not considered valid moves.
+        their king in check are not considered valid moves. Stops at the first
+        valid move unless the moves were already generated.
         :return: Boolean
         """
+        if self._has_moves is None:
+            self._has_moves = False
+            for _ in self._legal_moves():
+                self._has_moves = True
+                break
+        return not self._has_moves
+
+    def _legal_moves(self):
+        """
+        Generates the valid moves for the current player in form "a1 b2".
+        Pieces giving check and pieces pinned to the king are found once, so
+        each piece's moves can be checked without making them. Moves come out
+        in board order, then for each piece in the order of a set of its
+        (row, col) targets, as they always have. One list of target squares
+        is reused for every piece.
+        :return: generator of strings
+        """
+        player = self._player_turn
+        if player == P1_CHAR:
+            is_own = str.islower
+            enemy = P2_CHAR
+        else:
+            is_own = str.isupper
+            enemy = P1_CHAR
+
+        king_row, king_col = self._find_king(player)
+        checkers = self._attackers(king_row, king_col, enemy)
+        pins = self._pins(king_row, king_col)
+
+        # when in check, other pieces may only take the checker or block it
+        evasions = None
+        if len(checkers) == 1:
+            evasions = self._check_evasions(king_row, king_col, *checkers[0])
+
+        targets = []
         # for each piece on the board
-        for r in range(len(self._board)):
-            for c in range(len(self._board[r])):
-                piece_char = self._board[r][c]
-                if piece_char != ".":
-
-                    # checks if either can attack
-                    player_can_attack = self._player_turn == P1_CHAR and piece_char.islower()
-                    comp_can_attack = self._player_turn == P2_CHAR and \
-                                      self._board[r][c].isupper()
-
-                    # if piece can attack, make a piece object
-                    if player_can_attack or comp_can_attack:
-                        piece_class = piece_class_dict[piece_char.lower()]
-                        piece = piece_class(r, c, self._player_turn)
-                        new_moves = piece.calc_moves(self)
-
-                        # add each pieces's moves into possible_moves
-                        # in the form "a1 b2"
-
-                        for defender in new_moves["defender"]:
-                            frm = helper.encode_inpt(*new_moves["attacker"])
-                            to = helper.encode_inpt(*defender)
-                            move = "{} {}".format(frm, to)
-                            possible_board = self.do_move(move)
-                            if not possible_board.is_attacking_king():
-                                return False
-        return True
+        for r in range(8):
+            row = self._board[r]
+            for c in range(8):
+                piece_char = row[c]
+                if not is_own(piece_char):
+                    continue
+                is_king = r == king_row and c == king_col
+                # in double check only the king can move
+                if len(checkers) > 1 and not is_king:
+                    continue
+
+                sq = r * 8 + c
+                del targets[:]
+                pieces.MOVE_GENERATORS[piece_char].generate(self, r, c, player, targets)
+                move_strings = MOVE_STRINGS[sq]
+                pin_line = pins.get(sq)
+
+                for r2, c2 in {tables.SQUARES[to] for to in targets}:
+                    to = r2 * 8 + c2
+                    if is_king:
+                        # the king must not stay in line with a slider it
+                        # was blocking itself, which the generator could not
+                        # see with the king still on the board
+                        if checkers and self._attackers(r2, c2, enemy,
+                                                        ignore=(king_row, king_col),
+                                                        first_only=True):
+                            continue
+                    else:
+                        if evasions is not None and to not in evasions:
+                            continue
+                        if pin_line is not None and to not in pin_line:
+                            continue
+                    yield move_strings[to]
+
+    def _find_king(self, player):
+        """
+        Finds the given player's king.
+        :param player: a string representing the player "1" or "2"
+        :return: tuple of ints (row, col)
+        """
+        king = "k" if player == P1_CHAR else "K"
+        for r in range(8):
+            if king in self._board[r]:
+                return r, self._board[r].index(king)
+
+    def _attackers(self, row, col, attacker, ignore=None, first_only=False):
+        """
+        Finds the attacker's pieces that threaten a square.
+        :param row: int
+        :param col: int
+        :param attacker: a string representing the attacking player "1" or "2"
+        :param ignore: optional (row, col) of a square to treat as empty
+        :param first_only: if True, stops after finding one piece
+        :return: list of (row, col) tuples
+        """
+        is_attacker = str.islower if attacker == P1_CHAR else str.isupper
+        board = self._board
+        sq = row * 8 + col
+        found = []
+
+        # a pawn attacks this square from where a pawn of the other side on
+        # this square would attack
+        defender = P2_CHAR if attacker == P1_CHAR else P1_CHAR
+        steps = [(tables.KING_TARGETS[sq], "k"),
+                 (tables.KNIGHT_TARGETS[sq], "n"),
+                 (tables.PAWN_ATTACKS[defender][sq], "p")]
+        for targets, kind in steps:
+            for r, c in targets:
+                if board[r][c].lower() == kind and is_attacker(board[r][c]):
+                    found.append((r, c))
+                    if first_only:
+                        return found
+
+        for direction in tables.DIRECTIONS:
+            sliders = ("q", "b") if direction in tables.DIAGONAL_DIRECTIONS else ("q", "r")
+            for r, c in tables.RAYS[direction][sq]:
+                square = board[r][c]
+                if square != "." and (r, c) != ignore:
+                    if square.lower() in sliders and is_attacker(square):
+                        found.append((r, c))
+                        if first_only:
+                            return found
+                    break
+        return found
+
+    def _pins(self, king_row, king_col):
+        """
+        Finds the current player's pieces that cannot leave the line between
+        their king and an enemy slider without exposing the king.
+        :param king_row: int
+        :param king_col: int
+        :return: dict of the pinned piece's square to a set of the squares
+                 it may move to, including the pinning piece, numbered
+                 row * 8 + col
+        """
+        is_own = str.islower if self._player_turn == P1_CHAR else str.isupper
+        board = self._board
+        pins = {}
+        for direction in tables.DIRECTIONS:
+            sliders = ("q", "b") if direction in tables.DIAGONAL_DIRECTIONS else ("q", "r")
+            ray = tables.RAYS[direction][king_row * 8 + king_col]
+            pinned = None
+            for index, (r, c) in enumerate(ray):
+                square = board[r][c]
+                if square != ".":
+                    if is_own(square):
+                        if pinned is not None:
+                            break
+                        pinned = r * 8 + c
+                    else:
+                        if pinned is not None and square.lower() in sliders:
+                            pins[pinned] = {r2 * 8 + c2 for r2, c2 in ray[:index + 1]}
+                        break
+        return pins
+
+    def _check_evasions(self, king_row, king_col, checker_row, checker_col):
+        """
+        Returns the squares a piece other than the king can move to in order
+        to stop a single check: the checker's square, and for a checking
+        rook, bishop or queen the squares between it and the king.
+        :return: set of squares numbered row * 8 + col
+        """
+        evasions = {checker_row * 8 + checker_col}
+        if self._board[checker_row][checker_col].lower() in ("q", "r", "b"):
+            i = (checker_row > king_row) - (checker_row < king_row)
+            j = (checker_col > king_col) - (checker_col < king_col)
+            r = king_row + i
+            c = king_col + j
+            while (r, c) != (checker_row, checker_col):
+                evasions.add(r * 8 + c)
+                r += i
+                c += j
+        return evasions
 
     def on_board(self, row, col):
         """
@@ -381,6 +656,52 @@ class ChessBoard(object):
         within_cols = 0 <= col < num_cols
         return within_rows and within_cols
 
+    def attacked_squares(self, attacker):
+        """
+        Returns every square the attacker's pieces threaten, worked out once
+        per board. Like is_square_attacked, pawns only threaten their
+        diagonals and sliding pieces stop at the first piece of either player.
+        :param attacker: a string representing the attacking player "1" or "2"
+        :return: frozenset of (row, col) tuples
+        """
+        if self._attack_maps is None:
+            self._attack_maps = {}
+        attacked = self._attack_maps.get(attacker)
+        if attacked is not None:
+            return attacked
+
+        is_attacker = str.islower if attacker == P1_CHAR else str.isupper
+        board = self._board
+        squares = set()
+        for r in range(8):
+            for c in range(8):
+                piece_char = board[r][c]
+                if not is_attacker(piece_char):
+                    continue
+                sq = r * 8 + c
+                kind = piece_char.lower()
+                if kind == "p":
+                    squares.update(tables.PAWN_ATTACKS[attacker][sq])
+                elif kind == "n":
+                    squares.update(tables.KNIGHT_TARGETS[sq])
+                elif kind == "k":
+                    squares.update(tables.KING_TARGETS[sq])
+                else:
+                    rays = ()
+                    if kind != "b":
+                        rays += tables.STRAIGHT_RAYS[sq]
+                    if kind != "r":
+                        rays += tables.DIAGONAL_RAYS[sq]
+                    for ray in rays:
+                        for r2, c2 in ray:
+                            squares.add((r2, c2))
+                            if board[r2][c2] != ".":
+                                break
+
+        attacked = frozenset(squares)
+        self._attack_maps[attacker] = attacked
+        return attacked
+
     def is_square_attacked(self, row, col, static_player=False):
         """
         Returns true is any enemy pieces are threatening this square. 
@@ -392,121 +713,15 @@ class ChessBoard(object):
         :param static_player: Boolean
         :return: Boolean
         """
-
-        # temporarily flip self._player_turn to the same player
-        # as square being attacked
-        before_flip = self._player_turn
-
-        if self._board[row][col].islower():
-            square_owner = P1_CHAR
-        elif self._board[row][col].isupper():
-            square_owner = P2_CHAR
-        else:
-            square_owner = "unknown"
-
-        player_flipped = False
-        # if it is unknown, dont change anything
-        if square_owner != "unknown" and not static_player:
-            if self._player_turn != square_owner:
-                player_flipped = True
-                if self._player_turn == P1_CHAR:
-                    self._player_turn = P2_CHAR
-                else:
-                    self._player_turn = P1_CHAR
-
-        # go in each direction, check pieces that could be attacking from that direction
-        is_attacked = False
-
-        # check 1 square distance for kings
-        for i in range(-1, 2):
-            for j in range(-1, 2):
-                if not (i == 0 and j == 0):
-                    attacker_row = row + i
-                    attacker_col = col + j
-                    if self.on_board(attacker_row, attacker_col)\
-                            and self.get_square(attacker_row, attacker_col).lower() == "k"\
-                            and self.is_enemy(attacker_row, attacker_col):
-                        is_attacked = True
-                        break
-
-        # check for pawns
-        if self._player_turn == P2_CHAR:
-            attacker_row = row - 1
+        # the square's owner is attacked by the other player, and an empty
+        # square (or any square with static_player) by the player not to move
+        square = self._board[row][col]
+        if square != "." and not static_player:
+            friendly = P1_CHAR if square.islower() else P2_CHAR
         else:
-            attacker_row = row + 1
-        for i in (-1, 1):
-            attacker_col = col + i
-            if self.on_board(attacker_row, attacker_col) \
-                    and self.get_square(attacker_row, attacker_col).lower() == "p" \
-                    and self.is_enemy(attacker_row, attacker_col):
-                is_attacked = True
-                break
-
-        # check for knights
-        for i in (-2, -1, 1, 2):
-            for j in (-2, -1, 1, 2):
-                if abs(i) != abs(j):
-                    attacker_row = row + i
-                    attacker_col = col + j
-                    if self.on_board(attacker_row, attacker_col)\
-                            and self.get_square(attacker_row, attacker_col).lower() == "n"\
-                            and self.is_enemy(attacker_row, attacker_col):
-                        is_attacked = True
-                        break
-
-        # check horizontal for queens/rooks
-        attacker_col = col
-        for i in (-1, 1):
-            attacker_row = row + i
-            while self.on_board(attacker_row, attacker_col):
-                if self.get_square(attacker_row, attacker_col).lower() in ("q", "r")\
-                        and self.is_enemy(attacker_row, attacker_col):
-                    is_attacked = True
-                    break
-                if self.get_square(attacker_row, attacker_col) != ".":
-                    break
-                attacker_row += i
-
-        # check vertical for queens/rooks
-        attacker_row = row
-        for i in (-1, 1):
-            attacker_col = col + i
-            while self.on_board(attacker_row, attacker_col):
-                if self.get_square(attacker_row, attacker_col).lower() in ("q", "r") \
-                        and self.is_enemy(attacker_row, attacker_col):
-                    is_attacked = True
-                    break
-                if self.get_square(attacker_row, attacker_col) != ".":
-                    break
-                attacker_col += i
-
-        # check diagonals for queens/bishops
-        for i in (-1, 1):
-            for j in (-1, 1):
-                attacker_row = row + i
-                attacker_col = col + j
-                while self.on_board(attacker_row, attacker_col):
-                    if self.get_square(attacker_row, attacker_col).lower() in (
-                    "q", "b") and self.is_enemy(attacker_row, attacker_col):
-                        is_attacked = True
-                        break
-                    if self.get_square(attacker_row, attacker_col) != ".":
-                        break
-                    attacker_row += i
-                    attacker_col += j
-
-        # if player was flipped, flip it back
-        if player_flipped:
-            if self._player_turn == P1_CHAR:
-                self._player_turn = P2_CHAR
-            else:
-                self._player_turn = P1_CHAR
-
-        # self._player_turn could have been flipped but will always flip back
-        after_flip = self._player_turn
-        assert after_flip == before_flip
-
-        return is_attacked
+            friendly = self._player_turn
+        enemy = P2_CHAR if friendly == P1_CHAR else P1_CHAR
+        return (row, col) in self.attacked_squares(enemy)
 
     def is_attacking_king(self, flip_player=False):
         """
@@ -515,28 +730,23 @@ class ChessBoard(object):
                being attacked by the enemy/
         :return: Boolean
         """
-
-        # king char is flipped from standard king
+        flip_player = bool(flip_player)
+        if self._king_attacked is None:
+            self._king_attacked = [None, None]
+        attacked = self._king_attacked[flip_player]
+        if attacked is not None:
+            return attacked
+
+        # the king is flipped from the enemy king
         # this is to test if you moved into check
         if flip_player:
-            if self._player_turn == P1_CHAR:
-                enemy_king = "k"
-            else:
-                enemy_king = "K"
+            defender = self._player_turn
         else:
-            if self._player_turn == P1_CHAR:
-                enemy_king = "K"
-            else:
-                enemy_king = "k"
-
-        # find the king
-        for r in range(len(self._board)):
-            for c in range(len(self._board[r])):
-                if self._board[r][c] == enemy_king:
-                    king_row = r
-                    king_col = c
-
-        return self.is_square_attacked(king_row, king_col)
+            defender = P2_CHAR if self._player_turn == P1_CHAR else P1_CHAR
+        attacker = P2_CHAR if defender == P1_CHAR else P1_CHAR
+        attacked = self._find_king(defender) in self.attacked_squares(attacker)
+        self._king_attacked[flip_player] = attacked
+        return attacked
 
     def is_enemy(self, row, col):
         """
@@ -0,0 +1,246 @@
+"""
+Opening book of moves played in earlier games, looked up by position before
+a player searches.
+
+A book file starts with MAGIC followed by records of an 8 byte Zobrist key,
+a 2 byte move packed as in chess.moves and a 2 byte weight, all little
+endian and sorted by key then move. The file is read through mmap, so every
+process using the same book shares one copy of its pages, and positions are
+found with a binary search over the records.
+
+Books are built from game results, which list the moves played from the
+start board:
+
+    python -m chess.book book.bin ab2=AlphaBeta:depth=2 random=RandomComputer \\
+        --games 100 --max-ply 12
+"""
+import argparse
+import bisect
+import mmap
+import random
+import struct
+import sys
+
+from chess import cache
+from chess.board import CHECKMATE
+from chess.moves import to_string
+from chess.pieces import P1_CHAR, P2_CHAR
+from chess.position import Position
+
+MAGIC = b"CHESSBK1"
+
+# key, move and weight of one book move
+RECORD = struct.Struct("<QHH")
+KEY = struct.Struct("<Q")
+
+MAX_WEIGHT = 65535
+
+# weight a move gets for each game won, drawn or lost by the player making it
+WIN_POINTS = 2
+DRAW_POINTS = 1
+LOSS_POINTS = 0
+
+# books opened in this process by path, see open_book
+_books = {}
+
+
+class _Keys(object):
+    """Sequence of the keys of a book's records, for use with bisect."""
+    def __init__(self, data, count):
+        self._data = data
+        self._count = count
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        return KEY.unpack_from(self._data, len(MAGIC) + index * RECORD.size)[0]
+
+
+class OpeningBook(object):
+    """
+    Book file opened for reading through mmap.
+    :param path: path of a file written by BookBuilder.write
+    """
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as book_file:
+            self._data = mmap.mmap(book_file.fileno(), 0, access=mmap.ACCESS_READ)
+        size = len(self._data) - len(MAGIC)
+        assert self._data[:len(MAGIC)] == MAGIC, "{} is not a book file".format(path)
+        assert size % RECORD.size == 0, "{} has a partial record".format(path)
+        self._count = size // RECORD.size
+        self._keys = _Keys(self._data, self._count)
+
+    def __len__(self):
+        """Returns the number of moves in the book."""
+        return self._count
+
+    def __repr__(self):
+        return "{}({!r})".format(self.__class__.__name__, self.path)
+
+    def close(self):
+        self._data.close()
+
+    def entries(self, key):
+        """
+        Finds the book moves of a position.
+        :param key: Zobrist key of the position
+        :return: list of (int move, weight) tuples, in move order
+        """
+        index = bisect.bisect_left(self._keys, key)
+        entries = []
+        while index < self._count:
+            record_key, move, weight = RECORD.unpack_from(
+                self._data, len(MAGIC) + index * RECORD.size)
+            if record_key != key:
+                break
+            entries.append((move, weight))
+            index += 1
+        return entries
+
+    def moves(self, board):
+        """
+        Finds the book moves of a board that are valid on it.
+        :param board: board object
+        :return: list of (string move, weight) tuples
+        """
+        entries = self.entries(board.zobrist_key)
+        if not entries:
+            return []
+        possible_moves = board.calc_possible_moves()
+        return [(to_string(move), weight) for move, weight in entries
+                if weight and to_string(move) in possible_moves]
+
+    def choose_move(self, board, rng=random):
+        """
+        Picks a book move at random, in proportion to the weights.
+        :param board: board object
+        :param rng: source of random numbers
+        :return: string in form "a1 b2", or None if the position is not in
+                 the book
+        """
+        moves = self.moves(board)
+        if not moves:
+            return None
+        pick = rng.uniform(0, sum(weight for _, weight in moves))
+        for move, weight in moves:
+            pick -= weight
+            if pick <= 0:
+                return move
+        return moves[-1][0]
+
+
+def open_book(path):
+    """
+    Opens a book once per process, so every player given the same path
+    shares it.
+    :param path: path of a book file
+    :return: OpeningBook
+    """
+    book = _books.get(path)
+    if book is None:
+        book = OpeningBook(path)
+        _books[path] = book
+    return book
+
+
+class BookBuilder(object):
+    """
+    Adds up the moves played in games, for writing to a book file.
+    :param max_ply: moves of each game to add, counted from its start
+    """
+    def __init__(self, max_ply=16):
+        self.max_ply = max_ply
+        self.games = 0
+        # (key, int move) to weight
+        self._weights = {}
+
+    def __len__(self):
+        """Returns the number of different moves added so far."""
+        return len(self._weights)
+
+    def add_game(self, start_board, moves, winner=None):
+        """
+        Adds the first moves of a game. Each move is weighted by how the
+        game ended for the player who made it.
+        :param start_board: code of the board the game started from
+        :param moves: list of strings in form "a1 b2" played in order
+        :param winner: P1_CHAR or P2_CHAR for the player who won, or None
+        """
+        assert winner in (P1_CHAR, P2_CHAR, None), "invalid winner {}".format(winner)
+        position = Position(start_board)
+        for move in moves[:self.max_ply]:
+            if winner is None:
+                points = DRAW_POINTS
+            elif winner == position.get_player_turn():
+                points = WIN_POINTS
+            else:
+                points = LOSS_POINTS
+            move_int = position.parse_move(move)
+            entry = (position.zobrist_key, move_int)
+            self._weights[entry] = self._weights.get(entry, 0) + points
+            position.make_move(move_int)
+        self.games += 1
+
+    def add_result(self, result):
+        """
+        Adds a game from a result dict of ChessGame.play or a tournament.
+        :param result: dict with 'start board', 'moves' and 'status'
+        """
+        winner = None
+        if result["status"] == CHECKMATE:
+            # the player to move at the end of the game was checkmated
+            position = Position(result["start board"])
+            for move in result["moves"]:
+                position.make_move(move)
+            winner = P2_CHAR if position.get_player_turn() == P1_CHAR else P1_CHAR
+        self.add_game(result["start board"], result["moves"], winner)
+
+    def write(self, path):
+        """
+        Writes the moves with a weight above 0 to a book file.
+        :param path: path of the file to write
+        :return: number of moves written
+        """
+        records = sorted((key, move, min(weight, MAX_WEIGHT))
+                         for (key, move), weight in self._weights.items() if weight)
+        with open(path, "wb") as book_file:
+            book_file.write(MAGIC)
+            for record in records:
+                book_file.write(RECORD.pack(*record))
+        return len(records)
+
+
+def main(argv=None):
+    from chess.tournament import Tournament, parse_player, ROUND_ROBIN
+
+    parser = argparse.ArgumentParser(description="Build an opening book from games.")
+    parser.add_argument("path", help="book file to write")
+    parser.add_argument("players", nargs="+", type=parse_player,
+                        help="players in the form name=Class:key=value,... "
+                             "such as ab2=AlphaBeta:depth=2")
+    parser.add_argument("--games", type=int, default=10,
+                        help="games per pair of players, an even number")
+    parser.add_argument("--max-ply", type=int, default=16, help="moves of each game to add")
+    parser.add_argument("--max-turns", type=int, default=200)
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cache-mb", type=float, default=cache.DEFAULT_SIZE_MB,
+                        help="size of the position cache of each process, 0 for none")
+    args = parser.parse_args(argv)
+    cache.set_size(args.cache_mb)
+
+    tournament = Tournament(args.players, ROUND_ROBIN, games_per_pair=args.games,
+                            max_turns=args.max_turns, processes=args.processes,
+                            seed=args.seed)
+    builder = BookBuilder(args.max_ply)
+    for result in tournament.run():
+        builder.add_result(result)
+    count = builder.write(args.path)
+    print("wrote {} moves from {} games to {}".format(count, builder.games, args.path))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,175 @@
+"""
+Process-wide cache of what is worked out about a position, shared by every
+board in the process and kept across games and searches.
+
+Entries are keyed by the position's Zobrist key and hold, once known:
+
+    STATUS     the game_status of the position
+    MOVES      ChessBoard's list of moves as strings
+    MOVE_LIST  BitBoard's list of moves packed as ints
+
+evaluate is worked out from the material and the game status, so keeping
+the status makes repeat evaluations as cheap as static_evaluate.
+
+The cache holds about size_mb megabytes and throws out the least recently
+used positions first. It is off unless turned on, so results and timings do
+not depend on what was looked at before. Its size is set for the whole
+process with set_size, which also sets the CHESS_CACHE_MB environment
+variable the cache starts from, so worker processes started afterwards use
+the same size. A size of 0 turns the cache off.
+"""
+import os
+import sys
+from collections import OrderedDict
+
+STATUS = 0
+MOVES = 1
+MOVE_LIST = 2
+
+# size of the cache when it is turned on without a size
+DEFAULT_SIZE_MB = 16
+
+# approximate bytes used by an entry before its move lists are added: its
+# place in the dict, the int key and the list holding the fields
+ENTRY_OVERHEAD = 200
+
+
+def _size_of(value):
+    """Returns the approximate bytes a field adds to an entry."""
+    # statuses are shared constants that cost nothing extra
+    if value is None or value.__class__ is str:
+        return 0
+    return sys.getsizeof(value)
+
+
+class PositionCache(object):
+    """
+    Least recently used cache of position entries with a memory cap.
+    :param size_mb: approximate memory the entries may use in megabytes
+    """
+    def __init__(self, size_mb=DEFAULT_SIZE_MB):
+        assert size_mb > 0, "size_mb must be positive, not {}".format(size_mb)
+        self.max_bytes = int(size_mb * 1024 * 1024)
+        self._entries = OrderedDict()
+        self._bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        """Returns the number of positions in the cache."""
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __repr__(self):
+        return "{}(size_mb={})".format(self.__class__.__name__,
+                                       self.max_bytes / (1024 * 1024))
+
+    def get(self, key, field):
+        """
+        Looks up one thing known about a position.
+        :param key: Zobrist key of the position
+        :param field: STATUS, MOVES or MOVE_LIST
+        :return: the stored value, or None if it is not known
+        """
+        entry = self._entries.get(key)
+        if entry is None or entry[field] is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[field]
+
+    def put(self, key, field, value):
+        """
+        Stores one thing known about a position, throwing out the least
+        recently used positions if the cache is over its size.
+        :param key: Zobrist key of the position
+        :param field: STATUS, MOVES or MOVE_LIST
+        :param value: game status string, tuple of move strings or array of
+               move ints, which must not be changed afterwards
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = [None, None, None]
+            self._entries[key] = entry
+            self._bytes += ENTRY_OVERHEAD
+        else:
+            self._entries.move_to_end(key)
+            self._bytes -= _size_of(entry[field])
+        entry[field] = value
+        self._bytes += _size_of(value)
+
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            _, old_entry = self._entries.popitem(last=False)
+            self._bytes -= ENTRY_OVERHEAD + sum(_size_of(value) for value in old_entry)
+            self.evictions += 1
+
+    def clear(self):
+        """Empties the cache and resets its statistics."""
+        self._entries.clear()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self):
+        """
+        Returns a dict of usage counts for sizing the cache.
+        :return: dict with 'entries', 'bytes', 'max bytes', 'hits', 'misses',
+                 'evictions' and 'hit rate'
+        """
+        lookups = self.hits + self.misses
+        return {"entries": len(self._entries),
+                "bytes": self._bytes,
+                "max bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit rate": self.hits / lookups if lookups else 0.0}
+
+
+def _make_cache(size_mb):
+    """Returns a cache of the given size, or None for a size of 0."""
+    assert size_mb >= 0, "size_mb must not be negative, not {}".format(size_mb)
+    return PositionCache(size_mb) if size_mb else None
+
+
+_settings = {"cache": _make_cache(float(os.environ.get("CHESS_CACHE_MB", 0)))}
+
+
+def set_size(size_mb):
+    """
+    Replaces the process cache with an empty one of the given size, for
+    this process and the worker processes it starts afterwards.
+    :param size_mb: approximate memory in megabytes, or 0 to turn it off
+    """
+    _settings["cache"] = _make_cache(size_mb)
+    os.environ["CHESS_CACHE_MB"] = str(size_mb)
+
+
+def clear():
+    """Empties the process cache, if it is turned on."""
+    cache = _settings["cache"]
+    if cache is not None:
+        cache.clear()
+
+
+def get_cache():
+    """
+    Gets the cache shared by every board in this process.
+    :return: PositionCache, or None if it is turned off
+    """
+    return _settings["cache"]
+
+
+def stats():
+    """
+    Returns the usage counts of the process cache.
+    :return: dict from PositionCache.stats, or None if it is turned off
+    """
+    cache = _settings["cache"]
+    return None if cache is None else cache.stats()
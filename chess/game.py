@@ -1,9 +1,17 @@
 import random
 import time
 
-from chess.board import ChessBoard
+from chess.board import ChessBoard, ONGOING, CHECKMATE
 
 
+# status of a game stopped by ChessGame's max_turns
+MAX_TURNS = "max turns"
+
+# kinds of event yielded by ChessGame.events
+GAME_START = "start"
+MOVE = "move"
+GAME_END = "end"
+
 DEFAULT_BOARD = "rnbkqbnr pppppppp ........ ........ ........ ........ PPPPPPPP RNBKQBNR"
 
 
@@ -15,13 +23,26 @@ class ChessGame(object):
            or 2 to show possible moves
     :param board: starting board for the game
     :param first_move: player to go first, int 1 or 2 or default=random
+    :param time_limit: seconds each player may spend per move, passed to
+           players that support a search budget
+    :param node_limit: positions each player may search per move, passed to
+           players that support a search budget
+    :param max_turns: if given, the game is a draw once this many turns have
+           been played without it ending
+    :param collect_stats: if True, the result has the search stats of each
+           move, from players with telemetry on
     """
     def __init__(self, player1, player2, verbosity=1, pause=0,
-                 first_move=None, board=DEFAULT_BOARD):
+                 first_move=None, board=DEFAULT_BOARD, time_limit=None,
+                 node_limit=None, max_turns=None, collect_stats=False):
         self._player1 = player1
         self._player2 = player2
         self._verbosity = verbosity
         self._pause = pause
+        self._time_limit = time_limit
+        self._node_limit = node_limit
+        self._max_turns = max_turns
+        self._collect_stats = collect_stats
 
         if first_move is None:
             self._first_move = random.randint(1, 2)
@@ -91,13 +112,47 @@ class ChessGame(object):
         if self._verbosity > 0:
             print(self._board)
 
-    def play(self):
+    def choose_move(self, player, board):
         """
-        Plays a complete chess game from given board until the game ends.
-        :returns result dict including 'winner', 'turns', 'final board'
+        Asks a player for its move, giving it this game's per move budget if
+        the player supports one.
+        :param player: a player object that is in the current game
+        :param board: board object
+        :return: string in form "a1 b2"
+        """
+        if getattr(player, "supports_budget", False) and (self._time_limit is not None
+                                       or self._node_limit is not None):
+            return player.choose_move(board, time_limit=self._time_limit,
+                                      node_limit=self._node_limit)
+        return player.choose_move(board)
+
+    def events(self):
+        """
+        Plays a complete chess game from given board until the game ends,
+        yielding a dict for each thing that happens. Every event has an
+        'event' key of GAME_START, MOVE or GAME_END and only plain values, so
+        it can be written out as JSON.
+
+        GAME_START has 'start board' as a code, 'player1' and 'player2' as
+        the players' reprs and 'first move'. MOVE has the 'turn', the 'player'
+        number and 'mover' repr of the player who moved, the 'move', the
+        'board' code after it, 'check' if it puts the other player in check,
+        the 'seconds' the player took to choose it and the 'stats' of its
+        search, or None if the player has no telemetry. GAME_END has the
+        'status', the 'winner' as a player number or None, the 'turns' and
+        the 'final board' code.
+        :return: the result dict of play once the game is over
         """
         board = self._board
+        start_board = repr(board)
+        moves = []
+        move_stats = []
         turn_number = 0
+        yield {"event": GAME_START,
+               "start board": start_board,
+               "player1": repr(self._player1),
+               "player2": repr(self._player2),
+               "first move": self._first_move}
         while True:
             turn_number += 1
             if self._verbosity > 0:
@@ -110,17 +165,10 @@ class ChessGame(object):
             else:
                 player = self._player2
 
-            # determine possible moves
-            possible_moves = board.calc_possible_moves()
-            if self._verbosity == 2:
-                print("{} moves: {}".format(player, possible_moves))
-
-            is_in_check = board.is_attacking_king(flip_player=True)
-
             # if no possible moves, game is over
-            if len(possible_moves) == 0:
-                # Game is over
-                if is_in_check:
+            status = board.game_status
+            if status != ONGOING:
+                if status == CHECKMATE:
                     if self._verbosity > 0:
                         print("{} was checkmated in {} moves!".format(player,
                                                                turn_number))
@@ -130,16 +178,78 @@ class ChessGame(object):
                         print("There was a draw!")
                     winner = None
                 break
-            else:
-                if is_in_check and self._verbosity > 0:
-                    print("{} is in check".format(player))
 
-            board = board.do_move(player.choose_move(board))
+            if self._max_turns is not None and turn_number > self._max_turns:
+                if self._verbosity > 0:
+                    print("There was a draw after {} moves!".format(self._max_turns))
+                status = MAX_TURNS
+                winner = None
+                break
+
+            if self._verbosity == 2:
+                print("{} moves: {}".format(player, board.calc_possible_moves()))
+            if self._verbosity > 0 and board.is_attacking_king(flip_player=True):
+                print("{} is in check".format(player))
+
+            mover = int(board.get_player_turn())
+            start = time.perf_counter()
+            move = self.choose_move(player, board)
+            seconds = time.perf_counter() - start
+            moves.append(move)
+            stats = getattr(player, "stats", None)
+            stats = None if stats is None else stats.as_dict()
+            if self._collect_stats:
+                move_stats.append(stats)
+            board = board.do_move(move)
+            yield {"event": MOVE,
+                   "turn": turn_number,
+                   "player": mover,
+                   "mover": repr(player),
+                   "move": move,
+                   "board": repr(board),
+                   "check": board.is_attacking_king(flip_player=True),
+                   "seconds": seconds,
+                   "stats": stats}
             time.sleep(self._pause)
 
+        if winner is None:
+            winner_number = None
+        else:
+            winner_number = 1 if winner is self._player1 else 2
+        yield {"event": GAME_END,
+               "status": status,
+               "winner": winner_number,
+               "turns": turn_number,
+               "final board": repr(board)}
+
         result = {"winner": winner,
                   "turns": turn_number,
-                  "final board": board}
+                  "final board": board,
+                  "status": status,
+                  "start board": start_board,
+                  "moves": moves}
+        if self._collect_stats:
+            result["move stats"] = move_stats
 
         return result
 
+    def play(self, observer=None):
+        """
+        Plays a complete chess game from given board until the game ends.
+        :param observer: optional callable given each event of events as it
+               happens, such as a chess.gamelog.GameLogWriter
+        :returns result dict including 'winner', 'turns', 'final board',
+                 'status', which is CHECKMATE, STALEMATE or MAX_TURNS,
+                 'start board' as a code and the 'moves' played. With
+                 collect_stats on it also has 'move stats', a list with the
+                 SearchStats.as_dict of each move, or None for moves not
+                 searched with telemetry
+        """
+        events = self.events()
+        while True:
+            try:
+                event = next(events)
+            except StopIteration as stop:
+                return stop.value
+            if observer is not None:
+                observer(event)
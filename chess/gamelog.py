@@ -0,0 +1,141 @@
+"""
+Log of game events written as JSON lines, one event per line.
+
+GameLogWriter takes events from ChessGame.events and writes them from a
+background thread, in batches, so logging many games never waits on the
+disk. It can be passed straight to ChessGame.play as the observer:
+
+    with GameLogWriter("games.jsonl") as log:
+        for game in games:
+            game.play(observer=log)
+"""
+import json
+import queue
+import threading
+
+# events written per write to the file
+DEFAULT_BUFFER_SIZE = 1000
+
+# seconds a partly full buffer waits for more events before it is written
+DEFAULT_FLUSH_INTERVAL = 1.0
+
+# markers put in the queue among the events
+_FLUSH = object()
+_STOP = object()
+
+
+class GameLogWriter(object):
+    """
+    Writes events to a JSON lines file from a background thread. Events are
+    only queued by write, so it returns at once, and are turned into JSON
+    and written by the thread.
+    :param path: path of the file to write
+    :param buffer_size: events gathered before they are written together
+    :param flush_interval: seconds events wait for the buffer to fill
+    :param append: if True, adds to the end of an existing file
+    """
+    def __init__(self, path, buffer_size=DEFAULT_BUFFER_SIZE,
+                 flush_interval=DEFAULT_FLUSH_INTERVAL, append=True):
+        assert buffer_size >= 1, "buffer_size must be at least 1, not {}".format(buffer_size)
+        self.path = path
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.written = 0
+        self._file = open(path, "a" if append else "w")
+        self._queue = queue.Queue()
+        self._error = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="GameLogWriter", daemon=True)
+        self._thread.start()
+
+    def __repr__(self):
+        return "{}({!r})".format(self.__class__.__name__, self.path)
+
+    def __call__(self, event):
+        self.write(event)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def write(self, event):
+        """
+        Queues an event to be written. The event must not be changed after.
+        :param event: dict of values JSON can hold
+        """
+        assert not self._closed, "{} is closed".format(self)
+        self._queue.put(event)
+
+    def flush(self):
+        """Waits until every event queued so far is in the file."""
+        assert not self._closed, "{} is closed".format(self)
+        self._queue.put(_FLUSH)
+        self._queue.join()
+        self._raise_error()
+
+    def close(self):
+        """Writes the events still queued, then stops the thread and closes the file."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._raise_error()
+
+    def _raise_error(self):
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def _run(self):
+        lines = []
+        while True:
+            try:
+                item = self._queue.get(timeout=self.flush_interval if lines else None)
+            except queue.Empty:
+                self._write_lines(lines)
+                continue
+            if item is _STOP:
+                self._write_lines(lines)
+                try:
+                    self._file.close()
+                except OSError as error:
+                    self._error = error
+                self._queue.task_done()
+                return
+            if item is _FLUSH:
+                self._write_lines(lines)
+            else:
+                try:
+                    lines.append(json.dumps(item))
+                except (TypeError, ValueError) as error:
+                    self._error = error
+                if len(lines) >= self.buffer_size:
+                    self._write_lines(lines)
+            self._queue.task_done()
+
+    def _write_lines(self, lines):
+        # errors are kept for flush or close to raise, since the thread must
+        # keep marking events done for them to return
+        if lines:
+            try:
+                self._file.write("\n".join(lines) + "\n")
+                self._file.flush()
+                self.written += len(lines)
+            except (OSError, ValueError) as error:
+                self._error = error
+            del lines[:]
+
+
+def read_log(path):
+    """
+    Reads back the events of a log file.
+    :param path: path of a file written by GameLogWriter
+    :return: iterator of event dicts, in the order they were written
+    """
+    with open(path) as log_file:
+        for line in log_file:
+            if line.strip():
+                yield json.loads(line)
@@ -0,0 +1,99 @@
+"""
+Moves packed into 16-bit ints for use inside the engine. Bits 0-5 hold the
+square moved from, bits 6-11 the square moved to and bits 12-14 the piece
+type (from chess.bitboard) a pawn is upgraded to, or 0 if it is not. Squares
+are numbered row * 8 + col, so "a1" is 0 and "h8" is 63.
+
+Lists of moves are kept in array("H") so they are small to store and copy.
+Moves only become strings in form "a1 b2" when they leave the engine, using
+tables built once at import.
+"""
+from array import array
+
+from chess import helper
+
+# "a1 a1" is never a valid move, so 0 can stand for no move
+NO_MOVE = 0
+
+TO_SHIFT = 6
+PROMOTION_SHIFT = 12
+SQUARE_MASK = 63
+
+SQUARE_NAMES = [helper.encode_inpt(*divmod(sq, 8)) for sq in range(64)]
+
+# MOVE_STRINGS[frm][to] is the string form of a move
+MOVE_STRINGS = [[SQUARE_NAMES[frm] + " " + SQUARE_NAMES[to] for to in range(64)]
+                for frm in range(64)]
+
+# string form of a move to its (frm, to) squares
+MOVE_SQUARES = {MOVE_STRINGS[frm][to]: (frm, to)
+                for frm in range(64) for to in range(64)}
+
+# string form of a move to its int form, without any upgrade
+MOVE_INTS = {MOVE_STRINGS[frm][to]: frm | to << TO_SHIFT
+             for frm in range(64) for to in range(64)}
+
+
+def encode(frm, to, promotion=0):
+    """
+    Packs a move into an int.
+    :param frm: int square moved from
+    :param to: int square moved to
+    :param promotion: piece type a pawn is upgraded to, or 0
+    :return: int
+    """
+    return frm | to << TO_SHIFT | promotion << PROMOTION_SHIFT
+
+
+def from_square(move):
+    """Returns the int square a move is made from."""
+    return move & SQUARE_MASK
+
+
+def to_square(move):
+    """Returns the int square a move is made to."""
+    return move >> TO_SHIFT & SQUARE_MASK
+
+
+def promotion(move):
+    """Returns the piece type a move upgrades a pawn to, or 0."""
+    return move >> PROMOTION_SHIFT
+
+
+def to_string(move):
+    """
+    Converts a move to its string form.
+    :param move: int
+    :return: string in form "a1 b2"
+    """
+    return MOVE_STRINGS[move & SQUARE_MASK][move >> TO_SHIFT & SQUARE_MASK]
+
+
+def from_string(move_str):
+    """
+    Converts a string move to an int with no upgrade. Boards add the upgrade
+    for pawns reaching the last row in BitBoard.parse_move.
+    :param move_str: string in form "a1 b2"
+    :return: int
+    """
+    assert move_str in MOVE_INTS, "invalid move: {}".format(move_str)
+    return MOVE_INTS[move_str]
+
+
+def to_strings(move_list):
+    """
+    Converts moves to their string forms.
+    :param move_list: iterable of ints
+    :return: list of strings in form "a1 b2"
+    """
+    return [MOVE_STRINGS[move & SQUARE_MASK][move >> TO_SHIFT & SQUARE_MASK]
+            for move in move_list]
+
+
+def from_strings(move_strs):
+    """
+    Converts string moves to a compact array of ints with no upgrades.
+    :param move_strs: iterable of strings in form "a1 b2"
+    :return: array of ints
+    """
+    return array("H", [from_string(move_str) for move_str in move_strs])
@@ -0,0 +1,166 @@
+"""
+Perft (performance test) counts every sequence of valid moves to a given
+depth. The counts make move generators easy to compare with each other and
+the time taken measures their raw speed.
+
+Usage:
+    python -m chess.perft --depth 3 --backend bitboard --divide
+    python -m chess.perft --check --backend string --depth 2
+"""
+import argparse
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from chess.board import ChessBoard
+from chess.bitboard import BitBoard
+from chess.position import Position
+
+BACKENDS = {"string": ChessBoard,
+            "bitboard": BitBoard,
+            "position": Position}
+
+# (name, board code, leaf counts for depths 1, 2, 3, ...)
+# counts follow this library's rules, which have no castling or en passant
+# and let pawns take straight ahead, so they differ from standard chess
+REFERENCE_POSITIONS = [
+    ("start", "1 rnbkqbnr pppppppp ........ ........ ........ ........ PPPPPPPP RNBKQBNR",
+     (20, 400, 8990, 201884)),
+    ("middlegame", "1 r.bk.bnr ppp..ppp ..n.q... ...pp... ...PP... ..N..N.. PPP..PPP R.BKQB.R",
+     (43, 1755, 73723, 2998343)),
+    ("upgrades", "1 .......k P....... ...K.... ........ ........ ........ .......p ........",
+     (4, 34, 313, 2641)),
+    ("check", "1 k....... .Q...r.. .R...... ........ ........ ........ ........ .......K",
+     (1, 16, 202, 2972)),
+    ("player 2", "2 ...k.... .p....p. ..n..... ...P.... ..q.B... .R...... ...N.P.. ....K...",
+     (31, 967, 24168, 731297)),
+]
+
+
+def perft(board, depth):
+    """
+    Counts the positions reached by every sequence of depth valid moves.
+    Boards with make_move and unmake_move are searched in place, any other
+    board through do_move.
+    :param board: board object
+    :param depth: int
+    :return: int number of leaf positions
+    """
+    if depth == 0:
+        return 1
+    # boards searched in place use moves packed as ints
+    in_place = hasattr(board, "make_move")
+    if in_place:
+        possible_moves = board.calc_move_list()
+    else:
+        possible_moves = board.calc_possible_moves()
+    if depth == 1:
+        return len(possible_moves)
+
+    nodes = 0
+    if in_place:
+        for move in possible_moves:
+            board.make_move(move)
+            nodes += perft(board, depth - 1)
+            board.unmake_move()
+    else:
+        for move in possible_moves:
+            nodes += perft(board.do_move(move), depth - 1)
+    return nodes
+
+
+def divide(board, depth, processes=1):
+    """
+    Counts perft leaf positions separately for each move of the board.
+    :param board: board object
+    :param depth: int of at least 1
+    :param processes: number of processes to split the moves between
+    :return: dict of move string to int number of leaf positions
+    """
+    assert depth >= 1, "divide needs a depth of at least 1, not {}".format(depth)
+    possible_moves = board.calc_possible_moves()
+    child_codes = [repr(board.do_move(move)) for move in possible_moves]
+
+    if processes > 1 and len(possible_moves) > 1:
+        board_classes = [type(board)] * len(child_codes)
+        depths = [depth - 1] * len(child_codes)
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            counts = list(executor.map(_perft_code, board_classes, child_codes, depths))
+    else:
+        counts = [_perft_code(type(board), code, depth - 1) for code in child_codes]
+    return dict(zip(possible_moves, counts))
+
+
+def _perft_code(board_class, code, depth):
+    """Runs perft on a board rebuilt from its code, for worker processes."""
+    return perft(board_class(code), depth)
+
+
+def run(board, depth, processes=1):
+    """
+    Times a perft run, splitting the moves at the root between processes.
+    :param board: board object
+    :param depth: int of at least 1
+    :param processes: number of processes to use
+    :return: dict with 'nodes', 'seconds', 'nps' and 'divide'
+    """
+    start = time.perf_counter()
+    counts = divide(board, depth, processes)
+    seconds = time.perf_counter() - start
+    nodes = sum(counts.values())
+    return {"nodes": nodes,
+            "seconds": seconds,
+            "nps": nodes / seconds if seconds > 0 else float("inf"),
+            "divide": counts}
+
+
+def check(board_class, max_depth=3, processes=1):
+    """
+    Compares perft counts of every reference position with the known counts.
+    :param board_class: ChessBoard or a class with the same interface
+    :param max_depth: deepest count to check
+    :param processes: number of processes to use
+    :return: list of (name, depth, expected, actual) for each mismatch
+    """
+    mismatches = []
+    for name, code, counts in REFERENCE_POSITIONS:
+        for depth, expected in enumerate(counts[:max_depth], 1):
+            actual = sum(divide(board_class(code), depth, processes).values())
+            if actual != expected:
+                mismatches.append((name, depth, expected, actual))
+    return mismatches
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Count and time move generation.")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default="bitboard")
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--board", default=REFERENCE_POSITIONS[0][1],
+                        help="board code such as \"1 rnbkqbnr pppppppp ...\"")
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument("--divide", action="store_true",
+                        help="print the count for each move")
+    parser.add_argument("--check", action="store_true",
+                        help="check the reference positions up to --depth")
+    args = parser.parse_args(argv)
+    board_class = BACKENDS[args.backend]
+
+    if args.check:
+        mismatches = check(board_class, args.depth, args.processes)
+        for name, depth, expected, actual in mismatches:
+            print("{} depth {}: expected {} got {}".format(name, depth, expected, actual))
+        print("{} mismatches".format(len(mismatches)))
+        return 1 if mismatches else 0
+
+    result = run(board_class(args.board), args.depth, args.processes)
+    if args.divide:
+        for move in sorted(result["divide"]):
+            print("{}: {}".format(move, result["divide"][move]))
+    print("nodes: {}".format(result["nodes"]))
+    print("time: {:.3f}s".format(result["seconds"]))
+    print("nodes per second: {:.0f}".format(result["nps"]))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,5 @@
+from chess import tables
+
 P1_CHAR = "1"
 P2_CHAR = "2"
 
@@ -5,7 +7,11 @@ P2_CHAR = "2"
 class ChessPiece(object):
     """
     This class is used entirely for inheretence for other chess piece classes.
+    Each subclass finds its moves with the shared MoveGenerator in its
+    generator attribute.
     """
+    generator = None
+
     def __init__(self, row, col, player):
         assert 0 <= row < 8
         assert 0 <= col < 8
@@ -64,11 +70,15 @@ class ChessPiece(object):
                 return True
         return False
 
-
-class Pawn(ChessPiece):
-    def __init__(self, row, col, player):
-        ChessPiece.__init__(self, row, col, player)
-        self._char = "p"
+    def can_take(self, square):
+        """
+        Returns True if this piece may move onto a square holding the given
+        character: an empty square or an enemy piece other than the king.
+        Unlike is_valid_attack, the square is assumed to be on the board.
+        :param square: string of one letter
+        :return: Boolean
+        """
+        return can_take(self._player, square)
 
     def calc_moves(self, board):
         """
@@ -77,245 +87,204 @@ class Pawn(ChessPiece):
         row and column of valid moves. This will include moves that put the 
         king in check which will be filtered out later.
         """
-        r1 = self._row
-        c1 = self._col
+        targets = []
+        self.generator.generate(board, self._row, self._col, self._player, targets)
+        return {"attacker": (self._row, self._col),
+                "defender": {divmod(sq, 8) for sq in targets}}
+
+
+def can_take(player, square):
+    """
+    Returns True if a piece of the given player may move onto a square
+    holding the given character: an empty square or an enemy piece other
+    than the king.
+    :param player: a string representing the player "1" or "2"
+    :param square: string of one letter
+    :return: Boolean
+    """
+    if square == ".":
+        return True
+    if player == P1_CHAR:
+        return square.isupper() and square != "K"
+    else:
+        return square.islower() and square != "k"
+
+
+class MoveGenerator(object):
+    """
+    Finds the squares one type of piece can move to. Generators hold no
+    state, so a single shared instance of each is used for every piece on
+    every board. Squares are numbered row * 8 + col and added to a list
+    given by the caller, which can be reused between pieces.
+    """
+    __slots__ = ()
+
+    def generate(self, board, row, col, player, moves):
+        """
+        Adds the squares the piece can move to, including moves that put
+        its own king in check, which are filtered out later.
+        :param board: board object
+        :param row: int row of the piece
+        :param col: int col of the piece
+        :param player: a string representing the player "1" or "2"
+        :param moves: list of int squares to add to
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def slide(board, rays, player, moves):
+        """
+        Adds the squares along each ray up to and including the first piece
+        that can be taken, stopping before any other piece.
+        :param board: board object
+        :param rays: tuple of rays from tables, each a tuple of (row, col)
+        :param player: a string representing the player "1" or "2"
+        :param moves: list of int squares to add to
+        """
+        for ray in rays:
+            for r2, c2 in ray:
+                square = board.get_square(r2, c2)
+                if can_take(player, square):
+                    moves.append(r2 * 8 + c2)
+                    if square != ".":
+                        break
+                else:
+                    break
+
 
-        moves = {"attacker": (r1, c1), "defender": set()}
+class PawnMoves(MoveGenerator):
+    __slots__ = ()
 
+    def generate(self, board, row, col, player, moves):
         # player pawn attack upward, comp pawns attack downward
-        if self._player == P1_CHAR:
+        if player == P1_CHAR:
             direction = 1
         else:
             direction = -1
 
         # find diagonal pawn attacks
-        r2 = r1 + (1 * direction)
-        for i in (-1, 1):
-            c2 = c1 + i
-            if self.is_valid_attack(board, r2, c2) and board.get_square(r2, c2) != ".":
-                moves["defender"].add((r2, c2))
+        for r2, c2 in tables.PAWN_ATTACKS[player][row * 8 + col]:
+            square = board.get_square(r2, c2)
+            if square != "." and can_take(player, square):
+                moves.append(r2 * 8 + c2)
 
         # pawn moving 1 upward
-        r2 = r1 + (1 * direction)
-        c2 = c1
-        if self.is_valid_attack(board, r2, c2):
-            moves["defender"].add((r2, c2))
+        r2 = row + direction
+        if 0 <= r2 < 8 and can_take(player, board.get_square(r2, col)):
+            moves.append(r2 * 8 + col)
 
         # pawn moving 2 forward (only in 0-based rows 1 and 6
-        if r1 == 6 or r1 == 1:
-            r2 = r1 + (2 * direction)
-            c2 = c1
-            if self.is_valid_attack(board, r2, c2):
-                moves["defender"].add((r2, c2))
+        if row == 6 or row == 1:
+            r2 = row + 2 * direction
+            if 0 <= r2 < 8 and can_take(player, board.get_square(r2, col)):
+                moves.append(r2 * 8 + col)
 
-        return moves
 
+class KnightMoves(MoveGenerator):
+    __slots__ = ()
 
-class Knight(ChessPiece):
-    def __init__(self, row, col, player):
-        ChessPiece.__init__(self, row, col, player)
-        self._char = "n"
+    def generate(self, board, row, col, player, moves):
+        for r2, c2 in tables.KNIGHT_TARGETS[row * 8 + col]:
+            if can_take(player, board.get_square(r2, c2)):
+                moves.append(r2 * 8 + c2)
 
-    def calc_moves(self, board):
-        """
-        returns a dictionary mapping "attacker" to a tuple indicating 
-        row and col of the attacking piece and a set of tuples indicating 
-        row and column of valid moves. This will include moves that put the 
-        king in check which will be filtered out later.
-        """
-        r1 = self._row
-        c1 = self._col
 
-        moves = {"attacker": (r1, c1), "defender": set()}
+class BishopMoves(MoveGenerator):
+    __slots__ = ()
 
-        for i, j in ((1, 2), (2, 1)):
-            for i_sign in (-1, 1):
-                for j_sign in (-1, 1):
-                    r2 = r1 + (i * i_sign)
-                    c2 = c1 + (j * j_sign)
-                    assert i != j
-                    if self.is_valid_attack(board, r2, c2):
-                        moves["defender"].add((r2, c2))
+    def generate(self, board, row, col, player, moves):
+        # go in each diagonal direction until hitting a piece
+        self.slide(board, tables.DIAGONAL_RAYS[row * 8 + col], player, moves)
 
-        return moves
 
+class RookMoves(MoveGenerator):
+    __slots__ = ()
 
-class Bishop(ChessPiece):
-    def __init__(self, row, col, player):
-        ChessPiece.__init__(self, row, col, player)
-        self._char = "b"
+    def generate(self, board, row, col, player, moves):
+        # go along each row and column until hitting a piece
+        self.slide(board, tables.STRAIGHT_RAYS[row * 8 + col], player, moves)
 
-    def calc_moves(self, board):
-        """
-        returns a dictionary mapping "attacker" to a tuple indicating 
-        row and col of the attacking piece and a set of tuples indicating 
-        row and column of valid moves. This will include moves that put the 
-        king in check which will be filtered out later.
-        """
-        r1 = self._row
-        c1 = self._col
-
-        moves = {"attacker": (r1, c1), "defender": set()}
-
-        # i and j are increments for r2 and c2 going in diagonal directions
-        for i in (-1, 1):
-            for j in (-1, 1):
-                r2 = r1 + i
-                c2 = c1 + j
-
-                while True:
-                    # go in this diagonal direction until hitting a piece
-                    if self.is_valid_attack(board, r2, c2):
-                        moves["defender"].add((r2, c2))
-                        if board.get_square(r2, c2) != ".":
-                            break
-                    else:
-                        break
-                    r2 += i
-                    c2 += j
-        return moves
 
+class QueenMoves(MoveGenerator):
+    __slots__ = ()
 
-class Rook(ChessPiece):
-    def __init__(self, row, col, player):
-        ChessPiece.__init__(self, row, col, player)
-        self._char = "r"
+    def generate(self, board, row, col, player, moves):
+        # check columns and rows, then diagonals
+        self.slide(board, tables.STRAIGHT_RAYS[row * 8 + col], player, moves)
+        self.slide(board, tables.DIAGONAL_RAYS[row * 8 + col], player, moves)
 
-    def calc_moves(self, board):
-        """
-        returns a dictionary mapping "attacker" to a tuple indicating 
-        row and col of the attacking piece and a set of tuples indicating 
-        row and column of valid moves. This will include moves that put the 
-        king in check which will be filtered out later.
-        """
-        r1 = self._row
-        c1 = self._col
-
-        moves = {"attacker": (r1, c1), "defender": set()}
-
-        # increment in both directions
-        # collision if piece is found break while
-        for i in (-1, 1):
-
-            # check all rows in same col
-            r2 = r1 + i
-            c2 = c1
-            while True:
-                if self.is_valid_attack(board, r2, c2):
-                    moves["defender"].add((r2, c2))
-                    # checks for path block
-                    if board.get_square(r2, c2) != ".":
-                        break
-                else:
-                    break
-                r2 += i
-
-            # check all cols in same row
-            r2 = r1
-            c2 = c1 + i
-            while True:
-                # breaks in that direction if it can attack a piece
-                if self.is_valid_attack(board, r2, c2):
-                    moves["defender"].add((r2, c2))
-                    # checks for path blocked
-                    if board.get_square(r2, c2) != ".":
-                        break
-                else:
-                    break
-                c2 += i
 
-        return moves
+class KingMoves(MoveGenerator):
+    __slots__ = ()
 
+    def generate(self, board, row, col, player, moves):
+        enemy = P2_CHAR if player == P1_CHAR else P1_CHAR
+        attacked = board.attacked_squares(enemy)
+
+        # find possible king moves
+        for target in tables.KING_TARGETS[row * 8 + col]:
+            if can_take(player, board.get_square(target[0], target[1])) and target not in attacked:
+                moves.append(target[0] * 8 + target[1])
+
+
+PAWN_MOVES = PawnMoves()
+KNIGHT_MOVES = KnightMoves()
+BISHOP_MOVES = BishopMoves()
+ROOK_MOVES = RookMoves()
+QUEEN_MOVES = QueenMoves()
+KING_MOVES = KingMoves()
+
+# the shared generator for each board character of either player
+MOVE_GENERATORS = {}
+for _char, _generator in (("p", PAWN_MOVES), ("n", KNIGHT_MOVES), ("b", BISHOP_MOVES),
+                          ("r", ROOK_MOVES), ("q", QUEEN_MOVES), ("k", KING_MOVES)):
+    MOVE_GENERATORS[_char] = _generator
+    MOVE_GENERATORS[_char.upper()] = _generator
+
+
+class Pawn(ChessPiece):
+    generator = PAWN_MOVES
 
-class Queen(ChessPiece):
     def __init__(self, row, col, player):
         ChessPiece.__init__(self, row, col, player)
-        self._char = "q"
+        self._char = "p"
 
-    def calc_moves(self, board):
-        """
-        returns a dictionary mapping "attacker" to a tuple indicating 
-        row and col of the attacking piece and a set of tuples indicating 
-        row and column of valid moves. This will include moves that put the 
-        king in check which will be filtered out later.
-        """
-        r1 = self._row
-        c1 = self._col
 
-        moves = {"attacker": (r1, c1), "defender": set()}
+class Knight(ChessPiece):
+    generator = KNIGHT_MOVES
 
-        # check columns and rows
-        for i in (-1, 1):
-            r2 = r1 + i
-            c2 = c1
+    def __init__(self, row, col, player):
+        ChessPiece.__init__(self, row, col, player)
+        self._char = "n"
 
-            # check all rows in same col
-            while True:
-                if self.is_valid_attack(board, r2, c2):
-                    moves["defender"].add((r2, c2))
-                    if board.get_square(r2, c2) != ".":
-                        break
-                else:
-                    break
-                r2 += i
 
-            r2 = r1
-            c2 = c1 + i
+class Bishop(ChessPiece):
+    generator = BISHOP_MOVES
 
-            # check all cols in same row
-            while True:
-                if self.is_valid_attack(board, r2, c2):
-                    moves["defender"].add((r2, c2))
-                    if board.get_square(r2, c2) != ".":
-                        break
-                else:
-                    break
-                c2 += i
-
-        # check diagonals
-        for i in (-1, 1):
-            for j in (-1, 1):
-                r2 = r1 + i
-                c2 = c1 + j
-
-                while True:
-                    if self.is_valid_attack(board, r2, c2):
-                        moves["defender"].add((r2, c2))
-                        if board.get_square(r2, c2) != ".":
-                            break
-                    else:
-                        break
-                    r2 += i
-                    c2 += j
+    def __init__(self, row, col, player):
+        ChessPiece.__init__(self, row, col, player)
+        self._char = "b"
 
-        return moves
 
+class Rook(ChessPiece):
+    generator = ROOK_MOVES
 
-class King(ChessPiece):
     def __init__(self, row, col, player):
         ChessPiece.__init__(self, row, col, player)
-        self._char = "k"
+        self._char = "r"
 
-    def calc_moves(self, board):
-        """
-        returns a dictionary mapping "attacker" to a tuple indicating 
-        row and col of the attacking piece and a set of tuples indicating 
-        row and column of valid moves. This will include moves that put the 
-        king in check which will be filtered out later.
-        """
-        r1 = self._row
-        c1 = self._col
 
-        moves = {"attacker": (r1, c1), "defender": set()}
+class Queen(ChessPiece):
+    generator = QUEEN_MOVES
 
-        # find possible king moves
-        for i in range(-1, 2):
-            for j in range(-1, 2):
-                r2 = r1 + i
-                c2 = c1 + j
-                if self.is_valid_attack(board, r2, c2) \
-                        and not board.is_square_attacked(r2, c2, static_player=True):
-                    moves["defender"].add((r2, c2))
-                    assert (r1, c1) not in moves["defender"]
-        return moves
+    def __init__(self, row, col, player):
+        ChessPiece.__init__(self, row, col, player)
+        self._char = "q"
+
+
+class King(ChessPiece):
+    generator = KING_MOVES
 
+    def __init__(self, row, col, player):
+        ChessPiece.__init__(self, row, col, player)
+        self._char = "k"
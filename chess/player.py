@@ -1,9 +1,26 @@
+import atexit
 import math
+import os
 import random
 import time
+from concurrent.futures import ProcessPoolExecutor
+
+from chess.board import PIECE_VALUES
+from chess.book import open_book
+from chess.moves import SQUARE_MASK, TO_SHIFT, to_string
+from chess.position import Position
+from chess.tablebase import open_tablebases
+from chess.telemetry import SearchStats, TimedPosition
+from chess.transposition import EXACT, LOWER_BOUND, UPPER_BOUND, TranspositionTable
 
 
 class Player(object):
+    # players that accept time_limit and node_limit in choose_move
+    supports_budget = False
+
+    # SearchStats of the last move chosen, for players with telemetry on
+    stats = None
+
     def __repr__(self):
         return "{}()".format(self.__class__.__name__)
 
@@ -52,46 +69,587 @@ class OldMinimax(Player):
 
 
 class BasicMinimax(Player):
-    def choose_move(self, board, depth=2):
+    """
+    Player that searches every move to a fixed depth with negamax.
+    :param tt_size_mb: if given, remembers searched positions in a
+           TranspositionTable of about this many megabytes
+    :param static_leaves: if True, positions at the search horizon are
+           scored by static_evaluate, which skips checking if the game is over
+    :param depth: number of moves to look ahead when choose_move is not
+           given a depth, defaults to default_depth
+    :param book: optional path of an opening book file, whose moves are
+           played without searching while the game is in the book
+    :param tablebases: optional path of a directory of endgame tables from
+           chess.tablebase, whose best moves are played without searching
+    :param telemetry: if True, each search keeps a SearchStats from
+           chess.telemetry in the stats attribute
+    :param quiescence: if True, positions at the search horizon are scored
+           after searching their captures and pawn upgrades with quiesce
+    """
+    default_depth = 2
+
+    def __init__(self, tt_size_mb=None, static_leaves=False, depth=None, book=None,
+                 tablebases=None, telemetry=False, quiescence=False):
+        if tt_size_mb is None:
+            self.tt = None
+        else:
+            self.tt = TranspositionTable(tt_size_mb)
+        self.static_leaves = static_leaves
+        if depth is None:
+            depth = self.default_depth
+        self.depth = depth
+        self.book = book
+        self.tablebases = tablebases
+        self.telemetry = telemetry
+        self.quiescence = quiescence
+
+    def lookup_move(self, board):
+        """
+        Looks the board up in the player's opening book, then in its endgame
+        tables. Clears the stats of the last search.
+        :param board: board object
+        :return: string in form "a1 b2", or None if neither has a move
+        """
+        self.stats = None
+        move = None
+        if self.book is not None:
+            move = open_book(self.book).choose_move(board)
+        if move is None and self.tablebases is not None:
+            move = open_tablebases(self.tablebases).best_move(board)
+        return move
+
+    def new_position(self, board):
+        """
+        Creates the Position to search, which records the search in new
+        stats if telemetry is on.
+        :param board: board object
+        :return: Position object
+        """
+        if not self.telemetry:
+            return Position(repr(board))
+        self.stats = SearchStats()
+        return TimedPosition(repr(board), self.stats)
+
+    def finish_search(self, move, depth):
+        """
+        Stops the clock of the search's stats.
+        :param move: int move the search chose
+        :param depth: depth the search reached
+        :return: string form of the move
+        """
+        if self.stats is not None:
+            self.stats.stop(depth)
+        return to_string(move)
+
+    def evaluate_leaf(self, board, alpha=-math.inf, beta=math.inf):
+        """
+        Scores a position at the search horizon, first searching its
+        captures if quiescence is on.
+        :param board: Position object
+        :param alpha: score the current player is already guaranteed
+        :param beta: score the opponent is already guaranteed, negated
+        :return: int, positive if the current player is ahead
+        """
+        if self.quiescence:
+            return self.quiesce(board, alpha, beta)
+        return self.stand_pat(board)
+
+    def stand_pat(self, board):
+        """
+        Scores a position as it stands, without searching any moves.
+        :param board: board object
+        :return: int, positive if the current player is ahead
+        """
+        if self.static_leaves:
+            return board.static_evaluate()
+        return board.evaluate()
+
+    def quiesce(self, board, alpha=-math.inf, beta=math.inf):
+        """
+        Searches only captures and pawn upgrades until the position is
+        quiet, so the horizon never falls in the middle of an exchange. The
+        current player need not capture, so a position scores at least its
+        stand pat score. Every move searched takes a piece or upgrades a
+        pawn, so the search always ends.
+        :param board: Position object
+        :param alpha: score the current player is already guaranteed
+        :param beta: score the opponent is already guaranteed, negated
+        :return: integer for best score
+        """
+        max_score = self.stand_pat(board)
+        if max_score >= beta:
+            return max_score
+        if max_score > alpha:
+            alpha = max_score
+
+        for move in self.order_moves(board, board.calc_capture_list()):
+            board.make_move(move)
+            score = -self.quiesce(board, -beta, -alpha)
+            board.unmake_move()
+            if score > max_score:
+                max_score = score
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+        return max_score
+
+    def choose_move(self, board, depth=None):
         """
         Chooses best move based on looking at list of moves and picking the best.
+        The search is done on a single mutable Position made from the board,
+        with moves packed as ints until the chosen one is returned.
         :param board: board object
-        :param possible_moves: list of strings representing moves
+        :param depth: integer number of moves to look ahead, defaults to the
+               player's depth
         :return: string in form "a1 b2"
         """
-        possible_moves = board.calc_possible_moves()
+        known_move = self.lookup_move(board)
+        if known_move is not None:
+            return known_move
+        if depth is None:
+            depth = self.depth
+        position = self.new_position(board)
+        possible_moves = position.calc_move_list()
         move_score = {}
         for possible_move in possible_moves:
-            new_board = board.do_move(possible_move)
-            move_score[possible_move] = -self.negamax(new_board, depth-1)
+            position.make_move(possible_move)
+            move_score[possible_move] = -self.negamax(position, depth-1)
+            position.unmake_move()
 
         best_move = max(move_score, key=move_score.get)
-        return best_move
+        return self.finish_search(best_move, depth)
 
     def negamax(self, board, depth):
         """
         Recursively finds the max score for a given board state. Relies on
-        the formula max(a, b) = -min(-a, -b).
-        :param board: board object
+        the formula max(a, b) = -min(-a, -b). Moves are made and unmade on the
+        given position, which is back in its original state when this returns.
+        :param board: Position object
         :param depth: integer
         :return: integer for best score
         """
         # if it has reached max depth, it is a leaf node
         if depth == 0:
-            return board.evaluate()
+            return self.evaluate_leaf(board)
 
-        possible_boards = board.get_possible_boards()
+        tt = self.tt
+        best_move = None
+        if tt is not None:
+            entry = tt.probe(board.zobrist_key)
+            if entry is not None:
+                score, entry_depth, flag, best_move = entry
+                if entry_depth >= depth and flag == EXACT:
+                    return score
+
+        possible_moves = board.calc_move_list()
         # if it has no possible moves, it is a leaf node
-        if len(possible_boards) == 0:
+        if len(possible_moves) == 0:
             return board.evaluate()
 
+        # search the best move from an earlier search first
+        if best_move in possible_moves:
+            possible_moves.remove(best_move)
+            possible_moves.insert(0, best_move)
+
         max_score = -math.inf
-        for board in possible_boards:
+        for move in possible_moves:
+            board.make_move(move)
             score = -self.negamax(board, depth-1)
+            board.unmake_move()
             if score > max_score:
                 max_score = score
+                best_move = move
+
+        if tt is not None:
+            tt.store(board.zobrist_key, depth, max_score, EXACT, best_move)
         return max_score
 
+    @staticmethod
+    def order_moves(board, move_list, first_move=None):
+        """
+        Sorts moves so that first_move comes first, then captures ordered by
+        most valuable victim and least valuable attacker, then all other moves
+        in their original order.
+        :param board: board object the moves are for
+        :param move_list: moves packed as ints, as from calc_move_list
+        :param first_move: optional move to search before all others
+        :return: new list of ints
+        """
+        keys = {}
+        for move in move_list:
+            frm = move & SQUARE_MASK
+            to = move >> TO_SHIFT & SQUARE_MASK
+            victim = board.get_square(to >> 3, to & 7)
+            if victim == ".":
+                keys[move] = 0
+            else:
+                attacker = board.get_square(frm >> 3, frm & 7)
+                keys[move] = 10 * PIECE_VALUES[victim.lower()] - PIECE_VALUES[attacker.lower()] + 10
+        if first_move in keys:
+            keys[first_move] = 1000
+        return sorted(move_list, key=keys.get, reverse=True)
+
+
+class AlphaBeta(BasicMinimax):
+    """
+    Player that searches to a fixed depth with fail-soft alpha-beta pruning.
+    Captures are searched first, most valuable victim first and then least
+    valuable attacker first, so cutoffs come early and most of the tree
+    BasicMinimax would search is skipped.
+    :param tt_size_mb: if given, remembers searched positions in a
+           TranspositionTable of about this many megabytes
+    :param static_leaves: if True, positions at the search horizon are
+           scored by static_evaluate
+    :param depth: number of moves to look ahead when choose_move is not
+           given a depth
+    :param book: optional path of an opening book file
+    :param tablebases: optional path of a directory of endgame tables
+    :param telemetry: if True, each search keeps a SearchStats in the stats
+           attribute
+    :param quiescence: if True, captures are searched past the horizon
+    """
+    default_depth = 4
+
+    def choose_move(self, board, depth=None):
+        """
+        Chooses the best move found by an alpha-beta search.
+        :param board: board object
+        :param depth: integer number of moves to look ahead, defaults to the
+               player's depth
+        :return: string in form "a1 b2"
+        """
+        known_move = self.lookup_move(board)
+        if known_move is not None:
+            return known_move
+        if depth is None:
+            depth = self.depth
+        best_move = self.search_root(self.new_position(board), depth)[1]
+        return self.finish_search(best_move, depth)
+
+    def search_root(self, position, depth, first_move=None):
+        """
+        Searches every move of a position to a fixed depth.
+        :param position: Position object
+        :param depth: integer number of moves to look ahead
+        :param first_move: optional int move to search before all others
+        :return: tuple of (best score, best int move)
+        """
+        best_move = first_move
+        if self.tt is not None and best_move is None:
+            entry = self.tt.probe(position.zobrist_key)
+            if entry is not None:
+                best_move = entry[3]
+        possible_moves = self.order_moves(position, position.calc_move_list(), best_move)
+
+        alpha = -math.inf
+        for possible_move in possible_moves:
+            position.make_move(possible_move)
+            score = -self.negamax(position, depth-1, -math.inf, -alpha)
+            position.unmake_move()
+            if score > alpha:
+                alpha = score
+                best_move = possible_move
+
+        if self.tt is not None:
+            self.tt.store(position.zobrist_key, depth, alpha, EXACT, best_move)
+        return alpha, best_move
+
+    def negamax(self, board, depth, alpha=-math.inf, beta=math.inf):
+        """
+        Recursively finds the score for a given board state, skipping moves
+        that cannot change the result. The score is exact if it is strictly
+        between alpha and beta, otherwise it is a bound on the exact score.
+        :param board: Position object
+        :param depth: integer
+        :param alpha: score the current player is already guaranteed
+        :param beta: score the opponent is already guaranteed, negated
+        :return: integer for best score
+        """
+        if depth == 0:
+            return self.evaluate_leaf(board, alpha, beta)
+
+        tt = self.tt
+        best_move = None
+        if tt is not None:
+            entry = tt.probe(board.zobrist_key)
+            if entry is not None:
+                score, entry_depth, flag, best_move = entry
+                if entry_depth >= depth:
+                    if flag == EXACT:
+                        return score
+                    elif flag == LOWER_BOUND and score > alpha:
+                        alpha = score
+                    elif flag == UPPER_BOUND and score < beta:
+                        beta = score
+                    if alpha >= beta:
+                        return score
+
+        possible_moves = board.calc_move_list()
+        if len(possible_moves) == 0:
+            return board.evaluate()
+        possible_moves = self.order_moves(board, possible_moves, best_move)
+
+        original_alpha = alpha
+        max_score = -math.inf
+        for move in possible_moves:
+            board.make_move(move)
+            score = -self.negamax(board, depth-1, -beta, -alpha)
+            board.unmake_move()
+            if score > max_score:
+                max_score = score
+                best_move = move
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+
+        if tt is not None:
+            if max_score <= original_alpha:
+                flag = UPPER_BOUND
+            elif max_score >= beta:
+                flag = LOWER_BOUND
+            else:
+                flag = EXACT
+            tt.store(board.zobrist_key, depth, max_score, flag, best_move)
+        return max_score
+
+
+# worker processes shared by every ParallelMinimax, by number of workers.
+# They are kept between moves and games so they only start up once.
+_executors = {}
+
+
+def get_executor(processes):
+    """
+    Returns the shared pool with the given number of worker processes,
+    starting it the first time it is asked for.
+    :param processes: int number of worker processes
+    :return: ProcessPoolExecutor
+    """
+    executor = _executors.get(processes)
+    if executor is None:
+        executor = ProcessPoolExecutor(max_workers=processes)
+        _executors[processes] = executor
+    return executor
+
+
+@atexit.register
+def shutdown_executors():
+    """Stops every shared pool of worker processes."""
+    while _executors:
+        _executors.popitem()[1].shutdown()
+
+
+def _score_root_move(code, move, depth, static_leaves, telemetry=False, quiescence=False):
+    """
+    Scores one root move in a worker process with a full window alpha-beta
+    search, which gives the same score as BasicMinimax.
+    :param code: repr of the board before the move
+    :param move: int move packed as in chess.moves
+    :param depth: depth of the whole search, including the root move
+    :param static_leaves: passed on to the searching player
+    :param telemetry: if True, the search is recorded in a SearchStats
+    :param quiescence: passed on to the searching player
+    :return: tuple of (int score for the player making the move, the
+             SearchStats or None)
+    """
+    stats = None
+    if telemetry:
+        stats = SearchStats()
+        position = TimedPosition(code, stats)
+    else:
+        position = Position(code)
+    position.make_move(move)
+    score = -AlphaBeta(static_leaves=static_leaves,
+                       quiescence=quiescence).negamax(position, depth-1)
+    return score, stats
+
+
+class ParallelMinimax(BasicMinimax):
+    """
+    Player that scores each root move in a separate task on a pool of worker
+    processes. Workers are sent only the board code and the packed move, and
+    the pool is shared and kept alive between moves and games. Each move is
+    scored exactly, so the chosen move is always the one BasicMinimax would
+    choose at the same depth.
+    :param processes: number of worker processes, defaults to the number of
+           CPUs
+    :param static_leaves: if True, positions at the search horizon are
+           scored by static_evaluate
+    :param depth: number of moves to look ahead when choose_move is not
+           given a depth
+    :param book: optional path of an opening book file
+    :param tablebases: optional path of a directory of endgame tables
+    :param telemetry: if True, keeps a SearchStats of each search with the
+           counts and phase times of every worker added together
+    :param quiescence: if True, captures are searched past the horizon
+    """
+    def __init__(self, processes=None, static_leaves=False, depth=None, book=None,
+                 tablebases=None, telemetry=False, quiescence=False):
+        BasicMinimax.__init__(self, static_leaves=static_leaves, depth=depth, book=book,
+                              tablebases=tablebases, telemetry=telemetry,
+                              quiescence=quiescence)
+        if processes is None:
+            processes = os.cpu_count() or 1
+        assert processes >= 1, "processes must be at least 1, not {}".format(processes)
+        self.processes = processes
+
+    def choose_move(self, board, depth=None):
+        """
+        Chooses the best move, scoring the root moves in parallel. Ties go to
+        the move generated first, as in BasicMinimax.
+        :param board: board object
+        :param depth: integer number of moves to look ahead, defaults to the
+               player's depth
+        :return: string in form "a1 b2"
+        """
+        known_move = self.lookup_move(board)
+        if known_move is not None:
+            return known_move
+        if depth is None:
+            depth = self.depth
+        position = self.new_position(board)
+        code = repr(position)
+        possible_moves = position.calc_move_list()
+        args = (depth, self.static_leaves, self.telemetry, self.quiescence)
+        if self.processes == 1 or len(possible_moves) == 1:
+            results = [_score_root_move(code, move, *args) for move in possible_moves]
+        else:
+            executor = get_executor(self.processes)
+            futures = [executor.submit(_score_root_move, code, move, *args)
+                       for move in possible_moves]
+            results = [future.result() for future in futures]
+
+        scores = [score for score, _ in results]
+        if self.stats is not None:
+            for _, stats in results:
+                self.stats.merge(stats)
+        best_index = max(range(len(scores)), key=scores.__getitem__)
+        return self.finish_search(possible_moves[best_index], depth)
+
+
+class SearchBudgetExceeded(Exception):
+    """Raised inside a search when its time or node budget runs out."""
+
+
+class IterativeDeepening(AlphaBeta):
+    """
+    Alpha-beta player that searches one ply deeper at a time until its time
+    or node budget for the move runs out, then plays the best move of the
+    deepest search that finished. Each search starts with the best move of
+    the previous one, and the transposition table orders the rest.
+    :param time_limit: seconds allowed per move, or None for no limit
+    :param node_limit: positions allowed per move, or None for no limit
+    :param max_depth: deepest search to try
+    :param tt_size_mb: size of the TranspositionTable in megabytes
+    :param static_leaves: if True, positions at the search horizon are
+           scored by static_evaluate
+    :param book: optional path of an opening book file
+    :param tablebases: optional path of a directory of endgame tables
+    :param telemetry: if True, keeps a SearchStats of each move's searches
+           added together
+    :param quiescence: if True, captures are searched past the horizon
+    """
+    supports_budget = True
+
+    # how many nodes are searched between looks at the clock
+    CHECK_INTERVAL = 256
+
+    def __init__(self, time_limit=1.0, node_limit=None, max_depth=20, tt_size_mb=16,
+                 static_leaves=False, book=None, tablebases=None, telemetry=False,
+                 quiescence=False):
+        AlphaBeta.__init__(self, tt_size_mb=tt_size_mb, static_leaves=static_leaves, book=book,
+                           tablebases=tablebases, telemetry=telemetry, quiescence=quiescence)
+        self.time_limit = time_limit
+        self.node_limit = node_limit
+        self.max_depth = max_depth
+        self.depth_reached = 0
+        self._nodes = 0
+        self._next_check = 0
+        self._deadline = None
+        self._max_nodes = None
+
+    def choose_move(self, board, time_limit=None, node_limit=None):
+        """
+        Chooses the best move found within the budget. The depth 1 search
+        always finishes, so a move is returned however small the budget.
+        :param board: board object
+        :param time_limit: seconds allowed for this move, defaults to the
+               player's time_limit
+        :param node_limit: positions allowed for this move, defaults to the
+               player's node_limit
+        :return: string in form "a1 b2"
+        """
+        if time_limit is None:
+            time_limit = self.time_limit
+        if node_limit is None:
+            node_limit = self.node_limit
+        known_move = self.lookup_move(board)
+        if known_move is not None:
+            return known_move
+
+        position = self.new_position(board)
+        self._nodes = 0
+        self._next_check = self.CHECK_INTERVAL
+        self._max_nodes = node_limit
+        if time_limit is None:
+            self._deadline = None
+        else:
+            self._deadline = time.perf_counter() + time_limit
+
+        best_move = None
+        self.depth_reached = 0
+        for depth in range(1, self.max_depth + 1):
+            try:
+                best_move = self.search_root(position, depth, best_move)[1]
+            except SearchBudgetExceeded:
+                break
+            self.depth_reached = depth
+            if self._budget_exceeded():
+                break
+        return self.finish_search(best_move, self.depth_reached)
+
+    def negamax(self, board, depth, alpha=-math.inf, beta=math.inf):
+        """
+        Counts the position against the budget, then searches it with
+        AlphaBeta.negamax.
+        """
+        # leaves are counted by quiesce when it searches them
+        if depth or not self.quiescence:
+            self.count_node()
+        return AlphaBeta.negamax(self, board, depth, alpha, beta)
+
+    def quiesce(self, board, alpha=-math.inf, beta=math.inf):
+        """
+        Counts the position against the budget, then searches it with
+        AlphaBeta.quiesce.
+        """
+        self.count_node()
+        return AlphaBeta.quiesce(self, board, alpha, beta)
+
+    def count_node(self):
+        """
+        Counts a position searched, stopping the search if the budget has
+        run out.
+        """
+        self._nodes += 1
+        if self._nodes >= self._next_check:
+            self._next_check = self._nodes + self.CHECK_INTERVAL
+            if self._max_nodes is not None:
+                self._next_check = min(self._next_check, self._max_nodes)
+            # the depth 1 search always finishes so there is a move to play
+            if self.depth_reached and self._budget_exceeded():
+                raise SearchBudgetExceeded()
+
+    def _budget_exceeded(self):
+        """Returns True if the time or nodes for this move have run out."""
+        if self._max_nodes is not None and self._nodes >= self._max_nodes:
+            return True
+        if self._deadline is not None and time.perf_counter() >= self._deadline:
+            return True
+        return False
+
 
 class Human(Player):
     @staticmethod
@@ -0,0 +1,125 @@
+from chess import validation
+from chess import zobrist
+from chess.bitboard import BitBoard, CHAR_PIECES, CODE_CHARS, PAWN, TYPE_VALUES
+from chess.moves import PROMOTION_SHIFT, SQUARE_MASK, TO_SHIFT
+from chess.pieces import P1_CHAR, P2_CHAR
+
+
+class Position(BitBoard):
+    """
+    Mutable bitboard position for searching. make_move changes only the
+    squares touched by the move and remembers what it overwrote, so
+    unmake_move can put them back. A search can then walk the whole tree on
+    one object instead of creating a new board for every node.
+    :param board: string in the same form as ChessBoard
+    :param validation: optional level from chess.validation
+    """
+    def __init__(self, board, validation=None):
+        BitBoard.__init__(self, board, validation)
+        self._undo = []
+
+    @classmethod
+    def _from_state(cls, side, pieces, occupied_by, squares, zobrist_key, material,
+                    validation=None):
+        position = super(Position, cls)._from_state(side, pieces, occupied_by, squares,
+                                                    zobrist_key, material, validation)
+        position._undo = []
+        return position
+
+    @property
+    def ply(self):
+        """Returns the number of moves that can currently be unmade."""
+        return len(self._undo)
+
+    def make_move(self, move):
+        """
+        Performs a move on this position, changing it in place.
+        :param move: a chess move as an int from calc_move_list, or a string
+               in the form "a1 b2"
+        """
+        if move.__class__ is str:
+            move = self.parse_move(move)
+        frm = move & SQUARE_MASK
+        to = move >> TO_SHIFT & SQUARE_MASK
+        squares = self._squares
+        side = self._side
+        moved = squares[frm]
+        captured = squares[to]
+        if validation.should_check(self._validation):
+            assert self._occupied_by[side] & (1 << frm), \
+                "Error can't attack with this. Current player: {}. attacking_piece: {}" \
+                .format(self._player_turn, moved)
+        self._undo.append((frm, to, moved, captured, self._zobrist_key, self._material))
+
+        frm_bit = 1 << frm
+        to_bit = 1 << to
+        pieces = self._pieces
+        occupied_by = self._occupied_by
+
+        moved_type = CHAR_PIECES[moved][1]
+        code = side * 6 + moved_type
+        pieces[code] ^= frm_bit
+        occupied_by[side] ^= frm_bit | to_bit
+        squares[frm] = "."
+
+        if captured != ".":
+            captured_side, captured_type = CHAR_PIECES[captured]
+            pieces[captured_side * 6 + captured_type] ^= to_bit
+            occupied_by[captured_side] ^= to_bit
+            p1_material, p2_material = self._material
+            if captured_side == 0:
+                self._material = (p1_material - TYPE_VALUES[captured_type], p2_material)
+            else:
+                self._material = (p1_material, p2_material - TYPE_VALUES[captured_type])
+
+        # upgrades pawns that reach the last row, which the move is marked with
+        promotion = move >> PROMOTION_SHIFT
+        if promotion:
+            code = side * 6 + promotion
+            p1_material, p2_material = self._material
+            gain = TYPE_VALUES[promotion] - TYPE_VALUES[PAWN]
+            if side == 0:
+                self._material = (p1_material + gain, p2_material)
+            else:
+                self._material = (p1_material, p2_material + gain)
+        pieces[code] |= to_bit
+        squares[to] = CODE_CHARS[code]
+
+        self._zobrist_key ^= zobrist.move_key(frm, to, moved, captured, squares[to])
+        self._occupied = occupied_by[0] | occupied_by[1]
+        self._side = 1 - side
+        self._player_turn = P2_CHAR if side == 0 else P1_CHAR
+        self._code = None
+        self._game_status = None
+
+    def unmake_move(self):
+        """
+        Takes back the last move made with make_move.
+        """
+        frm, to, moved, captured, self._zobrist_key, self._material = self._undo.pop()
+        squares = self._squares
+        pieces = self._pieces
+        occupied_by = self._occupied_by
+        side = 1 - self._side
+        frm_bit = 1 << frm
+        to_bit = 1 << to
+
+        # the piece on the target square may be a newly upgraded queen
+        placed_side, placed_type = CHAR_PIECES[squares[to]]
+        pieces[placed_side * 6 + placed_type] ^= to_bit
+        moved_type = CHAR_PIECES[moved][1]
+        pieces[side * 6 + moved_type] |= frm_bit
+        occupied_by[side] ^= frm_bit | to_bit
+        squares[frm] = moved
+        squares[to] = captured
+
+        if captured != ".":
+            captured_side, captured_type = CHAR_PIECES[captured]
+            pieces[captured_side * 6 + captured_type] |= to_bit
+            occupied_by[captured_side] |= to_bit
+
+        self._occupied = occupied_by[0] | occupied_by[1]
+        self._side = side
+        self._player_turn = P1_CHAR if side == 0 else P2_CHAR
+        self._code = None
+        self._game_status = None
@@ -0,0 +1,490 @@
+"""
+Server that hosts many games against computer players at once, one per
+client connection, over a plain TCP line protocol.
+
+The server runs on asyncio. Computer moves are chosen on the pool of worker
+processes shared with ParallelMinimax, so a long search in one game never
+holds up the replies of the others.
+
+Each line a client sends is a command:
+
+    new OPPONENT [SIDE [FIRST]]  start a game against OPPONENT, written as for
+                                 chess.tournament such as AlphaBeta:depth=2,
+                                 with the client playing SIDE 1 or 2 and
+                                 player FIRST moving first, both default 1.
+                                 Only the options in OPPONENT_LIMITS,
+                                 OPPONENT_FLAGS and OPPONENT_PATHS can be given
+    move a2 a3                   play a move
+    board                        show the board and the moves that can be played
+    metrics                      show the latency of this game and the server
+    quit                         close the connection
+
+Each reply is a line of JSON. The game's events are sent as they happen, in
+the form of ChessGame.events, and there are also 'board', 'metrics' and
+'error' events.
+
+Usage:
+    python -m chess.server --port 8765 --processes 4
+"""
+import argparse
+import asyncio
+import inspect
+import json
+import os
+import sys
+import time
+from collections import deque
+
+from chess import cache
+from chess.board import ChessBoard, ONGOING
+from chess.game import ChessGame, DEFAULT_BOARD, GAME_END, MOVE
+import chess.player as player_module
+from chess.player import Player, get_executor
+from chess.tournament import make_player, parse_player
+
+DEFAULT_PORT = 8765
+
+# replies that are not game events
+BOARD = "board"
+METRICS = "metrics"
+ERROR = "error"
+
+# latest samples kept for the server's latency metrics
+MAX_SAMPLES = 10000
+
+# options of the opponent a client may set, with the smallest and largest
+# value each may have
+OPPONENT_LIMITS = {"depth": (1, 6),
+                   "max_depth": (1, 20),
+                   "time_limit": (0.01, 60.0),
+                   "node_limit": (1, 10 ** 7),
+                   "tt_size_mb": (1, 256)}
+
+# options of the opponent a client may turn on or off
+OPPONENT_FLAGS = ("static_leaves", "quiescence")
+
+# options of the opponent naming files the server has, each with the check
+# that it exists
+OPPONENT_PATHS = {"book": os.path.isfile, "tablebases": os.path.isdir}
+
+# computer players created in this worker process, by repr of their config
+_players = {}
+
+
+def choose_move(config, code):
+    """
+    Chooses a computer player's move in a worker process. Players are kept
+    between moves, so a player's transposition table and opened files are
+    reused.
+    :param config: PlayerConfig
+    :param code: repr of the board
+    :return: string in form "a1 b2"
+    """
+    key = repr(config)
+    ai = _players.get(key)
+    if ai is None:
+        ai = make_player(config)
+        _players[key] = ai
+    return ai.choose_move(ChessBoard(code))
+
+
+def check_opponent(config):
+    """
+    Checks the opponent a client asked for without creating it, since
+    players are only created in the worker processes. The opponent must be
+    a player class of chess.player other than Human, and may only be given
+    the options in OPPONENT_LIMITS, OPPONENT_FLAGS and OPPONENT_PATHS.
+    :param config: PlayerConfig
+    :raises ValueError: if the opponent is not allowed
+    """
+    player_class = getattr(player_module, config.player, None)
+    if not (isinstance(player_class, type) and issubclass(player_class, Player)):
+        raise ValueError("{} is not a player in chess.player".format(config.player))
+    if issubclass(player_class, player_module.Human):
+        raise ValueError("the opponent cannot be a Human")
+
+    for key, value in config.kwargs.items():
+        if key in OPPONENT_LIMITS:
+            low, high = OPPONENT_LIMITS[key]
+            if (isinstance(value, bool) or not isinstance(value, (int, float))
+                    or not low <= value <= high):
+                raise ValueError("{} must be from {} to {}, not {!r}".format(key, low, high, value))
+        elif key in OPPONENT_FLAGS:
+            if not isinstance(value, bool):
+                raise ValueError("{} must be True or False, not {!r}".format(key, value))
+        elif key in OPPONENT_PATHS:
+            if not isinstance(value, str) or not OPPONENT_PATHS[key](value):
+                raise ValueError("{} {!r} does not exist".format(key, value))
+        else:
+            raise ValueError("{} cannot be set by a client".format(key))
+
+    try:
+        inspect.signature(player_class).bind(**config.kwargs)
+    except TypeError as error:
+        raise ValueError("{}: {}".format(config.player, error))
+
+
+def summarize(samples):
+    """
+    Works out the spread of a list of latencies.
+    :param samples: iterable of seconds
+    :return: dict with 'count', 'mean', 'median', 'p95' and 'max'
+    """
+    samples = sorted(samples)
+    if not samples:
+        return {"count": 0, "mean": None, "median": None, "p95": None, "max": None}
+    return {"count": len(samples),
+            "mean": sum(samples) / len(samples),
+            "median": samples[len(samples) // 2],
+            "p95": samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+            "max": samples[-1]}
+
+
+class RemotePlayer(Player):
+    """
+    Player whose moves are chosen outside the game, by a client or a worker
+    process, and handed to it before the game asks for them.
+    :param name: name shown in the game's events
+    """
+    def __init__(self, name):
+        self.name = name
+        self.next_move = None
+
+    def __repr__(self):
+        return self.name
+
+    def choose_move(self, board):
+        move, self.next_move = self.next_move, None
+        assert move is not None, "{} has no move ready".format(self)
+        return move
+
+
+class GameSession(object):
+    """
+    Game between a client and a computer player, played one move at a time.
+    :param number: int identifying the session on its server
+    :param opponent: PlayerConfig of the computer player
+    :param side: player number 1 or 2 the client plays
+    :param first_move: player number 1 or 2 that moves first
+    :param max_turns: turns before the game is called a draw
+    :param board: starting board, without the player turn
+    """
+    def __init__(self, number, opponent, side=1, first_move=1, max_turns=200,
+                 board=DEFAULT_BOARD):
+        if side not in (1, 2):
+            raise ValueError("side must be 1 or 2, not {}".format(side))
+        if first_move not in (1, 2):
+            raise ValueError("first move must be 1 or 2, not {}".format(first_move))
+        if issubclass(getattr(player_module, opponent.player), player_module.Human):
+            raise ValueError("the opponent cannot be a Human")
+        self.number = number
+        self.opponent = opponent
+        self.side = side
+        self.max_turns = max_turns
+        self.client = RemotePlayer("client")
+        self.computer = RemotePlayer(opponent.name)
+        if side == 1:
+            players = (self.client, self.computer)
+        else:
+            players = (self.computer, self.client)
+        self.game = ChessGame(players[0], players[1], verbosity=0, first_move=first_move,
+                              board=board, max_turns=max_turns)
+        self.board = self.game.board
+        self.over = False
+        self.response_seconds = []
+        self.search_seconds = []
+        self.waiting_since = time.perf_counter()
+        self._events = self.game.events()
+
+    def __repr__(self):
+        return "{}({}, {})".format(self.__class__.__name__, self.number, self.opponent.name)
+
+    @property
+    def computer_to_move(self):
+        """Returns True if the game is waiting for the computer player."""
+        return not self.over and int(self.board.get_player_turn()) != self.side
+
+    def start(self):
+        """
+        Starts the game.
+        :return: list of events, the start of the game and its end if the
+                 starting board is already over
+        """
+        event = next(self._events)
+        event["session"] = self.number
+        return [event] + self._end_if_over()
+
+    def play(self, move, seconds):
+        """
+        Plays the move of the player whose turn it is.
+        :param move: string in form "a1 b2"
+        :param seconds: time the player took to choose the move
+        :return: list of events, the move and the end of the game if it is
+                 now over
+        """
+        if self.over:
+            raise ValueError("the game is over")
+        if move not in self.board.calc_possible_moves():
+            raise ValueError("{} is not a possible move".format(move))
+        if int(self.board.get_player_turn()) == self.side:
+            self.client.next_move = move
+        else:
+            self.computer.next_move = move
+        event = next(self._events)
+        assert event["event"] == MOVE
+        event["seconds"] = seconds
+        self.board = ChessBoard(event["board"])
+        return [event] + self._end_if_over(event["turn"])
+
+    def _end_if_over(self, turn=0):
+        if self.board.game_status == ONGOING and (self.max_turns is None
+                                                  or turn < self.max_turns):
+            return []
+        event = next(self._events)
+        assert event["event"] == GAME_END
+        self.over = True
+        return [event]
+
+    def board_event(self):
+        """Returns an event with the board and the moves that can be played."""
+        return {"event": BOARD,
+                "session": self.number,
+                "board": repr(self.board),
+                "moves": [] if self.over else self.board.calc_possible_moves(),
+                "over": self.over}
+
+    def metrics(self):
+        """
+        Returns the latency of the server's replies to the client's commands
+        and of the computer player's searches in this session.
+        :return: dict with 'response seconds' and 'search seconds'
+        """
+        return {"response seconds": summarize(self.response_seconds),
+                "search seconds": summarize(self.search_seconds)}
+
+
+class GameServer(object):
+    """
+    asyncio server running a GameSession for each client that starts a game.
+    :param host: address to listen on
+    :param port: port to listen on, 0 for any free port
+    :param processes: worker processes for the computer players' searches,
+           defaults to the number of CPUs
+    :param max_turns: turns before a game is called a draw
+    :param board: starting board of every game, without the player turn
+    """
+    def __init__(self, host="127.0.0.1", port=DEFAULT_PORT, processes=None, max_turns=200,
+                 board=DEFAULT_BOARD):
+        if processes is None:
+            processes = os.cpu_count() or 1
+        assert processes >= 1, "processes must be at least 1, not {}".format(processes)
+        self.host = host
+        self.port = port
+        self.processes = processes
+        self.max_turns = max_turns
+        self.board = board
+        self.sessions = {}
+        self.sessions_started = 0
+        self.response_seconds = deque(maxlen=MAX_SAMPLES)
+        self.search_seconds = deque(maxlen=MAX_SAMPLES)
+        self._server = None
+        # tasks running handle_client for the connected clients
+        self._clients = set()
+
+    def __repr__(self):
+        return "{}({}:{})".format(self.__class__.__name__, self.host, self.port)
+
+    @property
+    def executor(self):
+        """Returns the pool of worker processes shared with ParallelMinimax."""
+        return get_executor(self.processes)
+
+    async def start(self):
+        """Starts listening. The port is filled in if it was 0."""
+        self._server = await asyncio.start_server(self._accept, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        """
+        Stops listening, disconnects the clients still connected and waits
+        for the server to close.
+        """
+        self._server.close()
+        clients = list(self._clients)
+        for task in clients:
+            task.cancel()
+        if clients:
+            await asyncio.gather(*clients, return_exceptions=True)
+        await self._server.wait_closed()
+
+    def _accept(self, reader, writer):
+        """Runs handle_client for a new connection as a task the server keeps."""
+        task = asyncio.ensure_future(self.handle_client(reader, writer))
+        self._clients.add(task)
+        task.add_done_callback(self._clients.discard)
+
+    def metrics(self):
+        """
+        Returns the latency of every session's replies and searches.
+        :return: dict with 'sessions' open, 'sessions started',
+                 'response seconds' and 'search seconds'
+        """
+        return {"sessions": len(self.sessions),
+                "sessions started": self.sessions_started,
+                "response seconds": summarize(self.response_seconds),
+                "search seconds": summarize(self.search_seconds)}
+
+    def new_session(self, args):
+        """
+        Starts a session from the arguments of a new command.
+        :param args: list of strings, the opponent then optionally the side
+               and the first player to move
+        :return: GameSession
+        """
+        if not 1 <= len(args) <= 3:
+            raise ValueError("usage: new OPPONENT [SIDE [FIRST]]")
+        # the opponent is only created by the worker processes
+        opponent = parse_player(args[0], check=False)
+        check_opponent(opponent)
+        numbers = [int(arg) for arg in args[1:]]
+        self.sessions_started += 1
+        return GameSession(self.sessions_started, opponent, *numbers,
+                           max_turns=self.max_turns, board=self.board)
+
+    async def search(self, session):
+        """
+        Has a worker process choose the computer player's move.
+        :param session: GameSession waiting for the computer player
+        :return: string in form "a1 b2"
+        """
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(self.executor, choose_move,
+                                          session.opponent, repr(session.board))
+
+    async def computer_move(self, session):
+        """
+        Has the computer player's move chosen by search and plays it. If the
+        search fails the game is over, and an error event is returned.
+        :param session: GameSession waiting for the computer player
+        :return: list of events
+        """
+        start = time.perf_counter()
+        try:
+            move = await self.search(session)
+        except asyncio.CancelledError:
+            raise
+        except Exception as error:
+            session.over = True
+            return [{"event": ERROR, "session": session.number,
+                     "message": "{} could not move: {}: {}".format(
+                         session.opponent.name, error.__class__.__name__, error)}]
+        seconds = time.perf_counter() - start
+        session.search_seconds.append(seconds)
+        self.search_seconds.append(seconds)
+        return session.play(move, seconds)
+
+    async def run_command(self, session, command, args, send):
+        """
+        Carries out one command of a client.
+        :param session: the client's GameSession, or None before its first game
+        :param command: string, the first word of the line
+        :param args: list of strings, the other words of the line
+        :param send: coroutine function sending a list of events to the client
+        :return: the client's GameSession after the command
+        """
+        if command == "new":
+            new_session = self.new_session(args)
+            if session is not None:
+                self.sessions.pop(session.number, None)
+            session = new_session
+            self.sessions[session.number] = session
+            await send(session.start())
+        elif command in ("move", "board", "metrics"):
+            if session is None:
+                raise ValueError("start a game with new first")
+            if command == "move":
+                if session.computer_to_move:
+                    raise ValueError("it is not your turn")
+                thought = time.perf_counter() - session.waiting_since
+                await send(session.play(" ".join(args), thought))
+            elif command == "board":
+                await send([session.board_event()])
+            else:
+                await send([{"event": METRICS, "session": session.metrics(),
+                             "server": self.metrics()}])
+        else:
+            raise ValueError("unknown command {}".format(command))
+
+        while session.computer_to_move:
+            await send(await self.computer_move(session))
+        session.waiting_since = time.perf_counter()
+        return session
+
+    async def handle_client(self, reader, writer):
+        """
+        Reads a client's commands until it quits or disconnects.
+        :param reader: asyncio StreamReader
+        :param writer: asyncio StreamWriter
+        """
+        async def send(events):
+            for event in events:
+                writer.write(json.dumps(event).encode() + b"\n")
+            await writer.drain()
+
+        session = None
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                received = time.perf_counter()
+                words = line.decode(errors="replace").split()
+                if not words:
+                    continue
+                command = words[0].lower()
+                if command == "quit":
+                    break
+                try:
+                    session = await self.run_command(session, command, words[1:], send)
+                except (AssertionError, ValueError, TypeError, SyntaxError) as error:
+                    await send([{"event": ERROR, "message": str(error)}])
+                if session is not None:
+                    seconds = time.perf_counter() - received
+                    session.response_seconds.append(seconds)
+                    self.response_seconds.append(seconds)
+        except ConnectionError:
+            pass
+        finally:
+            if session is not None:
+                self.sessions.pop(session.number, None)
+            writer.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Host games against computer players.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--max-turns", type=int, default=200)
+    parser.add_argument("--cache-mb", type=float, default=cache.DEFAULT_SIZE_MB,
+                        help="size of the position cache of each process, 0 for none")
+    args = parser.parse_args(argv)
+    cache.set_size(args.cache_mb)
+
+    server = GameServer(args.host, args.port, processes=args.processes,
+                        max_turns=args.max_turns)
+    loop = asyncio.get_event_loop()
+    loop.run_until_complete(server.start())
+    print("serving games on {}:{}".format(server.host, server.port))
+    try:
+        loop.run_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        loop.run_until_complete(server.stop())
+        loop.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,402 @@
+"""
+Endgame tablebases: exact results of every position with a king and a queen
+or rook against a lone king, worked out backwards from the checkmates.
+
+A table gives each position a value from the point of view of the player
+to move:
+
+    n > 0    wins, giving checkmate in n moves of either player
+    0        draw, the lone king can take the piece or reach stalemate
+    n < 0    loses, being checkmated after -n - 1 moves of either player
+
+Positions are indexed by the player to move (0 for the player with the
+piece, 1 for the lone king), the square of the stronger king, the square of
+the lone king and the square of the piece, each square numbered
+row * 8 + col. A table file is a header of MAGIC and the signature, then
+one signed byte per index. Files are read through mmap, so every process
+shares one copy of the pages.
+
+Tables are built with a process pool:
+
+    python -m chess.tablebase tablebases KQK KRK --processes 4
+"""
+import argparse
+import mmap
+import os
+import sys
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from chess.bitboard import (KING_ATTACKS, QUEEN, QUEEN_LINES, ROOK, RAY_E, RAY_N, RAY_S,
+                            RAY_W, bishop_attacks, rook_attacks)
+from chess.pieces import P1_CHAR, P2_CHAR
+
+MAGIC = b"CHESSTB1"
+
+# the piece each table is built for, next to both kings
+SIGNATURES = {"KQK": QUEEN, "KRK": ROOK}
+
+STRONG_TO_MOVE = 0
+WEAK_TO_MOVE = 1
+
+# number of positions in each table
+SIZE = 2 * 64 * 64 * 64
+
+DRAW = 0
+# the player to move is checkmated
+CHECKMATED = -1
+# squares shared by two pieces, kings next to each other or the player not
+# to move in check
+ILLEGAL = -128
+# positions not yet solved while a table is built, which are draws at the end
+_UNKNOWN = 127
+
+# every square a queen or rook on an empty board could reach from each square
+LINES = {QUEEN: QUEEN_LINES,
+         ROOK: [RAY_N[sq] | RAY_E[sq] | RAY_S[sq] | RAY_W[sq] for sq in range(64)]}
+
+# tables opened in this process by directory, see open_tablebases
+_tablebases = {}
+
+
+def index(to_move, strong_king, weak_king, piece):
+    """
+    Computes the index of a position in a table.
+    :param to_move: STRONG_TO_MOVE or WEAK_TO_MOVE
+    :param strong_king: int square of the king with the piece
+    :param weak_king: int square of the lone king
+    :param piece: int square of the queen or rook
+    :return: int
+    """
+    return ((to_move * 64 + strong_king) * 64 + weak_king) * 64 + piece
+
+
+def _squares_of(bitboard):
+    """Generates the int squares of the bits set in a bitboard."""
+    while bitboard:
+        bit = bitboard & -bitboard
+        bitboard ^= bit
+        yield bit.bit_length() - 1
+
+
+def _piece_attacks(piece_type, sq, occupied):
+    """Returns a bitboard of the squares a queen or rook on sq attacks."""
+    if piece_type == ROOK:
+        return rook_attacks(sq, occupied)
+    return rook_attacks(sq, occupied) | bishop_attacks(sq, occupied)
+
+
+def _count_moves(piece_type, to_move, strong_king):
+    """
+    Checks and counts the moves of every position with the given player to
+    move and stronger king, for a worker process.
+    :return: tuple of (bytes of values, bytes of move counts) for the 4096
+             positions in index order, with checkmates and stalemates solved
+             and every other legal position _UNKNOWN
+    """
+    values = array("b", [ILLEGAL]) * 4096
+    counts = array("B", [0]) * 4096
+    strong_bit = 1 << strong_king
+    strong_area = KING_ATTACKS[strong_king]
+    for weak_king in range(64):
+        weak_bit = 1 << weak_king
+        if weak_king == strong_king or strong_area & weak_bit:
+            continue
+        for piece in range(64):
+            piece_bit = 1 << piece
+            if piece_bit & (strong_bit | weak_bit):
+                continue
+            occupied = strong_bit | weak_bit | piece_bit
+            in_check = _piece_attacks(piece_type, piece, occupied) & weak_bit
+            slot = weak_king * 64 + piece
+
+            if to_move == STRONG_TO_MOVE:
+                # the lone king cannot have moved into check
+                if in_check:
+                    continue
+                piece_moves = _piece_attacks(piece_type, piece, occupied) & ~occupied
+                king_moves = strong_area & ~KING_ATTACKS[weak_king] & ~piece_bit
+                count = bin(piece_moves).count("1") + bin(king_moves).count("1")
+            else:
+                # the lone king does not block attacks on the squares behind it
+                attacked = strong_area | _piece_attacks(piece_type, piece, strong_bit | piece_bit)
+                # taking an undefended piece counts as a move, so a king that
+                # can do it is never lost
+                count = bin(KING_ATTACKS[weak_king] & ~attacked).count("1")
+
+            if count:
+                values[slot] = _UNKNOWN
+                counts[slot] = count
+            else:
+                values[slot] = CHECKMATED if in_check else DRAW
+    return values.tobytes(), counts.tobytes()
+
+
+def _predecessors(piece_type, indices):
+    """
+    Finds every legal position one move before each given position, for a
+    worker process. Taking a piece cannot be undone, since the table only
+    holds positions with the piece on the board.
+    :param piece_type: QUEEN or ROOK
+    :param indices: bytes of an array("I") of table indices
+    :return: bytes of an array("I") of indices, one for each move found
+    """
+    lines = LINES[piece_type]
+    found = array("I")
+    positions = array("I")
+    positions.frombytes(indices)
+    for position in positions:
+        piece = position & 63
+        weak_king = position >> 6 & 63
+        strong_king = position >> 12 & 63
+        to_move = position >> 18
+        strong_bit = 1 << strong_king
+        weak_bit = 1 << weak_king
+        piece_bit = 1 << piece
+        occupied = strong_bit | weak_bit | piece_bit
+
+        if to_move == WEAK_TO_MOVE:
+            # the piece or the stronger king just moved, and could not have
+            # left the lone king in check before it. Only a piece in line
+            # with the lone king can check it.
+            base = index(STRONG_TO_MOVE, strong_king, weak_king, 0)
+            for frm in _squares_of(_piece_attacks(piece_type, piece, occupied) & ~occupied):
+                if not lines[frm] & weak_bit or not _piece_attacks(
+                        piece_type, frm, strong_bit | weak_bit | 1 << frm) & weak_bit:
+                    found.append(base + frm)
+            aligned = lines[piece] & weak_bit
+            base = index(STRONG_TO_MOVE, 0, weak_king, piece)
+            for frm in _squares_of(KING_ATTACKS[strong_king] & ~occupied
+                                   & ~KING_ATTACKS[weak_king]):
+                if not aligned or not _piece_attacks(
+                        piece_type, piece, 1 << frm | weak_bit | piece_bit) & weak_bit:
+                    found.append(base + (frm << 12))
+        else:
+            # the lone king just moved
+            base = index(WEAK_TO_MOVE, strong_king, 0, piece)
+            for frm in _squares_of(KING_ATTACKS[weak_king] & ~occupied
+                                   & ~KING_ATTACKS[strong_king]):
+                found.append(base + (frm << 6))
+    return found.tobytes()
+
+
+def _chunks(items, count):
+    """Splits an array into about count arrays of bytes."""
+    size = max(1, -(-len(items) // count))
+    return [items[start:start + size].tobytes() for start in range(0, len(items), size)]
+
+
+def build(signature, processes=1):
+    """
+    Solves every position of a table by retrograde analysis. Checkmates are
+    found first, then each round steps one move back from the positions
+    solved in the last round: a position that can reach a loss for the other
+    player is a win, and one whose moves all reach wins for the other player
+    is a loss.
+    :param signature: a key of SIGNATURES such as "KQK"
+    :param processes: number of processes to split the work between
+    :return: array("b") of SIZE values
+    """
+    assert signature in SIGNATURES, \
+        "signature is {} but must be in {}".format(signature, sorted(SIGNATURES))
+    piece_type = SIGNATURES[signature]
+    values = array("b")
+    counts = array("B")
+
+    executor = ProcessPoolExecutor(max_workers=processes) if processes > 1 else None
+    try:
+        run = map if executor is None else executor.map
+        jobs = [(to_move, strong_king) for to_move in (STRONG_TO_MOVE, WEAK_TO_MOVE)
+                for strong_king in range(64)]
+        for chunk_values, chunk_counts in run(_count_moves, [piece_type] * len(jobs),
+                                              *zip(*jobs)):
+            values.frombytes(chunk_values)
+            counts.frombytes(chunk_counts)
+
+        frontier = array("I", [position for position in range(SIZE)
+                               if values[position] == CHECKMATED])
+        plies = 0
+        while frontier:
+            plies += 1
+            chunks = _chunks(frontier, processes * 4)
+            solved = array("I")
+            for found_bytes in run(_predecessors, [piece_type] * len(chunks), chunks):
+                found = array("I")
+                found.frombytes(found_bytes)
+                for position in found:
+                    if values[position] != _UNKNOWN:
+                        continue
+                    if plies % 2:
+                        values[position] = plies
+                        solved.append(position)
+                    else:
+                        counts[position] -= 1
+                        if counts[position] == 0:
+                            values[position] = -plies - 1
+                            solved.append(position)
+            frontier = solved
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    for position in range(SIZE):
+        if values[position] == _UNKNOWN:
+            values[position] = DRAW
+    return values
+
+
+def write(path, signature, values):
+    """
+    Writes a built table to a file.
+    :param path: path of the file to write
+    :param signature: a key of SIGNATURES
+    :param values: array("b") from build
+    """
+    assert len(values) == SIZE, "table has {} values, not {}".format(len(values), SIZE)
+    with open(path, "wb") as table_file:
+        table_file.write(MAGIC + signature.encode().ljust(8, b"\0"))
+        values.tofile(table_file)
+
+
+class Tablebase(object):
+    """
+    Table file opened for reading through mmap.
+    :param path: path of a file written by write
+    """
+    HEADER_SIZE = len(MAGIC) + 8
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as table_file:
+            self._data = mmap.mmap(table_file.fileno(), 0, access=mmap.ACCESS_READ)
+        assert self._data[:len(MAGIC)] == MAGIC, "{} is not a tablebase file".format(path)
+        assert len(self._data) == self.HEADER_SIZE + SIZE, "{} is the wrong size".format(path)
+        self.signature = self._data[len(MAGIC):self.HEADER_SIZE].rstrip(b"\0").decode()
+
+    def __repr__(self):
+        return "{}({!r})".format(self.__class__.__name__, self.path)
+
+    def close(self):
+        self._data.close()
+
+    def value(self, position):
+        """
+        Looks up a position by its index.
+        :param position: int from index
+        :return: int value as described in chess.tablebase
+        """
+        value = self._data[self.HEADER_SIZE + position]
+        return value - 256 if value > 127 else value
+
+
+class Tablebases(object):
+    """
+    The table files in a directory, named by signature such as KQK.tb. Each
+    file is opened the first time a board needs it.
+    :param directory: path of the directory
+    """
+    def __init__(self, directory):
+        self.directory = directory
+        self._tables = {}
+
+    def __repr__(self):
+        return "{}({!r})".format(self.__class__.__name__, self.directory)
+
+    def _table(self, signature):
+        """Returns the opened table of a signature, or None if it has no file."""
+        if signature not in self._tables:
+            path = os.path.join(self.directory, signature + ".tb")
+            self._tables[signature] = Tablebase(path) if os.path.exists(path) else None
+        return self._tables[signature]
+
+    def probe(self, board):
+        """
+        Looks up a board in the table for its pieces.
+        :param board: board object
+        :return: int value for the player to move as described in
+                 chess.tablebase, or None if there is no table for the board
+        """
+        squares = repr(board)[2:].replace(" ", "")
+        pieces = [(char, sq) for sq, char in enumerate(squares) if char != "."]
+        if len(pieces) != 3:
+            return None
+        piece_char, piece = [(char, sq) for char, sq in pieces if char not in "kK"][0]
+        signature = "K" + piece_char.upper() + "K"
+        if signature not in SIGNATURES:
+            return None
+        table = self._table(signature)
+        if table is None:
+            return None
+
+        strong = P1_CHAR if piece_char.islower() else P2_CHAR
+        strong_king = squares.index("k" if strong == P1_CHAR else "K")
+        weak_king = squares.index("K" if strong == P1_CHAR else "k")
+        to_move = STRONG_TO_MOVE if board.get_player_turn() == strong else WEAK_TO_MOVE
+        value = table.value(index(to_move, strong_king, weak_king, piece))
+        return None if value == ILLEGAL else value
+
+    def best_move(self, board):
+        """
+        Finds the move that wins fastest, draws, or loses slowest.
+        :param board: board object
+        :return: string in form "a1 b2", or None if there is no table for
+                 the board
+        """
+        if self.probe(board) is None:
+            return None
+        best_move = None
+        best_rank = None
+        for move in board.calc_possible_moves():
+            value = self.probe(board.do_move(move))
+            # taking the piece leaves two kings, which is a draw
+            if value is None:
+                value = DRAW
+            # the other player's value after the move
+            if value < 0:
+                rank = (2, value)
+            elif value == DRAW:
+                rank = (1, 0)
+            else:
+                rank = (0, value)
+            if best_rank is None or rank > best_rank:
+                best_move = move
+                best_rank = rank
+        return best_move
+
+
+def open_tablebases(directory):
+    """
+    Opens the tables of a directory once per process, so every player given
+    the same directory shares them.
+    :param directory: path of a directory of table files
+    :return: Tablebases
+    """
+    tablebases = _tablebases.get(directory)
+    if tablebases is None:
+        tablebases = Tablebases(directory)
+        _tablebases[directory] = tablebases
+    return tablebases
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build endgame tablebases.")
+    parser.add_argument("directory", help="directory to write the table files to")
+    parser.add_argument("signatures", nargs="*", default=sorted(SIGNATURES),
+                        help="tables to build out of {}".format(", ".join(sorted(SIGNATURES))))
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.directory):
+        os.makedirs(args.directory)
+    for signature in args.signatures:
+        values = build(signature, args.processes)
+        path = os.path.join(args.directory, signature + ".tb")
+        write(path, signature, values)
+        wins = sum(1 for value in values if value > 0)
+        print("{}: {} positions won, longest win takes {} moves, written to {}".format(
+            signature, wins, max(values), path))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
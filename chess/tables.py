@@ -0,0 +1,88 @@
+"""
+Lookup tables of the squares each kind of piece can reach from every square,
+built once at import. Tables are indexed by row * 8 + col and hold (row, col)
+tuples, already limited to squares on the board.
+"""
+
+# the 8 directions rays can go in, as (row, col) increments. Pieces search
+# them in the same order as before these tables. Move lists do not follow
+# it: ChessBoard lists each piece's moves in the order of a set of (row, col)
+# tuples
+DIRECTIONS = [(i, j) for i in (-1, 0, 1) for j in (-1, 0, 1) if i or j]
+STRAIGHT_DIRECTIONS = [(-1, 0), (0, -1), (1, 0), (0, 1)]
+DIAGONAL_DIRECTIONS = [(i, j) for i, j in DIRECTIONS if i != 0 and j != 0]
+
+KNIGHT_OFFSETS = [(i * i_sign, j * j_sign) for i, j in ((1, 2), (2, 1))
+                  for i_sign in (-1, 1) for j_sign in (-1, 1)]
+
+
+def _on_board(row, col):
+    return 0 <= row < 8 and 0 <= col < 8
+
+
+def _build_step_table(offsets):
+    """
+    Builds a table of the squares one step away from each square.
+    :param offsets: list of (row, col) increments, kept in this order
+    :return: list of 64 tuples of (row, col) tuples
+    """
+    table = []
+    for sq in range(64):
+        row, col = divmod(sq, 8)
+        table.append(tuple((row + i, col + j) for i, j in offsets
+                           if _on_board(row + i, col + j)))
+    return table
+
+
+def _build_ray_table(i, j):
+    """
+    Builds a table of the squares in one direction from each square, nearest
+    first, not including the square itself.
+    :param i: row increment
+    :param j: col increment
+    :return: list of 64 tuples of (row, col) tuples
+    """
+    table = []
+    for sq in range(64):
+        row, col = divmod(sq, 8)
+        ray = []
+        r, c = row + i, col + j
+        while _on_board(r, c):
+            ray.append((r, c))
+            r += i
+            c += j
+        table.append(tuple(ray))
+    return table
+
+
+# the (row, col) tuple of each square
+SQUARES = [divmod(sq, 8) for sq in range(64)]
+
+KNIGHT_TARGETS = _build_step_table(KNIGHT_OFFSETS)
+KING_TARGETS = _build_step_table(DIRECTIONS)
+
+# squares a pawn owned by each player attacks diagonally, keyed by the
+# player strings "1" and "2" (pieces.P1_CHAR and pieces.P2_CHAR)
+PAWN_ATTACKS = {"1": _build_step_table([(1, -1), (1, 1)]),
+                "2": _build_step_table([(-1, -1), (-1, 1)])}
+
+# RAYS[(i, j)][sq] are the squares going in direction (i, j) from sq
+RAYS = {(i, j): _build_ray_table(i, j) for i, j in DIRECTIONS}
+
+# all 4 rays a rook or bishop slides along from each square
+STRAIGHT_RAYS = [tuple(RAYS[direction][sq] for direction in STRAIGHT_DIRECTIONS)
+                 for sq in range(64)]
+DIAGONAL_RAYS = [tuple(RAYS[direction][sq] for direction in DIAGONAL_DIRECTIONS)
+                 for sq in range(64)]
+
+
+def to_bitboard(squares):
+    """
+    Converts (row, col) squares to a bitboard with bit row * 8 + col set.
+    :param squares: iterable of (row, col) tuples
+    :return: int
+    """
+    mask = 0
+    for row, col in squares:
+        mask |= 1 << (row * 8 + col)
+    return mask
@@ -0,0 +1,168 @@
+"""
+Counts and timings of a player's search, for finding out where its time
+goes.
+
+Players given telemetry=True search a TimedPosition instead of a Position.
+It records each move made, each move list and each evaluation in the
+player's SearchStats as the search runs. Players without telemetry search a
+plain Position, so the counting costs them nothing.
+"""
+import time
+
+from chess.position import Position
+
+# phases of a search that are timed
+MOVE_GENERATION = "move generation"
+MAKE_MOVE = "make move"
+EVALUATE = "evaluate"
+PHASES = (MOVE_GENERATION, MAKE_MOVE, EVALUATE)
+
+
+class SearchStats(object):
+    """
+    Counts and timings of one search. Positions are counted by ply, their
+    number of moves from the searched board, which is ply 0.
+    """
+    def __init__(self):
+        self.nodes_by_ply = [0]
+        self.leaves = 0
+        self.cutoffs = 0
+        self.depth = None
+        self.seconds = 0.0
+        self.phase_seconds = dict.fromkeys(PHASES, 0.0)
+        self._start = time.perf_counter()
+
+    def __repr__(self):
+        return "{}(nodes={}, leaves={}, cutoffs={}, seconds={:.3f})".format(
+            self.__class__.__name__, self.nodes, self.leaves, self.cutoffs, self.seconds)
+
+    @property
+    def nodes(self):
+        """Returns the number of positions searched."""
+        return sum(self.nodes_by_ply)
+
+    @property
+    def nps(self):
+        """Returns the positions searched per second."""
+        return self.nodes / self.seconds if self.seconds > 0 else 0.0
+
+    def branching_factors(self):
+        """
+        Works out the average number of moves searched from each position,
+        one ply at a time.
+        :return: list of floats, the first for the moves searched from ply 0
+        """
+        factors = []
+        for ply in range(1, len(self.nodes_by_ply)):
+            parents = self.nodes_by_ply[ply - 1]
+            factors.append(self.nodes_by_ply[ply] / parents if parents else 0.0)
+        return factors
+
+    def stop(self, depth=None):
+        """
+        Records the time since the stats were created, at the end of a search.
+        :param depth: depth the search reached
+        """
+        self.seconds = time.perf_counter() - self._start
+        self.depth = depth
+
+    def merge(self, other):
+        """
+        Adds the counts and phase times of another search, such as one run
+        in a worker process, to these stats.
+        :param other: SearchStats
+        """
+        for ply, nodes in enumerate(other.nodes_by_ply):
+            if ply == len(self.nodes_by_ply):
+                self.nodes_by_ply.append(0)
+            self.nodes_by_ply[ply] += nodes
+        self.leaves += other.leaves
+        self.cutoffs += other.cutoffs
+        for phase in PHASES:
+            self.phase_seconds[phase] += other.phase_seconds[phase]
+
+    def as_dict(self):
+        """
+        Returns the stats as plain values.
+        :return: dict with 'nodes', 'leaves', 'cutoffs', 'depth', 'seconds',
+                 'nps', 'branching factors' and 'phase seconds'
+        """
+        return {"nodes": self.nodes,
+                "leaves": self.leaves,
+                "cutoffs": self.cutoffs,
+                "depth": self.depth,
+                "seconds": self.seconds,
+                "nps": self.nps,
+                "branching factors": self.branching_factors(),
+                "phase seconds": dict(self.phase_seconds)}
+
+
+class TimedPosition(Position):
+    """
+    Position that records what a search does with it in a SearchStats.
+    A position whose move list was generated but which is left with some of
+    those moves unsearched counts as a cutoff.
+    :param board: string in the same form as ChessBoard
+    :param stats: SearchStats to record in
+    """
+    def __init__(self, board, stats, validation=None):
+        Position.__init__(self, board, validation)
+        self.stats = stats
+        # moves left to search at each ply, or None if no list was generated
+        self._unsearched = [None]
+
+    def calc_move_list(self):
+        start = time.perf_counter()
+        move_list = Position.calc_move_list(self)
+        stats = self.stats
+        stats.phase_seconds[MOVE_GENERATION] += time.perf_counter() - start
+        ply = len(self._undo)
+        if ply == 0:
+            stats.nodes_by_ply[0] += 1
+        self._unsearched[ply] = len(move_list)
+        return move_list
+
+    def calc_capture_list(self):
+        start = time.perf_counter()
+        move_list = Position.calc_capture_list(self)
+        self.stats.phase_seconds[MOVE_GENERATION] += time.perf_counter() - start
+        self._unsearched[len(self._undo)] = len(move_list)
+        return move_list
+
+    def make_move(self, move):
+        start = time.perf_counter()
+        Position.make_move(self, move)
+        stats = self.stats
+        stats.phase_seconds[MAKE_MOVE] += time.perf_counter() - start
+        ply = len(self._undo)
+        if self._unsearched[ply - 1] is not None:
+            self._unsearched[ply - 1] -= 1
+        if ply == len(stats.nodes_by_ply):
+            stats.nodes_by_ply.append(0)
+        stats.nodes_by_ply[ply] += 1
+        if ply == len(self._unsearched):
+            self._unsearched.append(None)
+        else:
+            self._unsearched[ply] = None
+
+    def unmake_move(self):
+        start = time.perf_counter()
+        ply = len(self._undo)
+        Position.unmake_move(self)
+        self.stats.phase_seconds[MAKE_MOVE] += time.perf_counter() - start
+        if self._unsearched[ply]:
+            self.stats.cutoffs += 1
+
+    def evaluate(self):
+        start = time.perf_counter()
+        score = Position.evaluate(self)
+        self.stats.phase_seconds[EVALUATE] += time.perf_counter() - start
+        self.stats.leaves += 1
+        return score
+
+    def static_evaluate(self):
+        start = time.perf_counter()
+        score = Position.static_evaluate(self)
+        self.stats.phase_seconds[EVALUATE] += time.perf_counter() - start
+        self.stats.leaves += 1
+        return score
@@ -0,0 +1,375 @@
+"""
+Plays many games between players on a pool of processes and adds up the
+results as each game finishes.
+
+Players are described by a PlayerConfig, which names a class in
+chess.player and the arguments to create it with, so only small tuples are
+sent to the worker processes. Every pairing is played an even number of
+times with first_move alternating, so each player starts as often as the
+other.
+
+Usage:
+    python -m chess.tournament random=RandomComputer ab2=AlphaBeta:depth=2 \\
+        mm2=BasicMinimax:depth=2 --games 4 --max-turns 150 --processes 4
+    python -m chess.tournament ab3=AlphaBeta:depth=3 random=RandomComputer \\
+        ab2=AlphaBeta:depth=2 --gauntlet
+"""
+import argparse
+import ast
+import math
+import random
+import sys
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from chess import cache
+import chess.player as player_module
+from chess.game import ChessGame, DEFAULT_BOARD
+
+ROUND_ROBIN = "round robin"
+GAUNTLET = "gauntlet"
+PAIRINGS = (ROUND_ROBIN, GAUNTLET)
+
+# name shown in results, name of a class in chess.player and a dict of the
+# arguments to create it with
+PlayerConfig = namedtuple("PlayerConfig", ["name", "player", "kwargs"])
+
+# everything a worker process needs to play one game
+GameSpec = namedtuple("GameSpec", ["index", "player1", "player2", "first_move", "seed",
+                                   "max_turns", "time_limit", "node_limit", "board"])
+
+
+def make_player(config):
+    """
+    Creates the player a config describes.
+    :param config: PlayerConfig
+    :return: player object
+    """
+    player_class = getattr(player_module, config.player, None)
+    assert isinstance(player_class, type) and issubclass(player_class, player_module.Player), \
+        "{} is not a player in chess.player".format(config.player)
+    return player_class(**config.kwargs)
+
+
+def parse_player(text, check=True):
+    """
+    Reads a player config from the command line form name=Class:key=value,...
+    where each value is a Python literal, such as ab3=AlphaBeta:depth=3.
+    The name= part may be left out.
+    :param text: string
+    :param check: if True, the player is created once so a bad config fails here
+    :return: PlayerConfig
+    """
+    name, _, spec = text.partition("=")
+    if not spec or ":" in name:
+        # no name given, so the player is named by its whole description
+        name, spec = text, text
+    class_name, _, args = spec.partition(":")
+    kwargs = {}
+    for arg in args.split(","):
+        if arg:
+            key, _, value = arg.partition("=")
+            kwargs[key] = ast.literal_eval(value)
+    config = PlayerConfig(name, class_name, kwargs)
+    if check:
+        make_player(config)
+    return config
+
+
+def round_robin(num_players):
+    """
+    Pairs every player with every other player once.
+    :param num_players: int
+    :return: list of (player index, player index) tuples
+    """
+    return [(i, j) for i in range(num_players) for j in range(i + 1, num_players)]
+
+
+def gauntlet(num_players):
+    """
+    Pairs the first player with each of the others.
+    :param num_players: int
+    :return: list of (player index, player index) tuples
+    """
+    return [(0, j) for j in range(1, num_players)]
+
+
+def play_game(configs, spec):
+    """
+    Plays one game in a worker process.
+    :param configs: list of PlayerConfig
+    :param spec: GameSpec
+    :return: dict with 'index', 'player1', 'player2', 'first_move',
+             'winner' (a player name or None), 'status', 'turns',
+             'start board' and 'moves'
+    """
+    random.seed(spec.seed)
+    config1 = configs[spec.player1]
+    config2 = configs[spec.player2]
+    player1 = make_player(config1)
+    player2 = make_player(config2)
+    game = ChessGame(player1, player2, verbosity=0, first_move=spec.first_move,
+                     board=spec.board, time_limit=spec.time_limit,
+                     node_limit=spec.node_limit, max_turns=spec.max_turns)
+    result = game.play()
+
+    if result["winner"] is player1:
+        winner = config1.name
+    elif result["winner"] is player2:
+        winner = config2.name
+    else:
+        winner = None
+    return {"index": spec.index,
+            "player1": config1.name,
+            "player2": config2.name,
+            "first_move": spec.first_move,
+            "winner": winner,
+            "status": result["status"],
+            "turns": result["turns"],
+            "start board": result["start board"],
+            "moves": result["moves"]}
+
+
+def elo_difference(score):
+    """
+    Converts the fraction of points scored against an opponent into the
+    rating difference that predicts it. Scores are kept between 0.01 and
+    0.99 so a player who won or lost every game gets a finite rating.
+    :param score: float between 0 and 1
+    :return: float
+    """
+    score = min(max(score, 0.01), 0.99)
+    return -400 * math.log10(1 / score - 1)
+
+
+def estimate_elo(results, iterations=100):
+    """
+    Estimates ratings that best explain a set of results, averaging 0. Each
+    player's rating is moved toward the average rating of their opponents
+    plus the rating difference their score suggests.
+    :param results: iterable of result dicts from play_game
+    :param iterations: number of rounds of updates
+    :return: dict of player name to float rating
+    """
+    games = {}
+    for result in results:
+        for name, opponent in ((result["player1"], result["player2"]),
+                               (result["player2"], result["player1"])):
+            if result["winner"] is None:
+                score = 0.5
+            else:
+                score = 1.0 if result["winner"] == name else 0.0
+            games.setdefault(name, []).append((opponent, score))
+
+    ratings = {name: 0.0 for name in games}
+    for _ in range(iterations):
+        new_ratings = {}
+        for name, played in games.items():
+            average_opponent = sum(ratings[opponent] for opponent, _ in played) / len(played)
+            score = sum(score for _, score in played) / len(played)
+            # halfway steps stop two player ratings from swapping back and forth
+            new_ratings[name] = (ratings[name] + average_opponent + elo_difference(score)) / 2
+        mean = sum(new_ratings.values()) / len(new_ratings)
+        ratings = {name: rating - mean for name, rating in new_ratings.items()}
+    return ratings
+
+
+class Tournament(object):
+    """
+    Games between a list of players, run on a pool of processes.
+    :param configs: list of PlayerConfig
+    :param pairing: ROUND_ROBIN for every pair of players, or GAUNTLET for
+           the first player against each of the others
+    :param games_per_pair: games each pair plays, alternating who moves first,
+           so it must be even
+    :param max_turns: turns before a game is called a draw
+    :param processes: worker processes, 1 plays the games in this process
+    :param time_limit: seconds per move for players that support a budget
+    :param node_limit: positions per move for players that support a budget
+    :param seed: seed for the random numbers of the first game, each later
+           game uses the next seed
+    :param board: starting board of every game, without the player turn
+    """
+    def __init__(self, configs, pairing=ROUND_ROBIN, games_per_pair=2, max_turns=200,
+                 processes=None, time_limit=None, node_limit=None, seed=0,
+                 board=DEFAULT_BOARD):
+        assert pairing in PAIRINGS, "pairing is {} but must be in {}".format(pairing, PAIRINGS)
+        assert len(configs) >= 2, "a tournament needs at least 2 players"
+        assert games_per_pair > 0 and games_per_pair % 2 == 0, \
+            "games_per_pair is {} but must be even so both players start as often".format(
+                games_per_pair)
+        names = [config.name for config in configs]
+        assert len(set(names)) == len(names), "player names must be different: {}".format(names)
+        for config in configs:
+            make_player(config)
+
+        self.configs = list(configs)
+        self.pairing = pairing
+        self.games_per_pair = games_per_pair
+        self.max_turns = max_turns
+        self.processes = processes
+        self.time_limit = time_limit
+        self.node_limit = node_limit
+        self.seed = seed
+        self.board = board
+        self.results = []
+
+    def __repr__(self):
+        return "{}({} players, {})".format(self.__class__.__name__, len(self.configs),
+                                           self.pairing)
+
+    def game_specs(self):
+        """
+        Lists every game to be played.
+        :return: list of GameSpec
+        """
+        if self.pairing == ROUND_ROBIN:
+            pairs = round_robin(len(self.configs))
+        else:
+            pairs = gauntlet(len(self.configs))
+        specs = []
+        for player1, player2 in pairs:
+            for game_number in range(self.games_per_pair):
+                index = len(specs)
+                specs.append(GameSpec(index, player1, player2, 1 + game_number % 2,
+                                      self.seed + index, self.max_turns, self.time_limit,
+                                      self.node_limit, self.board))
+        return specs
+
+    def run(self):
+        """
+        Plays every game, giving back each result as soon as its game
+        finishes. Results are also kept in the results attribute.
+        :return: generator of result dicts from play_game
+        """
+        self.results = []
+        specs = self.game_specs()
+        if self.processes == 1:
+            for spec in specs:
+                result = play_game(self.configs, spec)
+                self.results.append(result)
+                yield result
+            return
+
+        with ProcessPoolExecutor(max_workers=self.processes) as executor:
+            futures = [executor.submit(play_game, self.configs, spec) for spec in specs]
+            for future in as_completed(futures):
+                result = future.result()
+                self.results.append(result)
+                yield result
+
+    def play(self):
+        """
+        Plays every game and waits for all of them.
+        :return: list of result dicts in the order the games were listed
+        """
+        for _ in self.run():
+            pass
+        return sorted(self.results, key=lambda result: result["index"])
+
+    def standings(self):
+        """
+        Adds up the results so far for each player. A win is worth 1 point
+        and a draw half a point.
+        :return: dict of player name to a dict with 'wins', 'draws',
+                 'losses', 'games' and 'points'
+        """
+        table = {config.name: {"wins": 0, "draws": 0, "losses": 0, "games": 0, "points": 0.0}
+                 for config in self.configs}
+        for result in self.results:
+            for name in (result["player1"], result["player2"]):
+                row = table[name]
+                row["games"] += 1
+                if result["winner"] is None:
+                    row["draws"] += 1
+                    row["points"] += 0.5
+                elif result["winner"] == name:
+                    row["wins"] += 1
+                    row["points"] += 1
+                else:
+                    row["losses"] += 1
+        return table
+
+    def pair_results(self):
+        """
+        Adds up the results so far for each pair of players.
+        :return: dict of (name, name) to [wins, draws, losses] of the first
+                 player against the second
+        """
+        table = {}
+        for result in self.results:
+            name1 = result["player1"]
+            name2 = result["player2"]
+            for name, opponent in ((name1, name2), (name2, name1)):
+                row = table.setdefault((name, opponent), [0, 0, 0])
+                if result["winner"] is None:
+                    row[1] += 1
+                elif result["winner"] == name:
+                    row[0] += 1
+                else:
+                    row[2] += 1
+        return table
+
+    def elo(self):
+        """
+        Estimates each player's rating from the results so far.
+        :return: dict of player name to float rating, averaging 0
+        """
+        ratings = estimate_elo(self.results)
+        return {config.name: ratings.get(config.name, 0.0) for config in self.configs}
+
+    def format_standings(self):
+        """
+        Creates a table of the standings, best player first.
+        :return: string
+        """
+        standings = self.standings()
+        ratings = self.elo()
+        names = sorted(standings, key=lambda name: (-standings[name]["points"], name))
+        width = max(len("player"), max(len(name) for name in names))
+        lines = ["{:<{width}}  {:>5} {:>5} {:>5} {:>6} {:>6}".format(
+            "player", "win", "draw", "loss", "points", "elo", width=width)]
+        for name in names:
+            row = standings[name]
+            lines.append("{:<{width}}  {:>5} {:>5} {:>5} {:>6.1f} {:>6.0f}".format(
+                name, row["wins"], row["draws"], row["losses"], row["points"],
+                ratings[name], width=width))
+        return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play games between players.")
+    parser.add_argument("players", nargs="+", type=parse_player,
+                        help="players in the form name=Class:key=value,... "
+                             "such as ab3=AlphaBeta:depth=3")
+    parser.add_argument("--gauntlet", action="store_true",
+                        help="play the first player against each of the others")
+    parser.add_argument("--games", type=int, default=2,
+                        help="games per pair of players, an even number")
+    parser.add_argument("--max-turns", type=int, default=200)
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--time-limit", type=float, default=None)
+    parser.add_argument("--node-limit", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cache-mb", type=float, default=cache.DEFAULT_SIZE_MB,
+                        help="size of the position cache of each process, 0 for none")
+    args = parser.parse_args(argv)
+    cache.set_size(args.cache_mb)
+
+    tournament = Tournament(args.players, GAUNTLET if args.gauntlet else ROUND_ROBIN,
+                            games_per_pair=args.games, max_turns=args.max_turns,
+                            processes=args.processes, time_limit=args.time_limit,
+                            node_limit=args.node_limit, seed=args.seed)
+    total = len(tournament.game_specs())
+    for count, result in enumerate(tournament.run(), 1):
+        print("game {}/{}: {} vs {}, {} first: {} after {} turns ({})".format(
+            count, total, result["player1"], result["player2"],
+            result["player{}".format(result["first_move"])],
+            result["winner"] or "draw", result["turns"], result["status"]))
+    print()
+    print(tournament.format_standings())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+from array import array
+
+from chess.moves import NO_MOVE
+
+# bound types of a stored score
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+
+# bytes used by one entry: an 8 byte key, 4 byte score, 1 byte depth,
+# 1 byte bound type and a 2 byte move packed as in chess.moves
+ENTRY_SIZE = 16
+
+
+class TranspositionTable(object):
+    """
+    Fixed size table of search results indexed by Zobrist key. When two
+    positions share a slot, the result searched to the greater depth is kept.
+    :param size_mb: approximate memory used by the table in megabytes
+    """
+    def __init__(self, size_mb=16):
+        assert size_mb > 0, "size_mb must be positive, not {}".format(size_mb)
+        self._size = max(1, int(size_mb * 1024 * 1024) // ENTRY_SIZE)
+        self._keys = array("Q", [0]) * self._size
+        self._scores = array("i", [0]) * self._size
+        self._depths = array("b", [-1]) * self._size
+        self._flags = array("B", [EXACT]) * self._size
+        self._moves = array("H", [NO_MOVE]) * self._size
+
+        self.hits = 0
+        self.misses = 0
+        self.overwrites = 0
+
+    def __len__(self):
+        """Returns the number of slots in the table."""
+        return self._size
+
+    def __repr__(self):
+        return "{}(size_mb={})".format(self.__class__.__name__,
+                                       self._size * ENTRY_SIZE / (1024 * 1024))
+
+    def probe(self, key):
+        """
+        Looks up the stored result for a position.
+        :param key: Zobrist key of the position
+        :return: tuple (score, depth, bound type, best move) or None
+        """
+        index = key % self._size
+        if self._depths[index] >= 0 and self._keys[index] == key:
+            self.hits += 1
+            move = self._moves[index]
+            return (self._scores[index], self._depths[index],
+                    self._flags[index], None if move == NO_MOVE else move)
+        self.misses += 1
+        return None
+
+    def store(self, key, depth, score, flag, move):
+        """
+        Stores a search result unless its slot holds a different position
+        that was searched deeper.
+        :param key: Zobrist key of the position
+        :param depth: int depth the position was searched to
+        :param score: int score of the position
+        :param flag: EXACT, LOWER_BOUND or UPPER_BOUND
+        :param move: best move found as an int from chess.moves, or None
+        """
+        index = key % self._size
+        old_depth = self._depths[index]
+        if old_depth >= 0 and self._keys[index] != key:
+            if depth < old_depth:
+                return
+            self.overwrites += 1
+
+        self._keys[index] = key
+        self._scores[index] = score
+        self._depths[index] = depth
+        self._flags[index] = flag
+        self._moves[index] = NO_MOVE if move is None else move
+
+    def clear(self):
+        """Empties the table and resets its statistics."""
+        self._depths = array("b", [-1]) * self._size
+        self._moves = array("H", [NO_MOVE]) * self._size
+        self.hits = 0
+        self.misses = 0
+        self.overwrites = 0
+
+    def stats(self):
+        """
+        Returns a dict of usage counts for sizing the table.
+        :return: dict with 'size', 'used', 'hits', 'misses', 'overwrites'
+                 and 'hit rate'
+        """
+        probes = self.hits + self.misses
+        return {"size": self._size,
+                "used": self._size - self._depths.count(-1),
+                "hits": self.hits,
+                "misses": self.misses,
+                "overwrites": self.overwrites,
+                "hit rate": self.hits / probes if probes else 0.0}
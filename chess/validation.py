@@ -0,0 +1,69 @@
+"""
+How much checking boards do on moves made during play and search.
+
+Boards made from a code passed in by a user are always checked in full.
+Boards made by do_move come from a board that was already checked and a
+move that came from calc_possible_moves, so with a lower level they can skip
+re-checking the move and the new board:
+
+    FULL     check every move and every new board
+    SAMPLED  check 1 in sample_rate of them
+    OFF      trust them all
+
+The level is set for the whole process with set_level, or starts from the
+CHESS_VALIDATION environment variable so worker processes can be set up the
+same way. A board given its own level passes it on to the boards made from it.
+"""
+import itertools
+import os
+
+FULL = "full"
+SAMPLED = "sampled"
+OFF = "off"
+LEVELS = (FULL, SAMPLED, OFF)
+
+DEFAULT_SAMPLE_RATE = 100
+
+_settings = {"level": os.environ.get("CHESS_VALIDATION", FULL),
+             "sample_rate": DEFAULT_SAMPLE_RATE}
+assert _settings["level"] in LEVELS, \
+    "CHESS_VALIDATION is {} but must be in {}".format(_settings["level"], LEVELS)
+
+# counts checks asked for at the sampled level
+_counter = itertools.count()
+
+
+def set_level(level, sample_rate=None):
+    """
+    Sets the validation level for every board without a level of its own.
+    :param level: FULL, SAMPLED or OFF
+    :param sample_rate: with SAMPLED, checks 1 in this many moves
+    """
+    assert level in LEVELS, "level is {} but must be in {}".format(level, LEVELS)
+    if sample_rate is not None:
+        assert sample_rate >= 1, "sample rate must be at least 1, not {}".format(sample_rate)
+        _settings["sample_rate"] = sample_rate
+    _settings["level"] = level
+
+
+def get_level():
+    """
+    Gets the validation level of this process.
+    :return: FULL, SAMPLED or OFF
+    """
+    return _settings["level"]
+
+
+def should_check(level=None):
+    """
+    Decides whether the next move or board should be checked.
+    :param level: a board's own level, or None to use the process level
+    :return: Boolean
+    """
+    if level is None:
+        level = _settings["level"]
+    if level == FULL:
+        return True
+    elif level == OFF:
+        return False
+    return next(_counter) % _settings["sample_rate"] == 0
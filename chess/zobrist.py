@@ -0,0 +1,48 @@
+import random
+
+from chess.pieces import P2_CHAR
+
+# a fixed seed keeps keys identical between runs and between processes, so
+# keys can be shared with worker processes or saved to disk
+_rng = random.Random(2017)
+
+# PIECE_KEYS[char][row * 8 + col] is xored in for each piece on the board
+PIECE_KEYS = {}
+for _char in "pnbrqkPNBRQK":
+    PIECE_KEYS[_char] = [_rng.getrandbits(64) for _ in range(64)]
+
+# xored in when it is player 2's turn
+TURN_KEY = _rng.getrandbits(64)
+
+
+def board_key(board_code):
+    """
+    Computes the Zobrist key of a board from scratch.
+    :param board_code: string in the form used by ChessBoard
+    :return: int between 0 and 2 ** 64 - 1
+    """
+    key = 0
+    if board_code[0] == P2_CHAR:
+        key = TURN_KEY
+    squares = "".join(board_code[2:].split())
+    for sq, char in enumerate(squares):
+        if char != ".":
+            key ^= PIECE_KEYS[char][sq]
+    return key
+
+
+def move_key(frm, to, moved, captured, placed):
+    """
+    Computes the value to xor into a key when a move is made or unmade.
+    :param frm: int square index the piece moved from
+    :param to: int square index the piece moved to
+    :param moved: character of the piece that moved
+    :param captured: character of the piece that was on the to square or "."
+    :param placed: character of the piece that ends up on the to square,
+           which differs from moved when a pawn is upgraded
+    :return: int
+    """
+    key = TURN_KEY ^ PIECE_KEYS[moved][frm] ^ PIECE_KEYS[placed][to]
+    if captured != ".":
+        key ^= PIECE_KEYS[captured][to]
+    return key
@@ -0,0 +1,102 @@
+import random
+import unittest
+
+# required to make imports work
+import sys
+sys.path.append("../")
+
+from chess import batch
+from chess.board import ChessBoard
+from chess.position import Position
+
+DEFAULT_CODE = "1 rnbkqbnr pppppppp ........ ........ ........ ........ PPPPPPPP RNBKQBNR"
+CODES = [DEFAULT_CODE,
+         "2 r.bk.bnr ppp..ppp ..n.q... ...pp... ...PP... ..N..N.. PPP..PPP R.BKQB.R",
+         # checkmate with either player to move
+         "1 k....... .Q...... .R...... ........ ........ ........ ........ .......K",
+         "2 K....... .q...... .r...... ........ ........ ........ ........ .......k",
+         # stalemate with player 1 behind, then ahead
+         "1 k....... .R...... .R...... ........ ........ ........ ........ .......K",
+         "2 K....... .r...... .r...... ........ ........ ........ ........ .......k"]
+
+
+def random_boards(count, seed=0):
+    rng = random.Random(seed)
+    boards = []
+    for _ in range(count):
+        board = ChessBoard(DEFAULT_CODE)
+        for _ in range(rng.randint(0, 80)):
+            possible_moves = board.calc_possible_moves()
+            if not possible_moves:
+                break
+            board = board.do_move(rng.choice(possible_moves))
+        boards.append(board)
+    return boards
+
+
+@unittest.skipUnless(batch.AVAILABLE, "NumPy is not installed")
+class TestPack(unittest.TestCase):
+    def test_codes(self):
+        packed = batch.pack([DEFAULT_CODE])
+        self.assertEqual((1, 64), packed.shape)
+        self.assertEqual("int8", str(packed.dtype))
+        self.assertEqual([4, 2, 3, 6, 5, 3, 2, 4], list(packed[0, :8]))
+        self.assertEqual([-1] * 8, list(packed[0, 48:56]))
+        self.assertEqual(0, packed[0, 32])
+
+    def test_material(self):
+        boards = random_boards(10)
+        expected = [board.material[0] - board.material[1] for board in boards]
+        self.assertEqual(expected, list(batch.material(batch.pack(boards))))
+
+
+class TestEvaluate(unittest.TestCase):
+    def test_matches_evaluate(self):
+        boards = random_boards(20) + [ChessBoard(code) for code in CODES]
+        self.assertEqual([board.evaluate() for board in boards], list(batch.evaluate(boards)))
+
+    def test_matches_static_evaluate(self):
+        boards = random_boards(20, seed=1) + [ChessBoard(code) for code in CODES]
+        self.assertEqual([board.static_evaluate() for board in boards],
+                         list(batch.static_evaluate(boards)))
+
+    def test_codes(self):
+        expected = [ChessBoard(code).evaluate() for code in CODES]
+        self.assertEqual(expected, list(batch.evaluate(CODES)))
+        expected = [ChessBoard(code).static_evaluate() for code in CODES]
+        self.assertEqual(expected, list(batch.static_evaluate(CODES)))
+
+    def test_terminal_scores(self):
+        self.assertEqual([-1000, -1000, 1000, 1000], list(batch.evaluate(CODES[2:])))
+
+    def test_evaluate_moves(self):
+        for code in CODES[:2] + ["1 .......k P....... ...K.... ........ ........ ........ .......p ........"]:
+            position = Position(code)
+            move_list = position.calc_move_list()
+            expected = []
+            for move in move_list:
+                position.make_move(move)
+                expected.append(position.evaluate())
+                position.unmake_move()
+            self.assertEqual(expected, list(batch.evaluate_moves(position, move_list)))
+            self.assertEqual(code, repr(position))
+
+
+class TestWithoutNumPy(unittest.TestCase):
+    def setUp(self):
+        self.available = batch.AVAILABLE
+        batch.AVAILABLE = False
+
+    def tearDown(self):
+        batch.AVAILABLE = self.available
+
+    def test_scalar_scores(self):
+        self.assertEqual([ChessBoard(code).evaluate() for code in CODES], batch.evaluate(CODES))
+        self.assertEqual([ChessBoard(code).static_evaluate() for code in CODES],
+                         batch.static_evaluate(CODES))
+        position = Position(CODES[1])
+        self.assertEqual(len(position.calc_move_list()),
+                         len(batch.evaluate_moves(position, position.calc_move_list(), True)))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+import random
+import unittest
+
+# required to make imports work
+import sys
+sys.path.append("../")
+
+from chess.board import ChessBoard
+from chess.bitboard import BitBoard
+from chess import moves
+from chess.position import Position
+import chess.player as player
+
+DEFAULT_CODE = "1 rnbkqbnr pppppppp ........ ........ ........ ........ PPPPPPPP RNBKQBNR"
+
+POSITIONS = [
+    DEFAULT_CODE,
+    "2 rnbkqbnr pppppppp ........ ........ ........ ........ PPPPPPPP RNBKQBNR",
+    "1 k....... b.P..... RP.K.... ........ ........ ........ ........ ........",
+    "1 k....... .R...... ..B..... ........ ........ ........ ........ ...K....",
+    "1 k....... .Q...... ........ ........ r....... ........ ........ ...K....",
+    "2 K....... .q...... ..b..... ........ ........ ........ ........ ...k....",
+    "1 .......k P....... ...K.... ........ ........ ........ .......p ........",
+    "1 k....... .Q...r.. .R...... ........ ........ ........ ........ .......K",
+    "1 r.bk.bnr ppp..ppp ..n.q... ...pp... ...PP... ..N..N.. PPP..PPP R.BKQB.R",
+]
+
+
+class TestMatchesChessBoard(unittest.TestCase):
+    def assert_same(self, code):
+        board = ChessBoard(code)
+        bitboard = BitBoard(code)
+        self.assertEqual(repr(board), repr(bitboard))
+        self.assertEqual(sorted(board.calc_possible_moves()),
+                         sorted(bitboard.calc_possible_moves()))
+        self.assertEqual(board.evaluate(), bitboard.evaluate())
+        self.assertEqual(board.has_no_moves(), bitboard.has_no_moves())
+        self.assertEqual(board.get_pieces(), bitboard.get_pieces())
+        for flip_player in (False, True):
+            self.assertEqual(board.is_attacking_king(flip_player),
+                             bitboard.is_attacking_king(flip_player))
+        for row in range(8):
+            for col in range(8):
+                for static_player in (False, True):
+                    self.assertEqual(
+                        board.is_square_attacked(row, col, static_player),
+                        bitboard.is_square_attacked(row, col, static_player),
+                        "{} {} {}".format(code, row, col))
+
+    def test_positions(self):
+        for code in POSITIONS:
+            self.assert_same(code)
+
+    def test_do_move(self):
+        for code in POSITIONS:
+            board = ChessBoard(code)
+            bitboard = BitBoard(code)
+            for move in board.calc_possible_moves():
+                self.assertEqual(repr(board.do_move(move)),
+                                 repr(bitboard.do_move(move)))
+
+    def test_random_games(self):
+        rng = random.Random(0)
+        for _ in range(4):
+            board = ChessBoard(DEFAULT_CODE)
+            bitboard = BitBoard(DEFAULT_CODE)
+            for _ in range(40):
+                self.assert_same(repr(board))
+                moves = board.calc_possible_moves()
+                if not moves:
+                    break
+                move = rng.choice(moves)
+                board = board.do_move(move)
+                bitboard = bitboard.do_move(move)
+
+
+class TestBitBoard(unittest.TestCase):
+    def test_upgrading_pawn(self):
+        board = BitBoard("1 .......k P....... ...K.... ........ ........ ........ .......p ........")
+        board2 = board.do_move("h7 h8")
+        self.assertEqual(board2.get_square(7, 7), "q")
+        board3 = board2.do_move("a2 a1")
+        self.assertEqual(board3.get_square(0, 0), "Q")
+        self.assertEqual(board3.get_pieces(), {"k": 1, "q": 1, "K": 1, "Q": 1})
+
+    def test_moving_out_of_turn(self):
+        board = BitBoard("2 q.p....k .P...... .R.K.... .......Q ........ ........ ........ ........")
+        with self.assertRaises(AssertionError):
+            board.do_move("a1 b2")
+
+    def test_bad_square(self):
+        with self.assertRaises(AssertionError):
+            BitBoard("1 xnbkqbnr pppppppp ........ ........ ........ ........ PPPPPPPP RNBKQBNR")
+        with self.assertRaises(AssertionError):
+            Position("1 1nbkqbnr pppppppp ........ ........ ........ ........ PPPPPPPP RNBKQBNR")
+
+    def test_do_move_leaves_board_unchanged(self):
+        board = BitBoard(DEFAULT_CODE)
+        board.do_move("b2 b4")
+        self.assertEqual(DEFAULT_CODE, repr(board))
+
+    def test_equality(self):
+        self.assertEqual(BitBoard(DEFAULT_CODE), ChessBoard(DEFAULT_CODE))
+
+    def test_capture_list(self):
+        rng = random.Random(2)
+        for code in POSITIONS:
+            board = Position(code)
+            for _ in range(40):
+                move_list = board.calc_move_list()
+                if not move_list:
+                    break
+                expected = [move for move in move_list
+                            if board.get_square(moves.to_square(move) >> 3,
+                                                moves.to_square(move) & 7) != "."
+                            or move >> moves.PROMOTION_SHIFT]
+                self.assertEqual(expected, list(board.calc_capture_list()))
+                board.make_move(rng.choice(move_list))
+
+    def test_minimax_checkmate(self):
+        board = BitBoard(
+            "1 k....... ........ r......Q ........ ........ ........ .....PPP B.....K.")
+        self.assertEqual("a3 a8", player.BasicMinimax().choose_move(board, depth=3))
+
+if __name__ == "__main__":
+    unittest.main()
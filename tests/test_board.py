@@ -1,10 +1,11 @@
 import unittest
+from unittest import mock
 
 # required to make imports work
 import sys
 sys.path.append("../")
 
-from chess.board import ChessBoard
+from chess.board import ChessBoard, calc_material, ONGOING, CHECKMATE, STALEMATE
 
 
 class TestIsSquareAttacked(unittest.TestCase):
@@ -86,6 +87,37 @@ class TestIsSquareAttacked(unittest.TestCase):
         # add tests for computer's turn
 
 
+class TestAttackedSquares(unittest.TestCase):
+    def test_rook_stops_at_pieces(self):
+        inpt_str = "1 k....... ........ R.p..... ........ ........ ........ ........ .......K"
+        board = ChessBoard(inpt_str)
+        attacked = board.attacked_squares("2")
+        self.assertIn((2, 2), attacked)
+        self.assertNotIn((2, 3), attacked)
+        self.assertIn((7, 0), attacked)
+
+    def test_pawns_only_attack_diagonals(self):
+        inpt_str = "1 k....... ...p.... ........ ........ ........ ........ ........ .......K"
+        board = ChessBoard(inpt_str)
+        self.assertEqual({(0, 1), (1, 0), (1, 1), (2, 2), (2, 4)},
+                         set(board.attacked_squares("1")))
+
+    def test_matches_is_square_attacked(self):
+        inpt_str = "2 r.bk.bnr ppp..ppp ..n.q... ...pp... ...PP... ..N..N.. PPP..PPP R.BKQB.R"
+        board = ChessBoard(inpt_str)
+        attacked = board.attacked_squares("1")
+        for r in range(8):
+            for c in range(8):
+                self.assertEqual((r, c) in attacked,
+                                 board.is_square_attacked(r, c, static_player=True))
+
+    def test_check(self):
+        inpt_str = "2 k....... .Q...r.. .R...... ........ ........ ........ ........ .......K"
+        board = ChessBoard(inpt_str)
+        self.assertFalse(board.is_attacking_king(flip_player=True))
+        self.assertTrue(board.is_attacking_king())
+
+
 class TestCalcPossibleMoves(unittest.TestCase):
     def test_filtering_moves_that_threaten_king(self):
         inpt_str = "1 k....... b.P..... RP.K.... ........ ........ ........ ........ ........"
@@ -124,6 +156,29 @@ class TestCalcPossibleMoves(unittest.TestCase):
         self.assertEqual(board.calc_possible_moves(), expected)
 
 
+class TestLegalMoves(unittest.TestCase):
+    def test_pinned_pawn_can_only_take_pinner(self):
+        board = ChessBoard("1 k....... .p...... ..B..... ........ ........ ........ ........ .......K")
+        self.assertEqual(["a1 b1", "a1 a2", "b2 c3"], board.calc_possible_moves())
+
+    def test_pinned_rook_stays_on_line(self):
+        board = ChessBoard("1 k....... ........ ...n.... ........ r....... ........ ........ Q......K")
+        moves = board.calc_possible_moves()
+        self.assertEqual(["a5 a8", "a5 a3", "a5 a4", "a5 a6", "a5 a7", "a5 a2"], moves[-6:])
+
+    def test_block_check(self):
+        board = ChessBoard("1 .k...... ...r.... ........ ........ .Q...... ........ ........ .......K")
+        self.assertEqual(["b1 a2", "b1 c1", "b1 c2", "b1 a1", "d2 b2"], board.calc_possible_moves())
+
+    def test_double_check_only_king_moves(self):
+        board = ChessBoard("1 ...k.... ........ ...QN... ........ .r...... ........ ........ .......K")
+        self.assertEqual(["d1 c1", "d1 e1"], board.calc_possible_moves())
+
+    def test_king_cannot_retreat_along_check(self):
+        board = ChessBoard("1 k....... ........ ........ ........ ........ ........ ........ R......K")
+        self.assertEqual(["a1 b1", "a1 b2"], board.calc_possible_moves())
+
+
 class TestIsEnemy(unittest.TestCase):
     def test_player_turn(self):
         inpt_str = "1 k....... .p...... ...K.... .......Q ........ ........ ........ ........"
@@ -266,6 +321,63 @@ class TestEvaluate(unittest.TestCase):
         self.assertEqual(board2.evaluate(), 0)
 
 
+class TestMaterial(unittest.TestCase):
+    def test_starting_material(self):
+        board = ChessBoard("1 rnbkqbnr pppppppp ........ ........ ........ ........ PPPPPPPP RNBKQBNR")
+        self.assertEqual((39, 39), board.material)
+
+    def test_capture_updates_material(self):
+        board = ChessBoard("1 k....... .P...... ...K.... .......Q ........ ........ ........ ........")
+        self.assertEqual((0, 10), board.material)
+        self.assertEqual((0, 9), board.do_move("a1 b2").material)
+
+    def test_upgrade_updates_material(self):
+        board = ChessBoard("1 .......k P....... ...K.... ........ ........ ........ .......p ........")
+        board2 = board.do_move("h7 h8")
+        self.assertEqual((9, 1), board2.material)
+        self.assertEqual((9, 9), board2.do_move("a2 a1").material)
+
+    def test_matches_recount(self):
+        board = ChessBoard("1 r.bk.bnr ppp..ppp ..n.q... ...pp... ...PP... ..N..N.. PPP..PPP R.BKQB.R")
+        for move in board.calc_possible_moves():
+            new_board = board.do_move(move)
+            self.assertEqual(calc_material(repr(new_board)), new_board.material)
+
+
+class TestGameStatus(unittest.TestCase):
+    def test_checkmate(self):
+        board = ChessBoard("1 k....... .Q...... .R...... ........ ........ ........ ........ .......K")
+        self.assertEqual(CHECKMATE, board.game_status)
+
+    def test_stalemate(self):
+        board = ChessBoard("1 k....... .R...... .R...... ........ ........ ........ ........ .......K")
+        self.assertEqual(STALEMATE, board.game_status)
+
+    def test_ongoing_in_check(self):
+        board = ChessBoard("1 k....... .Q...... ........ ........ ........ ........ ........ .......K")
+        self.assertEqual(ONGOING, board.game_status)
+
+    def test_status_cached(self):
+        board = ChessBoard("1 k....... .Q...... .R...... ........ ........ ........ ........ .......K")
+        self.assertEqual(CHECKMATE, board.game_status)
+        with mock.patch.object(ChessBoard, "_legal_moves", side_effect=AssertionError):
+            self.assertEqual(CHECKMATE, board.game_status)
+            self.assertEqual(-1000, board.evaluate())
+
+    def test_possible_moves_sets_status(self):
+        board = ChessBoard("1 k....... ........ r....... R....... ........ ........ ........ .......K")
+        board.calc_possible_moves()
+        with mock.patch.object(ChessBoard, "_legal_moves", side_effect=AssertionError):
+            self.assertEqual(ONGOING, board.game_status)
+
+    def test_static_evaluate(self):
+        board = ChessBoard("2 k....... .Q...... .R...... ........ ........ ........ ........ .......K")
+        self.assertEqual(14, board.static_evaluate())
+        board = ChessBoard("1 k....... .R...... .R...... ........ ........ ........ ........ .......K")
+        self.assertEqual(-10, board.static_evaluate())
+        self.assertEqual(1000, board.evaluate())
+
+
 class TestHasNoMoves(unittest.TestCase):
     def test_player1_checkmated(self):
         inpt_str = "1 k....... .Q...... .R...... ........ ........ ........ ........ .......K"
@@ -293,6 +405,45 @@ class TestHasNoMoves(unittest.TestCase):
         self.assertFalse(board.has_no_moves())
 
 
+class TestMemoized(unittest.TestCase):
+    def test_moves_generated_once(self):
+        board = ChessBoard("1 k....... ........ r....... R....... ........ ........ ........ .......K")
+        moves = board.calc_possible_moves()
+        with mock.patch.object(ChessBoard, "_legal_moves", side_effect=AssertionError):
+            self.assertEqual(moves, board.calc_possible_moves())
+            self.assertFalse(board.has_no_moves())
+
+    def test_results_are_copies(self):
+        board = ChessBoard("1 k....... ........ r....... R....... ........ ........ ........ .......K")
+        board.calc_possible_moves().clear()
+        board.get_pieces(1).clear()
+        self.assertEqual(["a1 b1", "a1 a2", "a1 b2", "a3 a4", "a3 a2"],
+                         board.calc_possible_moves())
+        self.assertEqual({"k": 1, "r": 1}, board.get_pieces(1))
+        self.assertEqual({"k": 1, "r": 1, "K": 1, "R": 1}, board.get_pieces())
+
+    def test_king_attacked_by_flip(self):
+        board = ChessBoard("1 k....... .Q...... ........ ........ ........ ........ ........ .......K")
+        self.assertTrue(board.is_attacking_king(flip_player=True))
+        self.assertFalse(board.is_attacking_king())
+        self.assertTrue(board.is_attacking_king(flip_player=True))
+
+    def test_no_instance_dict(self):
+        board = ChessBoard("1 k....... ........ ........ ........ ........ ........ ........ .......K")
+        self.assertFalse(hasattr(board, "__dict__"))
+        self.assertEqual(2, board.get_piece_count("1") + board.get_piece_count("2"))
+
+    def test_caches_created_on_first_use(self):
+        board = ChessBoard("1 k....... ........ ........ ........ ........ ........ ........ .......K")
+        child = board.do_move("a1 a2")
+        self.assertIsNone(child._attack_maps)
+        self.assertIsNone(child._king_attacked)
+        self.assertIsNone(child._pieces)
+        self.assertFalse(child.is_attacking_king())
+        self.assertEqual({"k": 1}, child.get_pieces(1))
+        self.assertEqual([False, None], child._king_attacked)
+
+
 class TestGetPossibleBoards(unittest.TestCase):
     def test_player1_board(self):
         board = ChessBoard("1 k....... ........ ........ ........ ........ ........ ........ .......K")
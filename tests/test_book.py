@@ -0,0 +1,128 @@
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+# required to make imports work
+import sys
+sys.path.append("../")
+
+from chess import book
+from chess.board import ChessBoard, CHECKMATE, STALEMATE
+from chess.game import ChessGame
+from chess.pieces import P1_CHAR
+import chess.player as player
+
+DEFAULT_CODE = "1 rnbkqbnr pppppppp ........ ........ ........ ........ PPPPPPPP RNBKQBNR"
+
+
+class TestOpeningBook(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "book.bin")
+
+    def tearDown(self):
+        opened = book._books.pop(self.path, None)
+        if opened is not None:
+            opened.close()
+        shutil.rmtree(self.directory)
+
+    def write_book(self, *games):
+        builder = book.BookBuilder(max_ply=2)
+        for moves, winner in games:
+            builder.add_game(DEFAULT_CODE, moves, winner)
+        builder.write(self.path)
+        return book.OpeningBook(self.path)
+
+    def test_weights(self):
+        opening_book = self.write_book((["b2 b3", "g7 g6", "c2 c3"], P1_CHAR),
+                                       (["b2 b3", "g7 g5"], None),
+                                       (["a2 a3", "g7 g5"], None))
+        # moves that only lost are left out
+        self.assertEqual(4, len(opening_book))
+        board = ChessBoard(DEFAULT_CODE)
+        self.assertEqual([("a2 a3", 1), ("b2 b3", 3)], sorted(opening_book.moves(board)))
+        board = board.do_move("b2 b3")
+        self.assertEqual([("g7 g5", 1)], opening_book.moves(board))
+        opening_book.close()
+
+    def test_records_sorted(self):
+        builder = book.BookBuilder(max_ply=6)
+        rng = random.Random(3)
+        for _ in range(20):
+            board = ChessBoard(DEFAULT_CODE)
+            moves = []
+            for _ in range(6):
+                moves.append(rng.choice(board.calc_possible_moves()))
+                board = board.do_move(moves[-1])
+            builder.add_game(DEFAULT_CODE, moves)
+        count = builder.write(self.path)
+
+        opening_book = book.OpeningBook(self.path)
+        self.assertEqual(count, len(opening_book))
+        keys = [opening_book._keys[index] for index in range(len(opening_book))]
+        self.assertEqual(sorted(keys), keys)
+        for key in set(keys):
+            self.assertEqual(keys.count(key), len(opening_book.entries(key)))
+        opening_book.close()
+
+    def test_position_not_in_book(self):
+        opening_book = self.write_book((["b2 b3"], None))
+        board = ChessBoard(DEFAULT_CODE).do_move("a2 a3")
+        self.assertEqual([], opening_book.entries(board.zobrist_key))
+        self.assertIsNone(opening_book.choose_move(board))
+        opening_book.close()
+
+    def test_choose_move(self):
+        opening_book = self.write_book((["b2 b3"], None), (["b2 b3"], None), (["a2 a3"], None))
+        rng = random.Random(0)
+        board = ChessBoard(DEFAULT_CODE)
+        chosen = [opening_book.choose_move(board, rng) for _ in range(300)]
+        self.assertEqual({"a2 a3", "b2 b3"}, set(chosen))
+        self.assertGreater(chosen.count("b2 b3"), chosen.count("a2 a3"))
+        opening_book.close()
+
+    def test_not_a_book(self):
+        with open(self.path, "wb") as book_file:
+            book_file.write(b"not a book file")
+        with self.assertRaises(AssertionError):
+            book.OpeningBook(self.path)
+
+    def test_add_result(self):
+        p1 = player.RandomComputer()
+        p2 = player.RandomComputer()
+        random.seed(4)
+        result = ChessGame(p1, p2, verbosity=0, first_move=1, max_turns=6).play()
+        self.assertEqual(DEFAULT_CODE, result["start board"])
+        self.assertEqual(6, len(result["moves"]))
+
+        builder = book.BookBuilder(max_ply=4)
+        builder.add_result(result)
+        self.assertEqual((1, 4), (builder.games, len(builder)))
+
+    def test_add_checkmate_result(self):
+        code = "1 ........ ........ ........ ........ ........ ...r.... .......r .K.....k"
+        board = ChessBoard(code).do_move("d6 d8")
+        self.assertEqual(CHECKMATE, board.game_status)
+        builder = book.BookBuilder()
+        builder.add_result({"start board": code, "moves": ["d6 d8"], "status": CHECKMATE})
+        builder.add_result({"start board": code, "moves": ["h7 g7"], "status": STALEMATE})
+        builder.write(self.path)
+        opening_book = book.OpeningBook(self.path)
+        self.assertEqual([("d6 d8", 2), ("h7 g7", 1)],
+                         sorted(opening_book.moves(ChessBoard(code))))
+        opening_book.close()
+
+    def test_player_uses_book(self):
+        self.write_book((["h2 h3"], None)).close()
+        board = ChessBoard(DEFAULT_CODE)
+        for ai in (player.BasicMinimax(depth=1, book=self.path),
+                   player.AlphaBeta(depth=1, book=self.path),
+                   player.IterativeDeepening(node_limit=100, book=self.path)):
+            self.assertEqual("h2 h3", ai.choose_move(board))
+        self.assertIs(book.open_book(self.path), book.open_book(self.path))
+        # out of the book the player searches as usual
+        board = board.do_move("a2 a3")
+        self.assertIn(player.AlphaBeta(depth=1, book=self.path).choose_move(board),
+                      board.calc_possible_moves())
@@ -0,0 +1,91 @@
+import unittest
+from array import array
+from unittest import mock
+
+# required to make imports work
+import sys
+sys.path.append("../")
+
+from chess import cache
+from chess.board import ChessBoard, CHECKMATE
+from chess.bitboard import BitBoard
+from chess.position import Position
+
+DEFAULT_CODE = "1 rnbkqbnr pppppppp ........ ........ ........ ........ PPPPPPPP RNBKQBNR"
+
+
+class TestPositionCache(unittest.TestCase):
+    def test_get_and_put(self):
+        position_cache = cache.PositionCache(1)
+        self.assertIsNone(position_cache.get(5, cache.STATUS))
+        position_cache.put(5, cache.STATUS, CHECKMATE)
+        self.assertEqual(CHECKMATE, position_cache.get(5, cache.STATUS))
+        self.assertIsNone(position_cache.get(5, cache.MOVES))
+        stats = position_cache.stats()
+        self.assertEqual((1, 1, 2), (stats["entries"], stats["hits"], stats["misses"]))
+
+    def test_least_recently_used_evicted(self):
+        position_cache = cache.PositionCache(3 * cache.ENTRY_OVERHEAD / (1024 * 1024))
+        for key in range(3):
+            position_cache.put(key, cache.STATUS, CHECKMATE)
+        position_cache.get(0, cache.STATUS)
+        position_cache.put(3, cache.STATUS, CHECKMATE)
+        self.assertEqual(3, len(position_cache))
+        self.assertNotIn(1, position_cache)
+        self.assertIn(0, position_cache)
+        self.assertEqual(1, position_cache.stats()["evictions"])
+
+    def test_memory_cap(self):
+        position_cache = cache.PositionCache(0.01)
+        for key in range(1000):
+            position_cache.put(key, cache.MOVE_LIST, array("H", range(30)))
+        stats = position_cache.stats()
+        self.assertLessEqual(stats["bytes"], stats["max bytes"])
+        self.assertEqual(1000, stats["entries"] + stats["evictions"])
+
+    def test_clear(self):
+        position_cache = cache.PositionCache(1)
+        position_cache.put(1, cache.MOVES, ("a1 a2",))
+        position_cache.clear()
+        self.assertEqual(0, len(position_cache))
+        self.assertEqual(0, position_cache.stats()["bytes"])
+
+
+class TestProcessCache(unittest.TestCase):
+    def setUp(self):
+        cache.set_size(1)
+
+    def tearDown(self):
+        cache.set_size(0)
+
+    def test_clear(self):
+        ChessBoard(DEFAULT_CODE).calc_possible_moves()
+        cache.clear()
+        self.assertEqual(0, len(cache.get_cache()))
+
+    def test_turned_off(self):
+        cache.set_size(0)
+        self.assertIsNone(cache.get_cache())
+        self.assertIsNone(cache.stats())
+        self.assertEqual(20, len(ChessBoard(DEFAULT_CODE).calc_possible_moves()))
+
+    def test_moves_shared_between_boards(self):
+        moves = ChessBoard(DEFAULT_CODE).calc_possible_moves()
+        with mock.patch.object(ChessBoard, "_legal_moves", side_effect=AssertionError):
+            self.assertEqual(moves, ChessBoard(DEFAULT_CODE).calc_possible_moves())
+        self.assertEqual(1, cache.stats()["hits"])
+
+    def test_status_shared_between_boards(self):
+        code = "1 k....... .Q...... .R...... ........ ........ ........ ........ .......K"
+        self.assertEqual(CHECKMATE, BitBoard(code).game_status)
+        with mock.patch.object(ChessBoard, "_legal_moves", side_effect=AssertionError):
+            self.assertEqual(-1000, ChessBoard(code).evaluate())
+
+    def test_move_lists_are_copies(self):
+        position = Position(DEFAULT_CODE)
+        position.calc_move_list().pop()
+        self.assertEqual(20, len(position.calc_move_list()))
+        position.make_move("a2 a3")
+        position.unmake_move()
+        self.assertEqual(20, len(position.calc_move_list()))
+        self.assertEqual(2, cache.stats()["hits"])
@@ -2,7 +2,8 @@ import unittest
 import sys
 
 sys.path.append("../")
-from chess.game import ChessGame
+from chess.board import ChessBoard, CHECKMATE, STALEMATE
+from chess.game import ChessGame, DEFAULT_BOARD, MAX_TURNS, GAME_START, MOVE, GAME_END
 import chess.player as player
 
 
@@ -39,6 +40,98 @@ class TestGame(unittest.TestCase):
         game = ChessGame(p1, p2, first_move=1, board=board_str, verbosity=0)
         result = game.play()
         self.assertEqual(None, result["winner"])
+        self.assertEqual(STALEMATE, result["status"])
+
+    def test_max_turns(self):
+        p1 = player.RandomComputer()
+        p2 = player.RandomComputer()
+        game = ChessGame(p1, p2, first_move=1, verbosity=0, max_turns=6)
+        result = game.play()
+        self.assertEqual(None, result["winner"])
+        self.assertEqual(MAX_TURNS, result["status"])
+        self.assertEqual(7, result["turns"])
+        self.assertEqual("1", result["final board"].get_player_turn())
+
+
+class BudgetRecorder(player.RandomComputer):
+    """Random player that records the budgets it is given."""
+    supports_budget = True
+
+    def __init__(self):
+        self.budgets = []
+
+    def choose_move(self, board, time_limit=None, node_limit=None):
+        self.budgets.append((time_limit, node_limit))
+        return player.RandomComputer.choose_move(self, board)
+
+
+class FirstMove(object):
+    """Player that is not a Player subclass and always makes its first legal move."""
+    def choose_move(self, board):
+        return board.calc_possible_moves()[0]
+
+
+class TestBudget(unittest.TestCase):
+    def test_budget_passed_to_players(self):
+        board_str = "k....... ........ ........ ........ ........ ........ ........ Q......K"
+        p1 = BudgetRecorder()
+        p2 = player.RandomComputer()
+        game = ChessGame(p1, p2, first_move=1, board=board_str, verbosity=0,
+                         time_limit=0.5, node_limit=100)
+        game.choose_move(p1, game.board)
+        self.assertEqual([(0.5, 100)], p1.budgets)
+
+        # players without budget support are called as before
+        game = ChessGame(p2, p1, first_move=1, board=board_str, verbosity=0,
+                         time_limit=0.5)
+        self.assertIn(game.choose_move(p2, game.board), game.possible_moves)
+
+    def test_no_budget(self):
+        p1 = BudgetRecorder()
+        game = ChessGame(p1, player.RandomComputer(), first_move=1, verbosity=0)
+        game.choose_move(p1, game.board)
+        self.assertEqual([(None, None)], p1.budgets)
+
+    def test_duck_typed_player(self):
+        p1 = FirstMove()
+        game = ChessGame(p1, player.RandomComputer(), first_move=1, verbosity=0,
+                         time_limit=0.5, max_turns=2)
+        result = game.play()
+        first_move = ChessBoard("1 " + DEFAULT_BOARD).calc_possible_moves()[0]
+        self.assertEqual(first_move, result["moves"][0])
+
+
+class TestEvents(unittest.TestCase):
+    def test_checkmate_events(self):
+        board_str = "......r. ........ ........ ........ ........ k....... ........ K......."
+        p1 = player.AlphaBeta(depth=1)
+        p2 = player.RandomComputer()
+        game = ChessGame(p1, p2, first_move=1, board=board_str, verbosity=0)
+        events = list(game.events())
+        self.assertEqual([GAME_START, MOVE, GAME_END], [event["event"] for event in events])
+
+        start, move, end = events
+        self.assertEqual("1 " + board_str, start["start board"])
+        self.assertEqual(("AlphaBeta()", "RandomComputer()", 1),
+                         (start["player1"], start["player2"], start["first move"]))
+        self.assertEqual((1, 1, "AlphaBeta()"), (move["turn"], move["player"], move["mover"]))
+        self.assertTrue(move["check"])
+        self.assertGreaterEqual(move["seconds"], 0)
+        self.assertIsNone(move["stats"])
+        self.assertEqual(repr(ChessBoard("1 " + board_str).do_move(move["move"])), move["board"])
+        self.assertEqual((CHECKMATE, 1, 2), (end["status"], end["winner"], end["turns"]))
+        self.assertEqual(move["board"], end["final board"])
+
+    def test_play_observer(self):
+        events = []
+        game = ChessGame(player.RandomComputer(), player.RandomComputer(), first_move=2,
+                         verbosity=0, max_turns=4)
+        result = game.play(observer=events.append)
+        self.assertEqual(6, len(events))
+        self.assertEqual(result["moves"], [event["move"] for event in events[1:-1]])
+        self.assertEqual([2, 1, 2, 1], [event["player"] for event in events[1:-1]])
+        self.assertEqual((MAX_TURNS, None), (events[-1]["status"], events[-1]["winner"]))
+        self.assertEqual(repr(result["final board"]), events[-1]["final board"])
 
 
 class TestAttributes(unittest.TestCase):
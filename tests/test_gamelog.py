@@ -0,0 +1,94 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+# required to make imports work
+import sys
+sys.path.append("../")
+
+from chess.game import ChessGame, GAME_START, GAME_END
+from chess.gamelog import GameLogWriter, read_log
+import chess.player as player
+
+
+class TestGameLogWriter(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "games.jsonl")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_games_logged(self):
+        results = []
+        with GameLogWriter(self.path, buffer_size=7) as log:
+            for first_move in (1, 2):
+                game = ChessGame(player.RandomComputer(), player.AlphaBeta(depth=1),
+                                 first_move=first_move, verbosity=0, max_turns=10)
+                results.append(game.play(observer=log))
+        events = list(read_log(self.path))
+        self.assertEqual(2 * (10 + 2), len(events))
+        self.assertEqual(len(events), log.written)
+        for index, result in enumerate(results):
+            game_events = events[index * 12:(index + 1) * 12]
+            self.assertEqual(GAME_START, game_events[0]["event"])
+            self.assertEqual(GAME_END, game_events[-1]["event"])
+            self.assertEqual(result["moves"], [event["move"] for event in game_events[1:-1]])
+
+    def test_flush(self):
+        log = GameLogWriter(self.path, flush_interval=60)
+        log.write({"event": "note", "n": 1})
+        log.flush()
+        with open(self.path) as log_file:
+            self.assertEqual({"event": "note", "n": 1}, json.loads(log_file.read()))
+        log.close()
+        log.close()
+        with self.assertRaises(AssertionError):
+            log.write({"event": "note"})
+
+    def test_append(self):
+        with GameLogWriter(self.path) as log:
+            log.write({"n": 1})
+        with GameLogWriter(self.path) as log:
+            log.write({"n": 2})
+        self.assertEqual([{"n": 1}, {"n": 2}], list(read_log(self.path)))
+        with GameLogWriter(self.path, append=False) as log:
+            log.write({"n": 3})
+        self.assertEqual([{"n": 3}], list(read_log(self.path)))
+
+    def test_bad_event(self):
+        log = GameLogWriter(self.path)
+        log.write({"board": object()})
+        log.write({"n": 1})
+        with self.assertRaises(TypeError):
+            log.close()
+        self.assertEqual([{"n": 1}], list(read_log(self.path)))
+
+    def test_write_error(self):
+        log = GameLogWriter(self.path)
+        log._file.close()
+        log._file = FullFile()
+        log.write({"n": 1})
+        with self.assertRaises(OSError):
+            log.flush()
+        log.write({"n": 2})
+        with self.assertRaises(OSError):
+            log.close()
+
+
+class FullFile(object):
+    """File whose writes always fail, as on a full disk."""
+    def write(self, text):
+        raise OSError("No space left on device")
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+if __name__ == "__main__":
+    unittest.main()
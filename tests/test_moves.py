@@ -0,0 +1,66 @@
+import unittest
+
+# required to make imports work
+import sys
+sys.path.append("../")
+
+from chess import moves
+from chess.bitboard import BitBoard, QUEEN
+from chess.position import Position
+
+DEFAULT_CODE = "1 rnbkqbnr pppppppp ........ ........ ........ ........ PPPPPPPP RNBKQBNR"
+UPGRADE_CODE = "1 .......k P....... ...K.... ........ ........ ........ .......p ........"
+
+
+class TestEncoding(unittest.TestCase):
+    def test_round_trip(self):
+        move = moves.encode(12, 28)
+        self.assertEqual(12, moves.from_square(move))
+        self.assertEqual(28, moves.to_square(move))
+        self.assertEqual(0, moves.promotion(move))
+        self.assertEqual("e2 e4", moves.to_string(move))
+        self.assertEqual(move, moves.from_string("e2 e4"))
+
+    def test_promotion_fits_16_bits(self):
+        move = moves.encode(63, 63, QUEEN)
+        self.assertLess(move, 1 << 16)
+        self.assertEqual(QUEEN, moves.promotion(move))
+        self.assertEqual("h8 h8", moves.to_string(move))
+
+    def test_no_move(self):
+        self.assertEqual("a1 a1", moves.to_string(moves.NO_MOVE))
+
+    def test_invalid_string(self):
+        with self.assertRaises(AssertionError):
+            moves.from_string("a9 a1")
+
+    def test_lists(self):
+        move_list = moves.from_strings(["a2 a3", "h7 h8"])
+        self.assertEqual("H", move_list.typecode)
+        self.assertEqual(["a2 a3", "h7 h8"], moves.to_strings(move_list))
+
+
+class TestBoardMoveLists(unittest.TestCase):
+    def test_same_order_as_strings(self):
+        board = BitBoard(DEFAULT_CODE)
+        self.assertEqual(board.calc_possible_moves(), moves.to_strings(board.calc_move_list()))
+
+    def test_upgrades_marked(self):
+        board = BitBoard(UPGRADE_CODE)
+        upgrades = [move for move in board.calc_move_list() if moves.promotion(move)]
+        self.assertEqual(["h7 h8"], moves.to_strings(upgrades))
+        self.assertEqual(upgrades[0], board.parse_move("h7 h8"))
+        self.assertEqual(0, moves.promotion(board.parse_move("d3 d4")))
+
+    def test_make_int_moves(self):
+        position = Position(UPGRADE_CODE)
+        position.make_move(position.parse_move("h7 h8"))
+        position.make_move("a2 a1")
+        self.assertEqual("1 Q......k ........ ...K.... ........ ........ ........ ........ .......q",
+                         repr(position))
+        position.unmake_move()
+        position.unmake_move()
+        self.assertEqual(UPGRADE_CODE, repr(position))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+
+# required to make imports work
+import sys
+sys.path.append("../")
+
+from chess import perft
+from chess.board import ChessBoard
+from chess.bitboard import BitBoard
+from chess.position import Position
+
+
+class TestPerft(unittest.TestCase):
+    def test_string_board(self):
+        self.assertEqual([], perft.check(ChessBoard, max_depth=2))
+
+    def test_bitboard(self):
+        self.assertEqual([], perft.check(BitBoard, max_depth=3))
+
+    def test_position(self):
+        self.assertEqual([], perft.check(Position, max_depth=3))
+
+    def test_backends_agree_per_move(self):
+        for name, code, counts in perft.REFERENCE_POSITIONS:
+            expected = perft.divide(ChessBoard(code), 2)
+            self.assertEqual(expected, perft.divide(BitBoard(code), 2))
+            self.assertEqual(counts[1], sum(expected.values()))
+
+    def test_position_unchanged(self):
+        code = perft.REFERENCE_POSITIONS[1][1]
+        position = Position(code)
+        perft.perft(position, 3)
+        self.assertEqual(code, repr(position))
+        self.assertEqual(0, position.ply)
+
+    def test_processes(self):
+        code = perft.REFERENCE_POSITIONS[0][1]
+        result = perft.run(BitBoard(code), 3, processes=2)
+        self.assertEqual(perft.divide(BitBoard(code), 3), result["divide"])
+        self.assertEqual(8990, result["nodes"])
+        self.assertGreater(result["nps"], 0)
+
+    def test_main(self):
+        self.assertEqual(0, perft.main(["--check", "--depth", "2", "--backend", "position"]))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,8 +4,9 @@ import unittest
 import sys
 sys.path.append("../")
 
+from chess.bitboard import BitBoard
 from chess.board import ChessBoard
-from chess.pieces import (Pawn, Knight, Bishop, Rook, Queen, King,
+from chess.pieces import (Pawn, Knight, Bishop, Rook, Queen, King, MOVE_GENERATORS,
                           P1_CHAR, P2_CHAR)
 
 
@@ -227,6 +228,30 @@ class TestKing(unittest.TestCase):
         self.assertEqual(board.get_square(*piece_loc), p1.get_char())
         self.assertEqual(p1.calc_moves(board), p1_expected)
 
+    def test_bitboard(self):
+        inpt_str = "1 ........ Bkr..... ........ ...N.... ........ ........ ........ .......K"
+        p1 = King(1, 1, P1_CHAR)
+        self.assertEqual(p1.calc_moves(ChessBoard(inpt_str)), p1.calc_moves(BitBoard(inpt_str)))
+        self.assertEqual(ChessBoard(inpt_str).attacked_squares(P2_CHAR),
+                         BitBoard(inpt_str).attacked_squares(P2_CHAR))
+
+
+class TestMoveGenerators(unittest.TestCase):
+    def test_shared_buffer(self):
+        board = ChessBoard("1 k....... ........ ........ ...n.... ........ ........ ........ .......K")
+        targets = []
+        MOVE_GENERATORS["n"].generate(board, 3, 3, P1_CHAR, targets)
+        MOVE_GENERATORS["k"].generate(board, 0, 0, P1_CHAR, targets)
+        expected = {(1, 2), (1, 4), (2, 1), (2, 5), (4, 1), (4, 5), (5, 2), (5, 4),
+                    (0, 1), (1, 0), (1, 1)}
+        self.assertEqual({divmod(sq, 8) for sq in targets}, expected)
+        self.assertEqual(len(targets), len(expected))
+
+    def test_generators_are_shared(self):
+        self.assertIs(MOVE_GENERATORS["q"], MOVE_GENERATORS["Q"])
+        self.assertIs(Queen(0, 0, P1_CHAR).generator, MOVE_GENERATORS["q"])
+        self.assertFalse(hasattr(MOVE_GENERATORS["q"], "__dict__"))
+
 
 if __name__ == "__main__":
-    unittest.main()
\ No newline at end of file
+    unittest.main()
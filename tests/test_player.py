@@ -1,11 +1,25 @@
+import time
 import unittest
 import sys
 
 sys.path.append("../")
+from chess import moves
 from chess.board import ChessBoard
+from chess.position import Position
 import chess.player as player
 
 
+class CountingPosition(Position):
+    """Position that counts how many moves have been made on it."""
+    def __init__(self, board):
+        Position.__init__(self, board)
+        self.moves_made = 0
+
+    def make_move(self, move):
+        self.moves_made += 1
+        Position.make_move(self, move)
+
+
 class TestPlayer(unittest.TestCase):
     def test_repr(self):
         p1 = player.Player()
@@ -41,6 +55,160 @@ class TestBasicMinimax(unittest.TestCase):
         self.assertEqual(actual, expected)
 
 
+class TestAlphaBeta(unittest.TestCase):
+    def test_1_step_checkmate(self):
+        board = ChessBoard(
+            "1 ........ ........ ........ ........ ........ .....pk. ......p. ......K.")
+        p1 = player.AlphaBeta()
+        self.assertEqual("f6 f7", p1.choose_move(board, depth=1))
+
+    def test_2_step_checkmate(self):
+        board = ChessBoard(
+            "1 k....... ........ r......Q ........ ........ ........ .....PPP B.....K.")
+        p1 = player.AlphaBeta()
+        self.assertEqual("a3 a8", p1.choose_move(board, depth=3))
+
+    def test_same_score_fewer_nodes(self):
+        code = "1 r.bk.bnr ppp..ppp ..n.q... ...pp... ...PP... ..N..N.. PPP..PPP R.BKQB.R"
+        minimax_position = CountingPosition(code)
+        alpha_beta_position = CountingPosition(code)
+        expected = player.BasicMinimax().negamax(minimax_position, 3)
+        actual = player.AlphaBeta().negamax(alpha_beta_position, 3)
+        self.assertEqual(expected, actual)
+        self.assertLess(alpha_beta_position.moves_made * 10, minimax_position.moves_made)
+
+    def test_same_score_with_table(self):
+        code = "2 r.bk.bnr ppp..ppp ..n.q... ...pp... ...PP... ..N..N.. PPP..PPP R.BKQB.R"
+        expected = player.BasicMinimax().negamax(Position(code), 3)
+        p1 = player.AlphaBeta(tt_size_mb=1)
+        self.assertEqual(expected, p1.negamax(Position(code), 3))
+        self.assertEqual(expected, p1.negamax(Position(code), 3))
+
+    def test_static_leaves(self):
+        code = "1 r.bk.bnr ppp..ppp ..n.q... ...pp... ...PP... ..N..N.. PPP..PPP R.BKQB.R"
+        expected = player.BasicMinimax(static_leaves=True).negamax(Position(code), 3)
+        p1 = player.AlphaBeta(static_leaves=True)
+        self.assertEqual(expected, p1.negamax(Position(code), 3))
+        self.assertEqual(player.AlphaBeta().negamax(Position(code), 3),
+                         p1.negamax(Position(code), 3))
+
+    def test_captures_ordered_first(self):
+        position = Position(
+            "1 k....... ........ ....q... ...p.... ..Q.P... ........ ........ .......K")
+        move_list = player.AlphaBeta.order_moves(position, position.calc_move_list())
+        self.assertEqual(["d4 c5", "d4 e5", "e3 e5"], moves.to_strings(move_list[:3]))
+
+    def test_first_move_ordered_first(self):
+        position = Position(
+            "1 k....... ........ ....q... ...p.... ..Q.P... ........ ........ .......K")
+        move_list = player.AlphaBeta.order_moves(position, position.calc_move_list(),
+                                                 moves.from_string("a1 a2"))
+        self.assertEqual(["a1 a2", "d4 c5"], moves.to_strings(move_list[:2]))
+
+
+class TestQuiescence(unittest.TestCase):
+    def test_defended_pawn_not_taken(self):
+        # the pawn on e5 is defended by the pawn on f6
+        board = ChessBoard(
+            "1 k....... ........ ........ ...q.... ....P... .....P.. ........ .......K")
+        self.assertEqual("d4 e5", player.AlphaBeta(depth=1).choose_move(board))
+        self.assertNotEqual("d4 e5", player.AlphaBeta(depth=1, quiescence=True).choose_move(board))
+
+    def test_exchange_searched_to_the_end(self):
+        position = Position(
+            "1 k....... ........ ........ ...q.... ....P... .....P.. ........ .......K")
+        # the queen is lost for a pawn, so the player does not take
+        self.assertEqual(position.static_evaluate(), player.AlphaBeta().quiesce(position))
+        position.make_move("d4 e5")
+        self.assertEqual(-position.static_evaluate() - 9,
+                         -player.AlphaBeta().quiesce(position))
+        self.assertEqual(1, position.ply)
+
+    def test_same_score_as_minimax(self):
+        code = "2 r.bk.bnr ppp..ppp ..n.q... ...pp... ...PP... ..N..N.. PPP..PPP R.BKQB.R"
+        expected = player.BasicMinimax(quiescence=True).negamax(Position(code), 2)
+        p1 = player.AlphaBeta(quiescence=True, tt_size_mb=1)
+        self.assertEqual(expected, p1.negamax(Position(code), 2))
+        self.assertEqual(expected, p1.negamax(Position(code), 2))
+
+    def test_node_limit(self):
+        board = ChessBoard(
+            "1 r.bk.bnr ppp..ppp ..n.q... ...pp... ...PP... ..N..N.. PPP..PPP R.BKQB.R")
+        p1 = player.IterativeDeepening(time_limit=None, quiescence=True)
+        move = p1.choose_move(board, node_limit=500)
+        self.assertIn(move, board.calc_possible_moves())
+        self.assertLessEqual(p1._nodes, 500)
+
+
+class TestParallelMinimax(unittest.TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        player.shutdown_executors()
+
+    def test_2_step_checkmate(self):
+        board = ChessBoard(
+            "1 k....... ........ r......Q ........ ........ ........ .....PPP B.....K.")
+        p1 = player.ParallelMinimax(processes=2)
+        self.assertEqual("a3 a8", p1.choose_move(board, depth=3))
+
+    def test_same_move_as_serial(self):
+        codes = ["1 r.bk.bnr ppp..ppp ..n.q... ...pp... ...PP... ..N..N.. PPP..PPP R.BKQB.R",
+                 "2 ...k.... .p....p. ..n..... ...P.... ..q.B... .R...... ...N.P.. ....K..."]
+        for code in codes:
+            board = ChessBoard(code)
+            for depth in (1, 2):
+                self.assertEqual(player.BasicMinimax().choose_move(board, depth),
+                                 player.ParallelMinimax(processes=2).choose_move(board, depth))
+
+    def test_single_process(self):
+        board = ChessBoard(
+            "1 ........ ........ ........ ........ ........ .....pk. ......p. ......K.")
+        self.assertEqual("f6 f7", player.ParallelMinimax(processes=1).choose_move(board, 1))
+
+    def test_workers_kept(self):
+        board = ChessBoard(
+            "1 k....... ........ r......Q ........ ........ ........ .....PPP B.....K.")
+        player.ParallelMinimax(processes=2).choose_move(board, 1)
+        executor = player.get_executor(2)
+        player.ParallelMinimax(processes=2).choose_move(board, 1)
+        self.assertIs(executor, player.get_executor(2))
+
+
+class TestIterativeDeepening(unittest.TestCase):
+    def test_2_step_checkmate(self):
+        board = ChessBoard(
+            "1 k....... ........ r......Q ........ ........ ........ .....PPP B.....K.")
+        p1 = player.IterativeDeepening(time_limit=None, max_depth=3)
+        self.assertEqual("a3 a8", p1.choose_move(board))
+        self.assertEqual(3, p1.depth_reached)
+
+    def test_node_limit(self):
+        board = ChessBoard(
+            "1 r.bk.bnr ppp..ppp ..n.q... ...pp... ...PP... ..N..N.. PPP..PPP R.BKQB.R")
+        p1 = player.IterativeDeepening(time_limit=None)
+        move = p1.choose_move(board, node_limit=500)
+        self.assertIn(move, board.calc_possible_moves())
+        self.assertLessEqual(p1._nodes, 500)
+        self.assertLess(p1.depth_reached, 5)
+
+    def test_first_depth_always_finishes(self):
+        board = ChessBoard(
+            "1 r.bk.bnr ppp..ppp ..n.q... ...pp... ...PP... ..N..N.. PPP..PPP R.BKQB.R")
+        p1 = player.IterativeDeepening()
+        move = p1.choose_move(board, time_limit=0)
+        self.assertIn(move, board.calc_possible_moves())
+        self.assertEqual(1, p1.depth_reached)
+
+    def test_time_limit(self):
+        board = ChessBoard(
+            "1 r.bk.bnr ppp..ppp ..n.q... ...pp... ...PP... ..N..N.. PPP..PPP R.BKQB.R")
+        p1 = player.IterativeDeepening(time_limit=0.2)
+        start = time.perf_counter()
+        p1.choose_move(board)
+        self.assertLess(time.perf_counter() - start, 1.0)
+        self.assertGreaterEqual(p1.depth_reached, 2)
+
+
 class TestRandomChoice(unittest.TestCase):
     def test_choice_in_moves(self):
         board = ChessBoard(
@@ -0,0 +1,85 @@
+import random
+import unittest
+
+# required to make imports work
+import sys
+sys.path.append("../")
+
+from chess.bitboard import BitBoard
+from chess.position import Position
+
+DEFAULT_CODE = "1 rnbkqbnr pppppppp ........ ........ ........ ........ PPPPPPPP RNBKQBNR"
+
+
+class TestMakeMove(unittest.TestCase):
+    def test_matches_do_move(self):
+        rng = random.Random(0)
+        position = Position(DEFAULT_CODE)
+        board = BitBoard(DEFAULT_CODE)
+        for _ in range(60):
+            moves = board.calc_possible_moves()
+            self.assertEqual(sorted(moves), sorted(position.calc_possible_moves()))
+            if not moves:
+                break
+            move = rng.choice(moves)
+            board = board.do_move(move)
+            position.make_move(move)
+            self.assertEqual(repr(board), repr(position))
+            self.assertEqual(board.material, position.material)
+            self.assertEqual(board.evaluate(), position.evaluate())
+
+    def test_unmake_restores_position(self):
+        rng = random.Random(1)
+        position = Position(DEFAULT_CODE)
+        history = []
+        for _ in range(60):
+            moves = position.calc_possible_moves()
+            if not moves:
+                break
+            history.append(repr(position))
+            position.make_move(rng.choice(moves))
+        self.assertEqual(len(history), position.ply)
+        while history:
+            position.unmake_move()
+            self.assertEqual(history.pop(), repr(position))
+        self.assertEqual(0, position.ply)
+        self.assertEqual(BitBoard(DEFAULT_CODE).get_pieces(), position.get_pieces())
+
+    def test_unmake_upgraded_pawn(self):
+        code = "1 .......k P....... ...K.... ........ ........ ........ .......p ........"
+        position = Position(code)
+        position.make_move("h7 h8")
+        self.assertEqual("q", position.get_square(7, 7))
+        position.make_move("a2 a1")
+        self.assertEqual("Q", position.get_square(0, 0))
+        self.assertEqual((9, 9), position.material)
+        position.unmake_move()
+        position.unmake_move()
+        self.assertEqual(code, repr(position))
+        self.assertEqual((1, 1), position.material)
+        self.assertEqual({"k": 1, "p": 1, "K": 1, "P": 1}, position.get_pieces())
+
+    def test_unmake_capture(self):
+        code = "1 k....... .P...... ...K.... .......Q ........ ........ ........ ........"
+        position = Position(code)
+        position.make_move("a1 b2")
+        self.assertEqual({"k": 1, "K": 1, "Q": 1}, position.get_pieces())
+        position.unmake_move()
+        self.assertEqual(code, repr(position))
+        self.assertTrue(position.is_square_attacked(0, 0, static_player=True))
+
+    def test_game_status_follows_moves(self):
+        position = Position("2 k....... .R...... ........ .R...... ........ ........ ........ .......K")
+        self.assertEqual("ongoing", position.game_status)
+        position.make_move("b4 b3")
+        self.assertEqual("stalemate", position.game_status)
+        position.unmake_move()
+        self.assertEqual("ongoing", position.game_status)
+
+    def test_moving_out_of_turn(self):
+        position = Position("2 q.p....k .P...... .R.K.... .......Q ........ ........ ........ ........")
+        with self.assertRaises(AssertionError):
+            position.make_move("a1 b2")
+
+if __name__ == "__main__":
+    unittest.main()
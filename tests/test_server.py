@@ -0,0 +1,255 @@
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+# required to make imports work
+import sys
+sys.path.append("../")
+
+from chess import server
+from chess.board import ChessBoard, CHECKMATE
+from chess.game import GAME_START, MOVE, GAME_END
+from chess.tournament import parse_player
+
+
+class Client(object):
+    """Test client speaking the server's line protocol."""
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def connect(cls, port):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        return cls(reader, writer)
+
+    async def send(self, line):
+        self.writer.write(line.encode() + b"\n")
+        await self.writer.drain()
+
+    async def receive(self, count=1):
+        events = []
+        for _ in range(count):
+            line = await asyncio.wait_for(self.reader.readline(), 60)
+            events.append(json.loads(line.decode()))
+        return events
+
+    async def close(self):
+        await self.send("quit")
+        self.writer.close()
+
+
+class GatedServer(server.GameServer):
+    """Server whose searches wait until the test opens its gate."""
+    def __init__(self, *args, **kwargs):
+        server.GameServer.__init__(self, *args, **kwargs)
+        self.gate = asyncio.Event()
+
+    async def search(self, session):
+        await self.gate.wait()
+        return await server.GameServer.search(self, session)
+
+
+def run_with_server(test, server_class=server.GameServer, **kwargs):
+    """Runs a test coroutine function with a started server on a free port."""
+    async def main():
+        game_server = server_class(port=0, processes=1, **kwargs)
+        await game_server.start()
+        try:
+            await test(game_server)
+        finally:
+            await game_server.stop()
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        loop.run_until_complete(main())
+    finally:
+        loop.close()
+        asyncio.set_event_loop(None)
+
+
+class TestGameSession(unittest.TestCase):
+    def test_checkmate(self):
+        board_str = "......r. ........ ........ ........ ........ k....... ........ K......."
+        session = server.GameSession(1, parse_player("RandomComputer"), side=1, board=board_str)
+        start = session.start()
+        self.assertEqual([GAME_START], [event["event"] for event in start])
+        self.assertFalse(session.computer_to_move)
+        events = session.play("g1 g8", 2.0)
+        self.assertEqual([MOVE, GAME_END], [event["event"] for event in events])
+        self.assertEqual((2.0, True, "client"),
+                         (events[0]["seconds"], events[0]["check"], events[0]["mover"]))
+        self.assertEqual((CHECKMATE, 1), (events[1]["status"], events[1]["winner"]))
+        self.assertTrue(session.over)
+        with self.assertRaises(ValueError):
+            session.play("a3 a4", 1.0)
+
+    def test_impossible_move(self):
+        session = server.GameSession(1, parse_player("RandomComputer"))
+        session.start()
+        with self.assertRaises(ValueError):
+            session.play("a2 a5", 1.0)
+
+    def test_max_turns(self):
+        session = server.GameSession(1, parse_player("RandomComputer"), side=2, max_turns=2)
+        session.start()
+        self.assertTrue(session.computer_to_move)
+        self.assertEqual(1, len(session.play("b2 b3", 0.1)))
+        events = session.play("g7 g6", 0.1)
+        self.assertEqual([MOVE, GAME_END], [event["event"] for event in events])
+        self.assertFalse(session.computer_to_move)
+
+    def test_bad_opponent(self):
+        with self.assertRaises(ValueError):
+            server.GameSession(1, parse_player("Human"))
+        with self.assertRaises(ValueError):
+            server.GameSession(1, parse_player("RandomComputer"), side=3)
+
+
+class TestCheckOpponent(unittest.TestCase):
+    def test_allowed(self):
+        for text in ("RandomComputer", "AlphaBeta:depth=3,tt_size_mb=8,quiescence=True",
+                     "IterativeDeepening:time_limit=0.5,node_limit=1000,max_depth=6"):
+            server.check_opponent(parse_player(text, check=False))
+
+    def test_not_allowed(self):
+        for text in ("Human", "ChessGame", "AlphaBeta:depth=-1", "AlphaBeta:depth=2.5e9",
+                     "AlphaBeta:tt_size_mb=100000", "AlphaBeta:depth=True",
+                     "AlphaBeta:quiescence=1", "AlphaBeta:book='/nonexistent'",
+                     "AlphaBeta:tablebases='/nonexistent'", "AlphaBeta:telemetry=True",
+                     "ParallelMinimax:processes=64", "RandomComputer:depth=2",
+                     "IterativeDeepening:depth=2"):
+            with self.assertRaises(ValueError):
+                server.check_opponent(parse_player(text, check=False))
+
+
+class TestGameServer(unittest.TestCase):
+    def test_game(self):
+        async def test(game_server):
+            client = await Client.connect(game_server.port)
+            await client.send("new ab=AlphaBeta:depth=1")
+            start, = await client.receive()
+            self.assertEqual((GAME_START, 1, "client", "ab"),
+                             (start["event"], start["session"], start["player1"],
+                              start["player2"]))
+
+            await client.send("move b2 b3")
+            mine, reply = await client.receive(2)
+            self.assertEqual(("b2 b3", 1), (mine["move"], mine["player"]))
+            self.assertEqual(2, reply["player"])
+            board = ChessBoard(mine["board"])
+            self.assertIn(reply["move"], board.calc_possible_moves())
+
+            await client.send("board")
+            event, = await client.receive()
+            self.assertEqual(reply["board"], event["board"])
+            self.assertEqual(ChessBoard(event["board"]).calc_possible_moves(), event["moves"])
+
+            await client.send("metrics")
+            event, = await client.receive()
+            self.assertEqual(1, event["session"]["search seconds"]["count"])
+            self.assertEqual(3, event["session"]["response seconds"]["count"])
+            self.assertEqual(1, event["server"]["sessions"])
+            await client.close()
+        run_with_server(test)
+
+    def test_computer_moves_first(self):
+        async def test(game_server):
+            client = await Client.connect(game_server.port)
+            await client.send("new RandomComputer 2 1")
+            start, move = await client.receive(2)
+            self.assertEqual((GAME_START, MOVE, 1), (start["event"], move["event"], move["player"]))
+            await client.close()
+        run_with_server(test)
+
+    def test_errors(self):
+        async def test(game_server):
+            client = await Client.connect(game_server.port)
+            for line in ("move a2 a3", "fly", "new NotAPlayer", "new RandomComputer 3",
+                         "new RandomComputer x"):
+                await client.send(line)
+                event, = await client.receive()
+                self.assertEqual(server.ERROR, event["event"], line)
+            await client.send("new RandomComputer")
+            await client.receive()
+            await client.send("move a1 a8")
+            event, = await client.receive()
+            self.assertEqual(server.ERROR, event["event"])
+            await client.close()
+        run_with_server(test)
+
+    def test_bad_opponent_options(self):
+        async def test(game_server):
+            client = await Client.connect(game_server.port)
+            for line in ("new AlphaBeta:depth=-1 2", "new AlphaBeta:book='/nonexistent' 2",
+                         "new AlphaBeta:tt_size_mb=1e9"):
+                await client.send(line)
+                event, = await client.receive()
+                self.assertEqual(server.ERROR, event["event"], line)
+            self.assertEqual(0, game_server.metrics()["sessions started"])
+            # the connection is still open
+            await client.send("new RandomComputer")
+            start, = await client.receive()
+            self.assertEqual(GAME_START, start["event"])
+            await client.close()
+        run_with_server(test)
+
+    def test_search_error(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, "book.bin")
+        with open(path, "wb") as book_file:
+            book_file.write(b"not a book")
+
+        async def test(game_server):
+            client = await Client.connect(game_server.port)
+            await client.send("new AlphaBeta:depth=1,book={!r} 2".format(path))
+            start, error = await client.receive(2)
+            self.assertEqual((GAME_START, server.ERROR), (start["event"], error["event"]))
+            self.assertEqual(start["session"], error["session"])
+            await client.send("board")
+            event, = await client.receive()
+            self.assertTrue(event["over"])
+            await client.send("new RandomComputer")
+            start, = await client.receive()
+            self.assertEqual(GAME_START, start["event"])
+            await client.close()
+        run_with_server(test)
+
+    def test_sessions_run_at_once(self):
+        async def test(game_server):
+            slow = await Client.connect(game_server.port)
+            fast = await Client.connect(game_server.port)
+            # the slow client's opponent is held searching until the fast
+            # client has been served
+            await slow.send("new RandomComputer 2 1")
+            await slow.receive()
+            search = asyncio.ensure_future(slow.receive())
+            await fast.send("new RandomComputer")
+            await fast.receive()
+            for line in ("board", "metrics"):
+                await fast.send(line)
+                await fast.receive()
+            self.assertFalse(search.done())
+            self.assertEqual(2, game_server.metrics()["sessions"])
+            game_server.gate.set()
+            move, = await search
+            self.assertEqual(MOVE, move["event"])
+            await slow.close()
+            await fast.close()
+        run_with_server(test, GatedServer)
+
+
+class TestSummarize(unittest.TestCase):
+    def test_summarize(self):
+        summary = server.summarize([0.3, 0.1, 0.2, 0.4])
+        self.assertEqual((4, 0.1 + 0.2 + 0.3 + 0.4), (summary["count"], summary["mean"] * 4))
+        self.assertEqual((0.3, 0.4, 0.4), (summary["median"], summary["p95"], summary["max"]))
+        self.assertEqual(0, server.summarize([])["count"])
+
+
+if __name__ == "__main__":
+    unittest.main()
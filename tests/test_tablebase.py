@@ -0,0 +1,120 @@
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+# required to make imports work
+import sys
+sys.path.append("../")
+
+from chess import tablebase
+from chess.board import ChessBoard, CHECKMATE, STALEMATE
+import chess.player as player
+
+
+class TestTablebase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.mkdtemp()
+        cls.values = tablebase.build("KRK")
+        tablebase.write(os.path.join(cls.directory, "KRK.tb"), "KRK", cls.values)
+        cls.tablebases = tablebase.Tablebases(cls.directory)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tablebases._table("KRK").close()
+        opened = tablebase._tablebases.pop(cls.directory, None)
+        if opened is not None:
+            opened._table("KRK").close()
+        shutil.rmtree(cls.directory)
+
+    def test_longest_win(self):
+        # a rook needs at most 16 moves to checkmate a lone king, and the
+        # lone king can be 32 moves of either player from being checkmated
+        self.assertEqual(31, max(self.values))
+        self.assertEqual(-33, min(value for value in self.values
+                                  if value != tablebase.ILLEGAL))
+
+    def test_checkmate(self):
+        board = ChessBoard("2 ........ ........ ........ ........ ........ k....... ........ K.....r.")
+        self.assertEqual(CHECKMATE, board.game_status)
+        self.assertEqual(tablebase.CHECKMATED, self.tablebases.probe(board))
+
+    def test_mate_in_one(self):
+        board = ChessBoard("1 ......r. ........ ........ ........ ........ k....... ........ K.......")
+        self.assertEqual(1, self.tablebases.probe(board))
+        move = self.tablebases.best_move(board)
+        self.assertEqual(CHECKMATE, board.do_move(move).game_status)
+
+    def test_draws(self):
+        # the lone king takes the rook
+        board = ChessBoard("1 kR...... ........ ........ ........ ........ ........ ........ .......K")
+        self.assertEqual(tablebase.DRAW, self.tablebases.probe(board))
+        board = ChessBoard("2 ........ ........ ........ ........ ........ ........ .r...... K.k.....")
+        self.assertEqual(STALEMATE, board.game_status)
+        self.assertEqual(tablebase.DRAW, self.tablebases.probe(board))
+
+    def test_player2_with_rook(self):
+        board = ChessBoard("2 ......R. ........ ........ ........ ........ K....... ........ k.......")
+        self.assertEqual(1, self.tablebases.probe(board))
+        board = board.do_move("g1 g8")
+        self.assertEqual(tablebase.CHECKMATED, self.tablebases.probe(board))
+
+    def test_not_in_tables(self):
+        board = ChessBoard("1 k....... ........ ........ ........ ........ ........ ........ Q......K")
+        self.assertIsNone(self.tablebases.probe(board))
+        self.assertIsNone(self.tablebases.best_move(board))
+        board = ChessBoard("1 k....... ........ ........ ........ ........ ........ p....... R......K")
+        self.assertIsNone(self.tablebases.probe(board))
+
+    def test_agrees_with_board(self):
+        rng = random.Random(0)
+        checked = 0
+        while checked < 200:
+            squares = ["."] * 64
+            for sq, char in zip(rng.sample(range(64), 3), "krK"):
+                squares[sq] = char
+            code = rng.choice("12") + " " + " ".join("".join(squares[row * 8:row * 8 + 8])
+                                                     for row in range(8))
+            board = ChessBoard(code)
+            value = self.tablebases.probe(board)
+            if value is None:
+                continue
+            checked += 1
+
+            status = board.game_status
+            if status != CHECKMATE and status != STALEMATE:
+                # a position's value is the best of the values after its moves
+                children = [self.tablebases.probe(board.do_move(move))
+                            for move in board.calc_possible_moves()]
+                children = [tablebase.DRAW if child is None else child for child in children]
+                wins = [-child for child in children if child < 0]
+                if wins:
+                    self.assertEqual(min(wins), value)
+                elif tablebase.DRAW in children:
+                    self.assertEqual(tablebase.DRAW, value)
+                else:
+                    self.assertEqual(-max(children) - 2, value)
+            elif status == CHECKMATE:
+                self.assertEqual(tablebase.CHECKMATED, value)
+            else:
+                self.assertEqual(tablebase.DRAW, value)
+
+    def test_player_uses_tables(self):
+        board = ChessBoard("1 ......r. ........ ........ ........ ........ k....... ........ K.......")
+        for ai in (player.BasicMinimax(depth=1, tablebases=self.directory),
+                   player.IterativeDeepening(node_limit=100, tablebases=self.directory)):
+            move = ai.choose_move(board)
+            self.assertEqual(CHECKMATE, board.do_move(move).game_status)
+
+
+class TestTableFile(unittest.TestCase):
+    def test_not_a_table(self):
+        directory = tempfile.mkdtemp()
+        path = os.path.join(directory, "KQK.tb")
+        with open(path, "wb") as table_file:
+            table_file.write(b"not a table")
+        with self.assertRaises(AssertionError):
+            tablebase.Tablebase(path)
+        shutil.rmtree(directory)
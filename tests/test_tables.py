@@ -0,0 +1,43 @@
+import unittest
+
+# required to make imports work
+import sys
+sys.path.append("../")
+
+from chess import tables
+
+
+class TestStepTables(unittest.TestCase):
+    def test_knight_corner(self):
+        self.assertEqual(((1, 2), (2, 1)), tables.KNIGHT_TARGETS[0])
+
+    def test_knight_center(self):
+        self.assertEqual(8, len(tables.KNIGHT_TARGETS[3 * 8 + 3]))
+
+    def test_king_edge(self):
+        self.assertEqual({(0, 3), (0, 5), (1, 3), (1, 4), (1, 5)},
+                         set(tables.KING_TARGETS[4]))
+
+    def test_pawn_attacks(self):
+        self.assertEqual(((2, 0), (2, 2)), tables.PAWN_ATTACKS["1"][1 * 8 + 1])
+        self.assertEqual(((5, 6),), tables.PAWN_ATTACKS["2"][6 * 8 + 7])
+        self.assertEqual((), tables.PAWN_ATTACKS["1"][7 * 8 + 3])
+
+
+class TestRays(unittest.TestCase):
+    def test_ray_nearest_first(self):
+        self.assertEqual(((2, 2), (1, 1), (0, 0)), tables.RAYS[(-1, -1)][3 * 8 + 3])
+
+    def test_ray_off_board(self):
+        self.assertEqual((), tables.RAYS[(1, 0)][7 * 8 + 2])
+
+    def test_rook_and_bishop_rays(self):
+        sq = 3 * 8 + 3
+        self.assertEqual(14, sum(len(ray) for ray in tables.STRAIGHT_RAYS[sq]))
+        self.assertEqual(13, sum(len(ray) for ray in tables.DIAGONAL_RAYS[sq]))
+
+    def test_to_bitboard(self):
+        self.assertEqual((1 << 17) | (1 << 10), tables.to_bitboard(tables.KNIGHT_TARGETS[0]))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+import random
+import unittest
+
+# required to make imports work
+import sys
+sys.path.append("../")
+
+from chess import telemetry
+from chess.board import ChessBoard
+from chess.game import ChessGame
+import chess.player as player
+
+DEFAULT_CODE = "1 rnbkqbnr pppppppp ........ ........ ........ ........ PPPPPPPP RNBKQBNR"
+MIDGAME_CODE = "1 r..kq..r ppp..ppp ..n.b... ...p.... ...P.... ..N.B... PPP..PPP R..KQ..R"
+
+
+class TestSearchStats(unittest.TestCase):
+    def test_counts(self):
+        board = ChessBoard(DEFAULT_CODE)
+        ai = player.BasicMinimax(depth=2, telemetry=True)
+        ai.choose_move(board)
+        stats = ai.stats
+        moves = len(board.calc_possible_moves())
+        replies = sum(len(board.do_move(move).calc_possible_moves())
+                      for move in board.calc_possible_moves())
+        self.assertEqual([1, moves, replies], stats.nodes_by_ply)
+        self.assertEqual(replies, stats.leaves)
+        self.assertEqual(0, stats.cutoffs)
+        self.assertEqual(2, stats.depth)
+        self.assertEqual([moves, replies / moves], stats.branching_factors())
+        self.assertGreater(stats.seconds, 0)
+        for phase in telemetry.PHASES:
+            self.assertGreater(stats.phase_seconds[phase], 0)
+
+    def test_cutoffs(self):
+        board = ChessBoard(MIDGAME_CODE)
+        ai = player.AlphaBeta(depth=3, telemetry=True)
+        ai.choose_move(board)
+        self.assertGreater(ai.stats.cutoffs, 0)
+        full = player.BasicMinimax(depth=3, telemetry=True)
+        full.choose_move(board)
+        self.assertLess(ai.stats.nodes, full.stats.nodes)
+
+    def test_same_moves(self):
+        board = ChessBoard(MIDGAME_CODE)
+        for cls, kwargs in ((player.BasicMinimax, {"depth": 2}),
+                            (player.AlphaBeta, {"depth": 3}),
+                            (player.IterativeDeepening, {"node_limit": 2000})):
+            plain = cls(**kwargs)
+            timed = cls(telemetry=True, **kwargs)
+            self.assertEqual(plain.choose_move(board), timed.choose_move(board))
+            self.assertIsNone(plain.stats)
+            self.assertIsNotNone(timed.stats)
+
+    def test_iterative_deepening_depth(self):
+        ai = player.IterativeDeepening(node_limit=3000, telemetry=True)
+        ai.choose_move(ChessBoard(MIDGAME_CODE))
+        self.assertEqual(ai.depth_reached, ai.stats.depth)
+        # the root is counted once for each depth searched
+        self.assertGreaterEqual(ai.stats.nodes_by_ply[0], ai.depth_reached)
+
+    def test_parallel_merge(self):
+        board = ChessBoard(DEFAULT_CODE)
+        ai = player.ParallelMinimax(processes=1, depth=2, telemetry=True)
+        ai.choose_move(board)
+        moves = len(board.calc_possible_moves())
+        self.assertEqual(moves, ai.stats.nodes_by_ply[1])
+        self.assertEqual(ai.stats.nodes_by_ply[2], ai.stats.leaves)
+
+    def test_merge(self):
+        first = telemetry.SearchStats()
+        first.nodes_by_ply = [1, 3]
+        first.cutoffs = 2
+        second = telemetry.SearchStats()
+        second.nodes_by_ply = [1, 2, 5]
+        second.leaves = 5
+        second.phase_seconds[telemetry.EVALUATE] = 0.5
+        first.merge(second)
+        self.assertEqual([2, 5, 5], first.nodes_by_ply)
+        self.assertEqual((5, 2), (first.leaves, first.cutoffs))
+        self.assertEqual(0.5, first.phase_seconds[telemetry.EVALUATE])
+
+    def test_book_move_has_no_stats(self):
+        ai = player.AlphaBeta(depth=1, telemetry=True)
+        ai.choose_move(ChessBoard(DEFAULT_CODE))
+        self.assertIsNotNone(ai.stats)
+        ai.lookup_move(ChessBoard(DEFAULT_CODE))
+        self.assertIsNone(ai.stats)
+
+
+class TestGameStats(unittest.TestCase):
+    def test_move_stats(self):
+        random.seed(2)
+        p1 = player.AlphaBeta(depth=1, telemetry=True)
+        p2 = player.RandomComputer()
+        result = ChessGame(p1, p2, verbosity=0, first_move=1, max_turns=4,
+                           collect_stats=True).play()
+        move_stats = result["move stats"]
+        self.assertEqual(len(result["moves"]), len(move_stats))
+        self.assertIsNone(move_stats[1])
+        stats = move_stats[0]
+        self.assertEqual(1, stats["depth"])
+        self.assertEqual(stats["nodes"], 1 + stats["leaves"])
+        self.assertEqual(set(telemetry.PHASES), set(stats["phase seconds"]))
+
+    def test_off_by_default(self):
+        p1 = player.AlphaBeta(depth=1, telemetry=True)
+        result = ChessGame(p1, p1, verbosity=0, first_move=1, max_turns=2).play()
+        self.assertNotIn("move stats", result)
+
+
+if __name__ == "__main__":
+    unittest.main()
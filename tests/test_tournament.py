@@ -0,0 +1,102 @@
+import unittest
+
+# required to make imports work
+import sys
+sys.path.append("../")
+
+from chess import tournament
+from chess.tournament import PlayerConfig, Tournament
+
+RANDOM = PlayerConfig("random", "RandomComputer", {})
+ALPHA_BETA = PlayerConfig("ab1", "AlphaBeta", {"depth": 1})
+MINIMAX = PlayerConfig("mm1", "BasicMinimax", {"depth": 1})
+
+
+class TestPairings(unittest.TestCase):
+    def test_round_robin(self):
+        self.assertEqual([(0, 1), (0, 2), (1, 2)], tournament.round_robin(3))
+
+    def test_gauntlet(self):
+        self.assertEqual([(0, 1), (0, 2)], tournament.gauntlet(3))
+
+    def test_first_move_alternates(self):
+        games = Tournament([RANDOM, ALPHA_BETA], games_per_pair=4).game_specs()
+        self.assertEqual([1, 2, 1, 2], [spec.first_move for spec in games])
+        self.assertEqual(4, len(set(spec.seed for spec in games)))
+
+    def test_games_per_pair_even(self):
+        for games in (0, 3):
+            with self.assertRaises(AssertionError):
+                Tournament([RANDOM, ALPHA_BETA], games_per_pair=games)
+
+
+class TestPlayerConfig(unittest.TestCase):
+    def test_parse_player(self):
+        self.assertEqual(PlayerConfig("ab3", "AlphaBeta", {"depth": 3, "tt_size_mb": 1}),
+                         tournament.parse_player("ab3=AlphaBeta:depth=3,tt_size_mb=1"))
+        self.assertEqual(PlayerConfig("RandomComputer", "RandomComputer", {}),
+                         tournament.parse_player("RandomComputer"))
+        self.assertEqual(PlayerConfig("AlphaBeta:depth=2", "AlphaBeta", {"depth": 2}),
+                         tournament.parse_player("AlphaBeta:depth=2"))
+
+    def test_unknown_player(self):
+        with self.assertRaises(AssertionError):
+            tournament.parse_player("x=ChessGame")
+
+    def test_depth_from_config(self):
+        self.assertEqual(1, tournament.make_player(ALPHA_BETA).depth)
+
+
+class TestTournament(unittest.TestCase):
+    def test_results(self):
+        games = Tournament([RANDOM, ALPHA_BETA, MINIMAX], games_per_pair=2, max_turns=40,
+                           processes=1)
+        results = games.play()
+        self.assertEqual(6, len(results))
+        for result in results:
+            self.assertLessEqual(result["turns"], 41)
+            self.assertIn(result["winner"], (None, result["player1"], result["player2"]))
+
+        standings = games.standings()
+        self.assertEqual(4, standings["random"]["games"])
+        total_points = sum(row["points"] for row in standings.values())
+        self.assertEqual(6, total_points)
+        self.assertAlmostEqual(0, sum(games.elo().values()))
+
+        pairs = games.pair_results()
+        wins, draws, losses = pairs[("ab1", "mm1")]
+        self.assertEqual([losses, draws, wins], pairs[("mm1", "ab1")])
+
+    def test_same_seed_same_results(self):
+        configs = [RANDOM, PlayerConfig("random2", "RandomComputer", {})]
+        results1 = Tournament(configs, max_turns=30, processes=1, seed=3).play()
+        results2 = Tournament(configs, max_turns=30, processes=2, seed=3).play()
+        self.assertEqual(results1, results2)
+
+    def test_gauntlet_streams_results(self):
+        games = Tournament([ALPHA_BETA, RANDOM, MINIMAX], tournament.GAUNTLET,
+                           games_per_pair=2, max_turns=20, processes=2)
+        seen = 0
+        for result in games.run():
+            seen += 1
+            self.assertEqual(seen, len(games.results))
+            self.assertIn("ab1", (result["player1"], result["player2"]))
+        self.assertEqual(4, seen)
+        self.assertIn("ab1", games.format_standings())
+
+
+class TestElo(unittest.TestCase):
+    def test_stronger_player_rated_higher(self):
+        results = [{"player1": "a", "player2": "b", "winner": "a"}] * 3 \
+            + [{"player1": "a", "player2": "b", "winner": None}]
+        ratings = tournament.estimate_elo(results)
+        self.assertAlmostEqual(tournament.elo_difference(3.5 / 4), ratings["a"] - ratings["b"],
+                               places=3)
+
+    def test_main(self):
+        self.assertEqual(0, tournament.main(["random=RandomComputer", "r2=RandomComputer",
+                                             "--games", "2", "--max-turns", "10",
+                                             "--processes", "1"]))
+
+if __name__ == "__main__":
+    unittest.main()
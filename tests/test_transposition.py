@@ -0,0 +1,121 @@
+import random
+import unittest
+
+# required to make imports work
+import sys
+sys.path.append("../")
+
+from chess.board import ChessBoard
+from chess.bitboard import BitBoard
+from chess.position import Position
+from chess.transposition import (TranspositionTable, ENTRY_SIZE, EXACT,
+                                 LOWER_BOUND)
+from chess import moves
+from chess import zobrist
+import chess.player as player
+
+DEFAULT_CODE = "1 rnbkqbnr pppppppp ........ ........ ........ ........ PPPPPPPP RNBKQBNR"
+
+
+class TestZobrist(unittest.TestCase):
+    def test_turn_changes_key(self):
+        code2 = "2" + DEFAULT_CODE[1:]
+        self.assertNotEqual(zobrist.board_key(DEFAULT_CODE), zobrist.board_key(code2))
+
+    def test_incremental_keys(self):
+        rng = random.Random(0)
+        board = ChessBoard(DEFAULT_CODE)
+        bitboard = BitBoard(DEFAULT_CODE)
+        position = Position(DEFAULT_CODE)
+        for _ in range(80):
+            expected = zobrist.board_key(repr(board))
+            self.assertEqual(expected, board.zobrist_key)
+            self.assertEqual(expected, bitboard.zobrist_key)
+            self.assertEqual(expected, position.zobrist_key)
+            moves = board.calc_possible_moves()
+            if not moves:
+                break
+            move = rng.choice(moves)
+            board = board.do_move(move)
+            bitboard = bitboard.do_move(move)
+            position.make_move(move)
+
+        while position.ply:
+            position.unmake_move()
+        self.assertEqual(zobrist.board_key(DEFAULT_CODE), position.zobrist_key)
+
+    def test_upgraded_pawn_key(self):
+        board = ChessBoard("1 .......k P....... ...K.... ........ ........ ........ .......p ........")
+        board2 = board.do_move("h7 h8")
+        self.assertEqual(zobrist.board_key(repr(board2)), board2.zobrist_key)
+
+    def test_transposition_same_key(self):
+        board = ChessBoard(DEFAULT_CODE)
+        board1 = board.do_move("b2 b3").do_move("b7 b6").do_move("g2 g3")
+        board2 = board.do_move("g2 g3").do_move("b7 b6").do_move("b2 b3")
+        self.assertEqual(board1, board2)
+        self.assertEqual(board1.zobrist_key, board2.zobrist_key)
+
+
+class TestTranspositionTable(unittest.TestCase):
+    def test_size(self):
+        table = TranspositionTable(size_mb=1)
+        self.assertEqual(1024 * 1024 // ENTRY_SIZE, len(table))
+
+    def test_store_and_probe(self):
+        table = TranspositionTable(size_mb=1)
+        self.assertIsNone(table.probe(12345))
+        move = moves.from_string("a2 a3")
+        table.store(12345, 3, -7, LOWER_BOUND, move)
+        self.assertEqual((-7, 3, LOWER_BOUND, move), table.probe(12345))
+        self.assertEqual(1, table.hits)
+        self.assertEqual(1, table.misses)
+
+    def test_depth_preferred_replacement(self):
+        table = TranspositionTable(size_mb=1)
+        key1 = 5
+        key2 = 5 + len(table)
+        table.store(key1, 3, 1, EXACT, None)
+        table.store(key2, 2, 2, EXACT, None)
+        self.assertIsNotNone(table.probe(key1))
+        self.assertIsNone(table.probe(key2))
+        self.assertEqual(0, table.overwrites)
+
+        table.store(key2, 4, 2, EXACT, None)
+        self.assertIsNone(table.probe(key1))
+        self.assertEqual((2, 4, EXACT, None), table.probe(key2))
+        self.assertEqual(1, table.overwrites)
+
+    def test_clear(self):
+        table = TranspositionTable(size_mb=1)
+        table.store(1, 1, 1, EXACT, None)
+        table.probe(1)
+        table.clear()
+        self.assertIsNone(table.probe(1))
+        stats = table.stats()
+        self.assertEqual(0, stats["used"])
+        self.assertEqual(0, stats["hits"])
+        self.assertEqual(1, stats["misses"])
+
+
+class TestMinimaxWithTable(unittest.TestCase):
+    def test_same_move_as_without_table(self):
+        board = ChessBoard(
+            "1 k....... ........ r......Q ........ ........ ........ .....PPP B.....K.")
+        p1 = player.BasicMinimax(tt_size_mb=1)
+        self.assertEqual("a3 a8", p1.choose_move(board, depth=3))
+        self.assertEqual(0, p1.tt.stats()["hits"])
+
+        # the second search finds the first one's results in the table
+        self.assertEqual("a3 a8", p1.choose_move(board, depth=3))
+        self.assertGreater(p1.tt.stats()["hits"], 0)
+
+    def test_scores_match(self):
+        position = Position("1 r.bk.bnr ppp..ppp ..n.q... ...pp... ...PP... ..N..N.. PPP..PPP R.BKQB.R")
+        p1 = player.BasicMinimax()
+        p2 = player.BasicMinimax(tt_size_mb=1)
+        self.assertEqual(p1.negamax(position, 2), p2.negamax(position, 2))
+        self.assertEqual(p1.negamax(position, 2), p2.negamax(position, 2))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+
+# required to make imports work
+import sys
+sys.path.append("../")
+
+from chess import validation
+from chess.board import ChessBoard
+from chess.bitboard import BitBoard
+from chess.position import Position
+
+DEFAULT_CODE = "1 rnbkqbnr pppppppp ........ ........ ........ ........ PPPPPPPP RNBKQBNR"
+
+
+class TestLevels(unittest.TestCase):
+    def tearDown(self):
+        validation.set_level(validation.FULL, validation.DEFAULT_SAMPLE_RATE)
+
+    def test_full_checks_moves(self):
+        board = ChessBoard(DEFAULT_CODE)
+        with self.assertRaises(AssertionError):
+            board.do_move("a7 a6")
+
+    def test_off_trusts_moves(self):
+        validation.set_level(validation.OFF)
+        self.assertEqual(validation.OFF, validation.get_level())
+        for board_class in (ChessBoard, BitBoard):
+            board = board_class(DEFAULT_CODE)
+            board.do_move("a7 a6")
+
+    def test_sampled(self):
+        validation.set_level(validation.SAMPLED, sample_rate=2)
+        checked = [validation.should_check() for _ in range(10)]
+        self.assertEqual(5, checked.count(True))
+
+    def test_board_level(self):
+        board = ChessBoard(DEFAULT_CODE, validation=validation.OFF)
+        board2 = board.do_move("a2 a3")
+        board2.do_move("a3 a4")
+        with self.assertRaises(AssertionError):
+            ChessBoard(repr(board2)).do_move("a3 a4")
+
+    def test_board_level_overrides_process(self):
+        validation.set_level(validation.OFF)
+        board = ChessBoard(DEFAULT_CODE, validation=validation.FULL)
+        with self.assertRaises(AssertionError):
+            board.do_move("a2 a3").do_move("a3 a4")
+        position = Position(DEFAULT_CODE, validation=validation.FULL)
+        with self.assertRaises(AssertionError):
+            position.make_move("a7 a6")
+
+    def test_user_input_always_checked(self):
+        validation.set_level(validation.OFF)
+        with self.assertRaises(AssertionError):
+            ChessBoard("1 rnbqqbnr pppppppp ........ ........ ........ ........ PPPPPPPP RNBKQBNR")
+        with self.assertRaises(AssertionError):
+            ChessBoard(DEFAULT_CODE, validation="sometimes")
+
+    def test_bad_square_fails_sanity_check(self):
+        for code in ("1 xnbkqbnr pppppppp ........ ........ ........ ........ PPPPPPPP RNBKQBNR",
+                     "1 1nbkqbnr pppppppp ........ ........ ........ ........ PPPPPPPP RNBKQBNR"):
+            with self.assertRaises(AssertionError) as context:
+                ChessBoard(code)
+            self.assertEqual("There is a {} in the grid".format(code[2]), str(context.exception))
+
+    def test_trusted_boards_match(self):
+        board = ChessBoard(DEFAULT_CODE, validation=validation.OFF)
+        for move in ("e2 e4", "d7 d5", "e4 d5", "e8 d7"):
+            board = board.do_move(move)
+        expected = ChessBoard(repr(board))
+        self.assertEqual(expected, board)
+        self.assertEqual(str(expected), str(board))
+        self.assertEqual(expected.zobrist_key, board.zobrist_key)
+        self.assertEqual(expected.material, board.material)
+        self.assertEqual(expected.calc_possible_moves(), board.calc_possible_moves())
+
+if __name__ == "__main__":
+    unittest.main()